@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Benchmark for the TM pipeline from the communication interface to the APID handlers.
+
+Uses the :py:class:`tmtccmd.com.dummy.TmTrafficGenerator` to feed generated PUS TM through a
+:py:class:`tmtccmd.com.dummy.DummyComIF`, the :py:class:`tmtccmd.tmtc.CcsdsTmListener` and a
+:py:class:`tmtccmd.tmtc.CcsdsTmHandler` without any hardware.
+"""
+
+import argparse
+import time
+from typing import Any, List
+
+from tmtccmd.com.dummy import DummyComIF, TmGeneratorCfg, TmTrafficGenerator
+from tmtccmd.tmtc import CcsdsTmHandler, CcsdsTmListener, GenericApidHandlerBase
+
+
+class CountingHandler(GenericApidHandlerBase):
+    def __init__(self):
+        super().__init__(None)
+        self.packets = 0
+
+    def handle_tm(self, apid: int, _packet: bytes, _user_args: Any):
+        self.packets += 1
+
+    def handle_tm_batch(self, apid: int, packets: List[bytes], _user_args: Any):
+        self.packets += len(packets)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-d", "--duration", type=float, default=3.0, help="Duration in seconds")
+    parser.add_argument(
+        "-r", "--rate", type=float, default=None, help="Packet rate. Default: Maximum rate"
+    )
+    parser.add_argument("-b", "--burst", type=int, default=1, help="Burst size")
+    parser.add_argument("--crc-errors", type=float, default=0.0, help="CRC error probability")
+    parser.add_argument("--seq-gaps", type=float, default=0.0, help="Sequence gap probability")
+    parser.add_argument("--batch", action="store_true", help="Use the batch mode of the listener")
+    args = parser.parse_args()
+    cfg = TmGeneratorCfg(
+        packet_rate=args.rate,
+        apids=(0x02, 0x03, 0x04),
+        burst_size=args.burst,
+        crc_error_probability=args.crc_errors,
+        seq_gap_probability=args.seq_gaps,
+        seed=0,
+    )
+    generator = TmTrafficGenerator(cfg)
+    com_if = DummyComIF(generator)
+    handler = CountingHandler()
+    listener = CcsdsTmListener(CcsdsTmHandler(handler), batch_mode=args.batch)
+    com_if.open()
+    start = time.perf_counter()
+    while time.perf_counter() - start < args.duration:
+        if com_if.data_available():
+            listener.operation(com_if)
+        else:
+            time.sleep(0.001)
+    duration = time.perf_counter() - start
+    com_if.close()
+    print(f"generated  : {generator.packets_generated} packets")
+    print(f"handled    : {handler.packets} packets, {handler.packets / duration:.0f} 1/s")
+    print(f"seq gaps   : {generator.seq_gaps_generated}")
+    print(f"CRC errors : {generator.crc_errors_generated}")
+
+
+if __name__ == "__main__":
+    main()
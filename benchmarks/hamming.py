@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Benchmark for the pure Python and the vectorised NumPy hamming code functions.
+
+Verifies that both implementations produce identical codes, return codes and corrected data
+for a random image with injected single bit errors.
+"""
+
+import argparse
+import os
+import random
+import time
+
+from tmtccmd.util.hammingcode import (
+    hamming_compute_256x,
+    hamming_compute_256x_np,
+    hamming_verify_256x,
+    hamming_verify_256x_np,
+)
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-s", "--size", type=int, default=4, help="Image size in MiB")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=None, help="Worker processes for the NumPy path"
+    )
+    parser.add_argument("-e", "--errors", type=int, default=100, help="Injected bit errors")
+    parser.add_argument("--skip-python", action="store_true", help="Skip the pure Python path")
+    args = parser.parse_args()
+    image = bytearray(os.urandom(args.size * 1024 * 1024))
+    num_blocks = len(image) // 256
+    np_code, np_time = timed(hamming_compute_256x_np, image, args.workers)
+    print(f"NumPy compute: {np_time:.3f} s, {len(image) / np_time / 1e6:.1f} MB/s")
+
+    corrupted = bytearray(image)
+    rng = random.Random(0)
+    for block in rng.sample(range(num_blocks), min(args.errors, num_blocks)):
+        corrupted[block * 256 + rng.randrange(256)] ^= 1 << rng.randrange(8)
+    np_data = bytearray(corrupted)
+    np_result, np_time = timed(hamming_verify_256x_np, np_data, np_code, args.workers)
+    print(f"NumPy verify: {np_time:.3f} s, {np_result}")
+    if np_data != image:
+        raise SystemExit("NumPy verification did not restore the image")
+
+    if args.skip_python:
+        return
+    py_code, py_time = timed(hamming_compute_256x, image)
+    print(f"Python compute: {py_time:.3f} s, {len(image) / py_time / 1e6:.1f} MB/s")
+    py_data = bytearray(corrupted)
+    py_result, py_time = timed(hamming_verify_256x, py_data, py_code)
+    print(f"Python verify: {py_time:.3f} s, {py_result}")
+    if py_code != np_code or py_result != np_result or py_data != np_data:
+        raise SystemExit("Results of the Python and NumPy implementations differ")
+    print("Results are identical")
+
+
+if __name__ == "__main__":
+    main()
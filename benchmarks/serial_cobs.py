@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Throughput benchmark for the COBS serial interface over a pseudo terminal pair.
+
+Only works on POSIX systems.
+"""
+
+import argparse
+import os
+import pty
+import threading
+import time
+import tty
+
+from cobs import cobs
+
+from tmtccmd.com.serial_base import SerialCfg
+from tmtccmd.com.serial_cobs import SerialCobsComIF
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--num", type=int, default=20000, help="Number of frames")
+    parser.add_argument("-s", "--size", type=int, default=64, help="Packet size")
+    parser.add_argument("-b", "--baud", type=int, default=921600, help="Configured baud rate")
+    args = parser.parse_args()
+    master, slave = pty.openpty()
+    tty.setraw(master)
+    tty.setraw(slave)
+    ser_cfg = SerialCfg(
+        com_if_id="cobs_bench",
+        serial_port=os.ttyname(slave),
+        baud_rate=args.baud,
+        serial_timeout=1.0,
+    )
+    com_if = SerialCobsComIF(ser_cfg)
+    com_if.open()
+    frame = bytearray([0])
+    frame.extend(cobs.encode(bytes(range(1, args.size + 1))))
+    frame.append(0)
+    frames_per_write = 64
+    chunk = bytes(frame * frames_per_write)
+
+    def writer():
+        for _ in range(args.num // frames_per_write):
+            view = memoryview(chunk)
+            while view:
+                written = os.write(master, view)
+                view = view[written:]
+
+    received = 0
+    start = time.perf_counter()
+    writer_thread = threading.Thread(target=writer, daemon=True)
+    writer_thread.start()
+    expected = (args.num // frames_per_write) * frames_per_write
+    timeout = time.perf_counter() + 60.0
+    while received < expected and time.perf_counter() < timeout:
+        if com_if.data_available(0.01):
+            received += len(com_if.receive())
+    duration = time.perf_counter() - start
+    throughput = received * len(frame) / duration
+    print(
+        f"{received}/{expected} frames in {duration:.3f} s, {received / duration:.0f} frames/s, "
+        f"{throughput * 10 / 1e6:.2f} MBaud equivalent, {com_if.broken_frames} broken frames"
+    )
+    com_if.close()
+    os.close(master)
+    os.close(slave)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Throughput benchmark of the process pool TM decoding stage against inline decoding.
+
+Decodes generated PUS TM with :py:func:`tmtccmd.tmtc.tm_decode.decode_pus_tm`, once inline and
+once with a :py:class:`tmtccmd.tmtc.tm_decode.TmDecodeStage` for each given number of workers.
+The speed-up depends on the number of available cores.
+"""
+
+import argparse
+import os
+import time
+
+from tmtccmd.com.dummy import TmGeneratorCfg, TmTrafficGenerator
+from tmtccmd.tmtc.tm_decode import TmDecodeCfg, TmDecodeStage, decode_pus_tm
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--num", type=int, default=200000, help="Number of packets")
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[4, 8, 16],
+        help="Numbers of worker processes",
+    )
+    parser.add_argument("-b", "--batch-size", type=int, default=512, help="Packets per batch")
+    args = parser.parse_args()
+    generator = TmTrafficGenerator(TmGeneratorCfg(seed=0))
+    packets = generator.generate(args.num)
+    print(f"{len(packets)} packets, {os.cpu_count()} CPUs")
+
+    start = time.perf_counter()
+    inline_records = [decode_pus_tm(packet) for packet in packets]
+    inline_rate = len(packets) / (time.perf_counter() - start)
+    print(f"inline      : {inline_rate:.0f} packets/s")
+
+    for workers in args.workers:
+        stage = TmDecodeStage(cfg=TmDecodeCfg(num_workers=workers, batch_size=args.batch_size))
+        # Start the workers before measuring.
+        stage.decode(packets[: workers * args.batch_size])
+        start = time.perf_counter()
+        records = stage.decode(packets)
+        rate = len(packets) / (time.perf_counter() - start)
+        stage.close()
+        if records != inline_records:
+            raise SystemExit("Records of the decode stage differ from the inline records")
+        print(f"{workers:2d} workers  : {rate:.0f} packets/s, speed-up {rate / inline_rate:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Benchmark for the UDP client reception paths.
+
+Compares the old reception path (one select call per datagram and a copy into a new bytearray)
+with :py:meth:`tmtccmd.com.udp.UdpClient.receive` and the drain mode
+:py:meth:`tmtccmd.com.udp.UdpClient.receive_views`.
+"""
+
+import argparse
+import select
+import socket
+import time
+from typing import Callable, List
+
+from tmtccmd.com.tcpip_utils import EthAddr
+from tmtccmd.com.udp import UdpClient
+
+LOCALHOST = "127.0.0.1"
+
+
+def legacy_receive(udp_socket: socket.socket) -> List[bytearray]:
+    packet_list = []
+    while select.select([udp_socket], [], [], 0)[0]:
+        data, _ = udp_socket.recvfrom(4096)
+        packet_list.append(bytearray(data))
+    return packet_list
+
+
+def run(name: str, recv_func: Callable[[], list], sender, client_addr, packet, num, burst):
+    received = 0
+    start = time.perf_counter()
+    for _ in range(num // burst):
+        for _ in range(burst):
+            sender.sendto(packet, client_addr)
+        received += len(recv_func())
+    received += len(recv_func())
+    duration = time.perf_counter() - start
+    print(f"{name:<16}: {received} datagrams in {duration:.3f} s, {received / duration:.0f} 1/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--num", type=int, default=100000, help="Number of datagrams")
+    parser.add_argument("-b", "--burst", type=int, default=32, help="Datagrams per receive call")
+    parser.add_argument("-s", "--size", type=int, default=64, help="Datagram size")
+    args = parser.parse_args()
+    packet = bytes(args.size)
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sender.bind((LOCALHOST, 0))
+    client = UdpClient(
+        "udp",
+        send_address=EthAddr.from_tuple(sender.getsockname()),
+        recv_addr=EthAddr(LOCALHOST, 0),
+        recv_pool_size=args.burst,
+    )
+    client.open()
+    client.udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+    client_addr = client.udp_socket.getsockname()
+    run(
+        "legacy",
+        lambda: legacy_receive(client.udp_socket),
+        sender,
+        client_addr,
+        packet,
+        args.num,
+        args.burst,
+    )
+    run("receive", client.receive, sender, client_addr, packet, args.num, args.burst)
+    run("receive_views", client.receive_views, sender, client_addr, packet, args.num, args.burst)
+    client.close()
+    sender.close()
+
+
+if __name__ == "__main__":
+    main()
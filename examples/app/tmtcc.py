@@ -3,18 +3,17 @@
 
 import logging
 import sys
-import time
 from typing import Any, Optional
 
 from prompt_toolkit.history import FileHistory, History
 from spacepackets.ccsds import CdsShortTimestamp
-from spacepackets.ecss import PusTelecommand, PusTelemetry, PusVerificator
+from spacepackets.ecss import PusTelecommand, PusVerificator
 from spacepackets.ecss.pus_1_verification import Service1Tm, UnpackParams
 from spacepackets.ecss.pus_17_test import Service17Tm
 from spacepackets.util import UnsignedByteField
 
 import tmtccmd
-from tmtccmd import BackendRequest, CcsdsTmtcBackend, ProcedureParamsWrapper
+from tmtccmd import CcsdsTmtcBackend, ProcedureParamsWrapper
 from tmtccmd.com import ComInterface
 from tmtccmd.config import (
     CmdTreeNode,
@@ -26,6 +25,7 @@ from tmtccmd.config import (
     params_to_procedure_conversion,
 )
 from tmtccmd.config.args import perform_tree_printout
+from tmtccmd.core.run_loop import BackendRunLoop
 from tmtccmd.fsfw.tmtc_printer import FsfwTmTcPrinter
 from tmtccmd.logging import add_colorlog_console_logger
 from tmtccmd.logging.pus import (
@@ -33,6 +33,7 @@ from tmtccmd.logging.pus import (
 )
 from tmtccmd.pus import VerificationWrapper
 from tmtccmd.pus.s5_fsfw_event import Service5Tm
+from tmtccmd.pus.tm.view import PusTmView
 from tmtccmd.tmtc import (
     CcsdsTmHandler,
     DefaultPusQueueHelper,
@@ -132,12 +133,16 @@ class PusTmHandler(SpecificApidHandlerBase):
 
     def handle_tm(self, packet: bytes, _user_args: Any):
         try:
-            tm_packet = PusTelemetry.unpack(packet, timestamp_len=CdsShortTimestamp.TIMESTAMP_SIZE)
+            # Only decode the header fields needed for the routing.
+            tm_view = PusTmView(packet, timestamp_len=CdsShortTimestamp.TIMESTAMP_SIZE)
         except ValueError as e:
             _LOGGER.warning("Could not generate PUS TM object from raw data")
             _LOGGER.warning(f"Raw Packet: [{packet.hex(sep=',')}], REPR: {packet!r}")
             raise e
-        service = tm_packet.service
+        if not tm_view.crc_valid():
+            _LOGGER.warning(f"Invalid CRC for PUS TM packet {tm_view!r}")
+            return
+        service = tm_view.service
         dedicated_handler = False
         if service == 1:
             verif_tm = Service1Tm.unpack(
@@ -146,8 +151,8 @@ class PusTmHandler(SpecificApidHandlerBase):
             res = self.verif_wrapper.add_tm(verif_tm)
             if res is None:
                 _LOGGER.info(
-                    f"Received Verification TM[{tm_packet.service},"
-                    f" {tm_packet.subservice}] with Request ID"
+                    f"Received Verification TM[{tm_view.service},"
+                    f" {tm_view.subservice}] with Request ID"
                     f" {verif_tm.tc_req_id.as_u32():#08x}"
                 )
                 _LOGGER.warning(f"No matching telecommand found for {verif_tm.tc_req_id}")
@@ -165,16 +170,13 @@ class PusTmHandler(SpecificApidHandlerBase):
                 _LOGGER.info("Received Ping Reply TM[17,2]")
             else:
                 _LOGGER.info(
-                    "Received Test Packet with unknown subservice" f" {tm_packet.subservice}"
+                    "Received Test Packet with unknown subservice" f" {tm_view.subservice}"
                 )
-        if tm_packet is None:
-            _LOGGER.info(f"The service {service} is not implemented in Telemetry Factory")
-            tm_packet = PusTelemetry.unpack(packet, timestamp_len=CdsShortTimestamp.TIMESTAMP_SIZE)
         # TODO: Insert this into a DB instead. Maybe use sqlite for first variant.
         # self.raw_logger.log_tm(tm_packet)
         if not dedicated_handler:
             _LOGGER.info(
-                f"Received PUS TM [{tm_packet.service}, {tm_packet.subservice}] with not dedicated "
+                f"Received PUS TM [{tm_view.service}, {tm_view.subservice}] with not dedicated "
                 f"handler"
             )
 
@@ -283,27 +285,17 @@ def main():  # noqa: C901
         init_procedure=init_proc,
     )
     tmtccmd.start(tmtc_backend=tmtc_backend, hook_obj=hook_obj)
+    # The run loop waits for TM or for the next TC to become due instead of sleeping for a
+    # fixed time between the periodic operations.
+    run_loop = BackendRunLoop(tmtc_backend)
     try:
-        while True:
-            state = tmtc_backend.periodic_op(None)
-            if state.request == BackendRequest.TERMINATION_NO_ERROR:
-                tmtc_backend.close_com_if()
-                sys.exit(0)
-            elif state.request == BackendRequest.DELAY_IDLE:
-                _LOGGER.info("TMTC Client in IDLE mode")
-                time.sleep(3.0)
-            elif state.request == BackendRequest.DELAY_LISTENER:
-                time.sleep(0.8)
-            elif state.request == BackendRequest.DELAY_CUSTOM:
-                if state.next_delay.total_seconds() <= 0.4:
-                    time.sleep(state.next_delay.total_seconds())
-                else:
-                    time.sleep(0.4)
-            elif state.request == BackendRequest.CALL_NEXT:
-                pass
+        # Returns when the backend requests termination
+        run_loop.run()
     except KeyboardInterrupt:
-        tmtc_backend.close_com_if()
-        sys.exit(0)
+        pass
+    run_loop.close()
+    tmtc_backend.close_com_if()
+    sys.exit(0)
 
 
 if __name__ == "__main__":
@@ -93,3 +93,35 @@ class ComInterface(ABC):
             thrown on decoding errors.
         :return: 0 if no data is available, number of packets otherwise.
         """
+
+    def flush(self):
+        """Send data which was buffered by the interface, for example to coalesce multiple
+        packets. The :py:class:`tmtccmd.core.ccsds_backend.CcsdsTmtcBackend` calls this after
+        each TC operation unless the next TC is due immediately. This default implementation
+        does nothing.
+
+        :raises SendError: Sending failed for some reason.
+        """
+
+    def fileno(self) -> int:
+        """File descriptor which becomes readable when TM packets are available. This allows
+        waiting for TM in a :py:mod:`selectors` based event loop like the
+        :py:class:`tmtccmd.core.run_loop.BackendRunLoop` instead of polling.
+
+        The descriptor needs to stay readable until the data was retrieved with
+        :py:meth:`receive`. This default implementation signals that the interface does not
+        support this.
+
+        :raises NotImplementedError: Interface does not provide a file descriptor.
+        """
+        raise NotImplementedError("communication interface does not provide a file descriptor")
+
+    @property
+    def link_stats(self):
+        """:py:class:`tmtccmd.com.link_stats.LinkStatistics` of the interface, which count the
+        packets and bytes in both directions, decode errors, send latencies and reception queue
+        depths. This default implementation returns None because the interface does not collect
+        statistics. The :py:class:`tmtccmd.com.link_stats.LinkStatsComIF` wrapper can be used
+        to collect basic statistics for any interface.
+        """
+        return None
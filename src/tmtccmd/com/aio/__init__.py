@@ -0,0 +1,140 @@
+"""Asynchronous communication interfaces based on :py:mod:`asyncio`. All interfaces of this
+package run inside one event loop, so one process can drive many links concurrently without
+requiring a thread for each interface."""
+
+import asyncio
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Deque, List, Optional
+
+from tmtccmd.com import ComInterface
+
+
+class AsyncComInterface(ABC):
+    """Generic form of an asynchronous communication interface.
+
+    Concrete implementations store received packets with :py:meth:`_store_packets`.
+    The packets can then be awaited with :py:meth:`receive` or retrieved without waiting with
+    :py:meth:`receive_nowait`. All methods need to be called from the event loop the interface
+    was opened in.
+    """
+
+    def __init__(self):
+        self._reception_queue: Deque[bytes] = deque()
+        self.__reception_event: Optional[asyncio.Event] = None
+
+    @property
+    @abstractmethod
+    def id(self) -> str:
+        pass
+
+    @abstractmethod
+    async def open(self):
+        """Opens the communication interface to allow communication."""
+
+    @abstractmethod
+    def is_open(self) -> bool:
+        pass
+
+    @abstractmethod
+    async def close(self):
+        """Closes the communication interface and releases any held resources."""
+
+    @abstractmethod
+    def send_nowait(self, data: bytes):
+        """Send raw data without waiting. The data might be buffered by the underlying
+        transport, :py:meth:`drain` can be used to wait until the buffer is flushed.
+
+        :raises SendError: Sending failed for some reason.
+        """
+
+    async def drain(self):
+        """Wait until the send buffer of the underlying transport is flushed far enough."""
+
+    async def send(self, data: bytes):
+        """Send raw data and wait for the send buffer to be flushed.
+
+        :raises SendError: Sending failed for some reason.
+        """
+        self.send_nowait(data)
+        await self.drain()
+
+    def data_available(self) -> int:
+        return len(self._reception_queue)
+
+    async def wait_for_data(self, timeout: Optional[float] = None) -> int:
+        """Wait until packets were received or the timeout in seconds expires.
+
+        :return: Number of packets available.
+        """
+        if not self._reception_queue:
+            event = self._reception_event()
+            event.clear()
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return len(self._reception_queue)
+
+    def receive_nowait(self) -> List[bytes]:
+        """Returns all packets received up to now."""
+        packet_list = list(self._reception_queue)
+        self._reception_queue.clear()
+        return packet_list
+
+    async def receive(self, timeout: Optional[float] = None) -> List[bytes]:
+        """Returns a list of received packets. Waits until at least one packet was received or
+        the timeout in seconds expires."""
+        await self.wait_for_data(timeout)
+        return self.receive_nowait()
+
+    def _store_packets(self, packets: List[bytes]):
+        if not packets:
+            return
+        self._reception_queue.extend(packets)
+        self._reception_event().set()
+
+    def _reception_event(self) -> asyncio.Event:
+        # Created lazily because an event needs to be created inside the event loop with older
+        # Python versions.
+        if self.__reception_event is None:
+            self.__reception_event = asyncio.Event()
+        return self.__reception_event
+
+
+class SyncComAdapter(ComInterface):
+    """Exposes an :py:class:`AsyncComInterface` as a synchronous :py:class:`ComInterface`
+    which can be passed to components like the TC handler or the
+    :py:class:`tmtccmd.tmtc.ccsds_tm_listener.CcsdsTmListener`.
+
+    Sending and receiving never block. The adapter does not manage the lifecycle of the wrapped
+    interface, which needs to be opened and closed with its asynchronous methods.
+    """
+
+    def __init__(self, async_com_if: AsyncComInterface):
+        self.async_com_if = async_com_if
+
+    @property
+    def id(self) -> str:
+        return self.async_com_if.id
+
+    def initialize(self, args: Any = 0) -> Any:
+        pass
+
+    def open(self, args: Any = 0):
+        pass
+
+    def is_open(self) -> bool:
+        return self.async_com_if.is_open()
+
+    def close(self, args: Any = 0):
+        pass
+
+    def send(self, data: bytes):
+        self.async_com_if.send_nowait(data)
+
+    def receive(self, parameters: Any = 0) -> List[bytes]:
+        return self.async_com_if.receive_nowait()
+
+    def data_available(self, timeout: float = 0, parameters: Any = 0) -> int:
+        return self.async_com_if.data_available()
@@ -0,0 +1,45 @@
+"""Asynchronous serial communication interface using the DLE protocol. Requires the
+`pyserial-asyncio <https://pypi.org/project/pyserial-asyncio/>`_ package."""
+
+import asyncio
+from typing import List, Optional, Tuple
+
+from dle_encoder import DleEncoder
+
+from tmtccmd.com.aio.stream import AsyncStreamComInterface, DEFAULT_READ_SIZE
+from tmtccmd.com.framing import DleStreamDecoder
+from tmtccmd.com.serial_base import SerialCfg
+from tmtccmd.com.serial_dle import DleCfg
+
+
+class AsyncSerialDleComIF(AsyncStreamComInterface):
+    """Asynchronous version of the :py:class:`tmtccmd.com.serial_dle.SerialDleComIF`."""
+
+    def __init__(
+        self, ser_cfg: SerialCfg, dle_cfg: Optional[DleCfg], read_size: int = DEFAULT_READ_SIZE
+    ):
+        super().__init__(ser_cfg.com_if_id, read_size)
+        self.ser_cfg = ser_cfg
+        self.dle_cfg = dle_cfg
+        self.encoder = DleEncoder()
+        self.decoder = DleStreamDecoder()
+        if dle_cfg and dle_cfg.dle_max_frame:
+            self.decoder.max_frame_size = dle_cfg.dle_max_frame
+
+    async def _open_stream(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        try:
+            import serial_asyncio
+        except ImportError:
+            raise ImportError(
+                "the pyserial-asyncio package is required for asynchronous serial interfaces"
+            )
+        self.decoder.reset()
+        return await serial_asyncio.open_serial_connection(
+            url=self.ser_cfg.serial_port, baudrate=self.ser_cfg.baud_rate
+        )
+
+    def _decode(self, data: bytes) -> List[bytes]:
+        return self.decoder.decode(data)
+
+    def _encode(self, packet: bytes) -> bytes:
+        return self.encoder.encode(source_packet=packet, add_stx_etx=True)
@@ -0,0 +1,103 @@
+"""Base class for asynchronous communication interfaces on top of asyncio streams"""
+
+import asyncio
+import logging
+from abc import abstractmethod
+from typing import List, Optional, Tuple
+
+from tmtccmd.com import SendError
+from tmtccmd.com.aio import AsyncComInterface
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_READ_SIZE = 4096
+
+
+class AsyncStreamComInterface(AsyncComInterface):
+    """Asynchronous communication interface for byte streams. A reader task is spawned on
+    :py:meth:`open` which decodes the received stream into packets using :py:meth:`_decode`.
+    Packets are encoded with :py:meth:`_encode` before sending them.
+    """
+
+    def __init__(self, com_if_id: str, read_size: int = DEFAULT_READ_SIZE):
+        super().__init__()
+        self.com_if_id = com_if_id
+        self.read_size = read_size
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self.__reader_task: Optional[asyncio.Task] = None
+
+    @property
+    def id(self) -> str:
+        return self.com_if_id
+
+    @abstractmethod
+    async def _open_stream(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        pass
+
+    @abstractmethod
+    def _decode(self, data: bytes) -> List[bytes]:
+        """Decode a chunk of the received stream. Partial packets need to be kept by the
+        implementation until the next call.
+
+        :return: List of all packets completed by the chunk.
+        """
+
+    def _encode(self, packet: bytes) -> bytes:
+        return packet
+
+    async def open(self):
+        if self.is_open():
+            return
+        # Clean up a stream which was closed by the peer.
+        await self.close()
+        self._reader, self._writer = await self._open_stream()
+        self.__reader_task = asyncio.create_task(self.__read_stream())
+
+    def is_open(self) -> bool:
+        """False after :py:meth:`close` or if the peer closed the stream."""
+        if self._writer is None or self._writer.is_closing():
+            return False
+        return not self._reader.at_eof()
+
+    async def close(self):
+        if self.__reader_task is not None:
+            self.__reader_task.cancel()
+            try:
+                await self.__reader_task
+            except asyncio.CancelledError:
+                pass
+            self.__reader_task = None
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+            self._writer = None
+            self._reader = None
+
+    def send_nowait(self, data: bytes):
+        if self._writer is None:
+            raise SendError(f"communication interface {self.id} is not open", None)
+        self._writer.write(self._encode(data))
+
+    async def drain(self):
+        if self._writer is None:
+            return
+        try:
+            await self._writer.drain()
+        except OSError as e:
+            raise SendError(f"sending on communication interface {self.id} failed", e)
+
+    async def __read_stream(self):
+        while True:
+            try:
+                data = await self._reader.read(self.read_size)
+            except OSError as e:
+                _LOGGER.warning(f"Reading from communication interface {self.id} failed: {e}")
+                return
+            if not data:
+                _LOGGER.info(f"Stream of communication interface {self.id} was closed")
+                return
+            self._store_packets(self._decode(data))
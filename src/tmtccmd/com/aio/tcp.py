@@ -0,0 +1,34 @@
+"""Asynchronous TCP communication interface"""
+
+import asyncio
+from typing import List, Sequence, Tuple
+
+from spacepackets.ccsds.spacepacket import PacketId
+
+from tmtccmd.com.aio.stream import AsyncStreamComInterface, DEFAULT_READ_SIZE
+from tmtccmd.com.framing import SpacePacketFramer
+from tmtccmd.com.tcpip_utils import EthAddr
+
+
+class AsyncTcpSpacepacketsClient(AsyncStreamComInterface):
+    """Asynchronous version of the :py:class:`tmtccmd.com.tcp.TcpSpacepacketsClient`. The TCP
+    stream is parsed for CCSDS space packets with the given packet IDs."""
+
+    def __init__(
+        self,
+        com_if_id: str,
+        space_packet_ids: Sequence[PacketId],
+        target_address: EthAddr,
+        read_size: int = DEFAULT_READ_SIZE,
+    ):
+        super().__init__(com_if_id, read_size)
+        self.target_address = target_address
+        self.framer = SpacePacketFramer(space_packet_ids)
+
+    async def _open_stream(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        self.framer.reset()
+        return await asyncio.open_connection(self.target_address.ip_addr, self.target_address.port)
+
+    def _decode(self, data: bytes) -> List[bytes]:
+        self.framer.feed(data)
+        return [bytes(packet) for packet in self.framer.parse()]
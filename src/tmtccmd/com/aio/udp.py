@@ -0,0 +1,63 @@
+"""Asynchronous UDP communication interface"""
+
+import asyncio
+import logging
+import socket
+from typing import Optional
+
+from tmtccmd.com import SendError
+from tmtccmd.com.aio import AsyncComInterface
+from tmtccmd.com.tcpip_utils import EthAddr
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _UdpProtocol(asyncio.DatagramProtocol):
+    def __init__(self, com_if: "AsyncUdpClient"):
+        self.com_if = com_if
+
+    def datagram_received(self, data: bytes, addr):
+        self.com_if._store_packets([data])
+
+    def error_received(self, exc: Exception):
+        _LOGGER.warning(f"UDP error on communication interface {self.com_if.id}: {exc}")
+
+
+class AsyncUdpClient(AsyncComInterface):
+    """Asynchronous version of the :py:class:`tmtccmd.com.udp.UdpClient`. Each received datagram
+    is stored as one packet."""
+
+    def __init__(self, com_if_id: str, send_address: EthAddr, recv_addr: Optional[EthAddr] = None):
+        super().__init__()
+        self.com_if_id = com_if_id
+        self.send_address = send_address
+        self.recv_addr = recv_addr
+        self.transport: Optional[asyncio.DatagramTransport] = None
+
+    @property
+    def id(self) -> str:
+        return self.com_if_id
+
+    async def open(self):
+        if self.is_open():
+            return
+        loop = asyncio.get_running_loop()
+        local_addr = None
+        if self.recv_addr is not None:
+            local_addr = self.recv_addr.to_tuple
+        self.transport, _ = await loop.create_datagram_endpoint(
+            lambda: _UdpProtocol(self), local_addr=local_addr, family=socket.AF_INET
+        )
+
+    def is_open(self) -> bool:
+        return self.transport is not None
+
+    async def close(self):
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+
+    def send_nowait(self, data: bytes):
+        if self.transport is None:
+            raise SendError(f"communication interface {self.id} is not open", None)
+        self.transport.sendto(data, self.send_address.to_tuple)
@@ -2,10 +2,15 @@
 external hardware or an extra socket
 """
 
-from typing import List, Optional
+import dataclasses
+import random
+import time
+from typing import Dict, List, Optional, Sequence
 
 from deprecated.sphinx import deprecated
 from spacepackets.ccsds.time import CdsShortTimestamp
+from spacepackets.crc import CRC16_CCITT_FUNC
+from spacepackets.ecss import PusTelemetry
 from spacepackets.ecss.pus_1_verification import (
     RequestId,
     Service1Tm,
@@ -105,10 +110,164 @@ class DummyHandler:
             return []
 
 
+# Subservice and fixed source data length of the generated packets for each service. None
+# means that the source data length is taken from the size distribution.
+_GENERATED_SERVICES: Dict[int, tuple] = {
+    1: (Pus1Subservice.TM_ACCEPTANCE_SUCCESS, 4),
+    3: (25, None),
+    5: (1, 12),
+    17: (Pus17Subservice.TM_REPLY, 0),
+    20: (130, None),
+}
+# Number of pre-computed random template selections
+_SELECTION_TABLE_LEN = 8192
+
+
+@dataclasses.dataclass
+class TmGeneratorCfg:
+    """Configuration of the :py:class:`TmTrafficGenerator`.
+
+    :var packet_rate: Average number of generated packets per second. None generates the
+        maximum number of packets on each call.
+    :var service_mix: Relative weights of the generated PUS services. Supported services are
+        1, 3, 5, 17 and 20.
+    :var source_data_sizes: Source data lengths of housekeeping and parameter packets.
+    :var source_data_size_weights: Relative weights of the source data lengths. All lengths
+        are equally likely if this is None.
+    :var apids: APIDs of the generated packets. Each APID has its own sequence count.
+    :var seq_gap_probability: Probability that a sequence count is skipped before a packet.
+    :var crc_error_probability: Probability that a packet has an invalid CRC.
+    :var burst_size: Number of packets which are generated at once. The average packet rate is
+        kept, so larger bursts lead to longer pauses in between.
+    :var max_packets_per_receive: Maximum number of packets generated for one receive call.
+    :var seed: Seed for the random generator to get reproducible traffic.
+    """
+
+    packet_rate: Optional[float] = 1000.0
+    service_mix: Dict[int, float] = dataclasses.field(
+        default_factory=lambda: {1: 1.0, 3: 1.0, 5: 1.0, 17: 1.0, 20: 1.0}
+    )
+    source_data_sizes: Sequence[int] = (8, 64, 256)
+    source_data_size_weights: Optional[Sequence[float]] = None
+    apids: Sequence[int] = (0x02,)
+    seq_gap_probability: float = 0.0
+    crc_error_probability: float = 0.0
+    burst_size: int = 1
+    max_packets_per_receive: int = 4096
+    seed: Optional[int] = None
+
+
+class TmTrafficGenerator:
+    """Generates PUS TM traffic to benchmark the TM handling without hardware.
+
+    All packet variants are packed once as templates on construction. For each generated
+    packet, a template is copied and only the sequence count and the CRC are patched. The random
+    choice of templates, sequence gaps and CRC errors is pre-computed in a table, so the
+    per-packet overhead is small. The timestamps of the packets are the construction time.
+    """
+
+    def __init__(self, cfg: TmGeneratorCfg):
+        for service in cfg.service_mix:
+            if service not in _GENERATED_SERVICES:
+                raise ValueError(f"service {service} is not supported by the TM generator")
+        self.cfg = cfg
+        self.packets_generated = 0
+        self.seq_gaps_generated = 0
+        self.crc_errors_generated = 0
+        rng = random.Random(cfg.seed)
+        timestamp = CdsShortTimestamp.now().pack()
+        templates = []
+        weights = []
+        for apid_idx, apid in enumerate(cfg.apids):
+            for service, service_weight in cfg.service_mix.items():
+                subservice, data_len = _GENERATED_SERVICES[service]
+                if data_len is not None:
+                    sizes = [(data_len, 1.0)]
+                else:
+                    size_weights = cfg.source_data_size_weights or [1.0] * len(
+                        cfg.source_data_sizes
+                    )
+                    sizes = list(zip(cfg.source_data_sizes, size_weights))
+                for size, size_weight in sizes:
+                    packet = PusTelemetry(
+                        service=service,
+                        subservice=subservice,
+                        timestamp=timestamp,
+                        source_data=bytes(size),
+                        apid=apid,
+                    ).pack()
+                    templates.append((apid_idx, bytes(packet)))
+                    weights.append(service_weight * size_weight)
+        self._templates = templates
+        self._selection = rng.choices(range(len(templates)), weights, k=_SELECTION_TABLE_LEN)
+        self._seq_gaps = [
+            rng.random() < cfg.seq_gap_probability for _ in range(_SELECTION_TABLE_LEN)
+        ]
+        self._crc_errors = [
+            rng.random() < cfg.crc_error_probability for _ in range(_SELECTION_TABLE_LEN)
+        ]
+        self._table_idx = 0
+        self._seq_counts = [0] * len(cfg.apids)
+        self._start_time = time.monotonic()
+        self._packets_due_base = 0
+
+    def reset_rate(self):
+        """Restart the rate limiting, for example after the interface was re-opened."""
+        self._start_time = time.monotonic()
+        self._packets_due_base = self.packets_generated
+
+    def packets_due(self) -> int:
+        """Number of packets which need to be generated to keep the configured packet rate."""
+        cfg = self.cfg
+        if cfg.packet_rate is None:
+            return cfg.max_packets_per_receive
+        total_due = int((time.monotonic() - self._start_time) * cfg.packet_rate)
+        # Only whole bursts are generated.
+        total_due -= total_due % cfg.burst_size
+        due = self._packets_due_base + total_due - self.packets_generated
+        return max(0, min(due, cfg.max_packets_per_receive))
+
+    def generate(self, num_packets: int) -> List[bytes]:
+        packet_list = []
+        templates = self._templates
+        selection = self._selection
+        seq_gaps = self._seq_gaps
+        crc_errors = self._crc_errors
+        seq_counts = self._seq_counts
+        table_idx = self._table_idx
+        for _ in range(num_packets):
+            apid_idx, template = templates[selection[table_idx]]
+            packet = bytearray(template)
+            seq_count = seq_counts[apid_idx]
+            if seq_gaps[table_idx]:
+                seq_count = (seq_count + 1) & 0x3FFF
+                self.seq_gaps_generated += 1
+            packet[2] = (packet[2] & 0xC0) | (seq_count >> 8)
+            packet[3] = seq_count & 0xFF
+            seq_counts[apid_idx] = (seq_count + 1) & 0x3FFF
+            crc = CRC16_CCITT_FUNC(memoryview(packet)[:-2])
+            if crc_errors[table_idx]:
+                crc ^= 0xFFFF
+                self.crc_errors_generated += 1
+            packet[-2] = crc >> 8
+            packet[-1] = crc & 0xFF
+            packet_list.append(bytes(packet))
+            table_idx += 1
+            if table_idx == _SELECTION_TABLE_LEN:
+                table_idx = 0
+        self._table_idx = table_idx
+        self.packets_generated += num_packets
+        return packet_list
+
+
 class DummyComIF(ComInterface):
-    def __init__(self):
+    """Dummy communication interface which answers PUS 17 ping telecommands. A
+    :py:class:`TmTrafficGenerator` can be passed to generate additional TM traffic."""
+
+    def __init__(self, tm_generator: Optional[TmTrafficGenerator] = None):
         self.com_if_id = CoreComInterfaces.DUMMY.value
         self.dummy_handler = DummyHandler()
+        self.tm_generator = tm_generator
         self._open = False
         self.initialized = False
 
@@ -121,6 +280,8 @@ class DummyComIF(ComInterface):
 
     def open(self, args: any = None) -> None:
         self._open = True
+        if self.tm_generator is not None:
+            self.tm_generator.reset_rate()
 
     def is_open(self) -> bool:
         return self._open
@@ -131,10 +292,15 @@ class DummyComIF(ComInterface):
     def data_available(self, timeout: float = 0, parameters: any = 0):
         if self.dummy_handler.reply_pending:
             return True
+        if self.tm_generator is not None and self.tm_generator.packets_due() > 0:
+            return True
         return False
 
     def receive(self, parameters: any = 0) -> List[bytes]:
-        return self.dummy_handler.receive_reply_package()
+        packet_list = self.dummy_handler.receive_reply_package()
+        if self.tm_generator is not None and self._open:
+            packet_list.extend(self.tm_generator.generate(self.tm_generator.packets_due()))
+        return packet_list
 
     def send(self, data: bytes):
         if data is not None:
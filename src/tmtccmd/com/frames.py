@@ -0,0 +1,409 @@
+"""CCSDS TM and TC transfer frame layer.
+
+The TM side demultiplexes fixed-length TM transfer frames (CCSDS 132.0-B) into space packets,
+which can then be handled by the :py:class:`tmtccmd.tmtc.CcsdsTmListener`. The TC side wraps
+telecommands into TC transfer frames (CCSDS 232.0-B). The
+:py:class:`TransferFrameComIF` combines both and wraps any communication interface which
+transports whole transfer frames, so it plugs into the existing backend.
+"""
+
+import dataclasses
+from typing import Any, Dict, List, Optional
+
+from spacepackets.ccsds import SPACE_PACKET_HEADER_SIZE
+from spacepackets.crc import CRC16_CCITT_FUNC
+
+from tmtccmd.com import ComInterface
+from tmtccmd.com.framing import split_space_packets
+
+TM_PRIMARY_HEADER_LEN = 6
+TC_PRIMARY_HEADER_LEN = 5
+OCF_LEN = 4
+FECF_LEN = 2
+MAX_TC_FRAME_LEN = 1024
+# First header pointer values with a special meaning
+FHP_NO_PACKET_START = 0x7FF
+FHP_IDLE_FRAME = 0x7FE
+IDLE_APID = 0x7FF
+
+
+@dataclasses.dataclass
+class TmFrameCfg:
+    """Configuration of the TM transfer frames of a physical channel.
+
+    :var frame_len: Fixed length of all frames in bytes.
+    :var has_ocf: Frames contain a 4 byte operational control field.
+    :var has_fecf: Frames end with a 2 byte frame error control field (CRC-16-CCITT).
+    :var scid: Only frames of this spacecraft ID are accepted if it is not None.
+    """
+
+    frame_len: int
+    has_ocf: bool = False
+    has_fecf: bool = True
+    scid: Optional[int] = None
+
+    @property
+    def trailer_len(self) -> int:
+        return (OCF_LEN if self.has_ocf else 0) + (FECF_LEN if self.has_fecf else 0)
+
+
+@dataclasses.dataclass
+class TmFrameStatistics:
+    """Statistics of the :py:class:`TmFrameDemultiplexer`.
+
+    :var frames: Number of valid frames.
+    :var idle_frames: Number of frames which only contained idle data.
+    :var packets: Number of extracted space packets, without idle packets.
+    :var idle_packets: Number of discarded idle packets.
+    :var fecf_errors: Number of frames discarded because of an invalid FECF.
+    :var invalid_frames: Number of frames discarded because of a wrong length, version or SCID.
+    :var mc_count_gaps: Number of discontinuities of the master channel frame count.
+    :var vc_count_gaps: Number of discontinuities of the virtual channel frame counts.
+    :var lost_packets: Number of partially received packets discarded because of a frame count
+        gap or an inconsistent first header pointer.
+    """
+
+    frames: int = 0
+    idle_frames: int = 0
+    packets: int = 0
+    idle_packets: int = 0
+    fecf_errors: int = 0
+    invalid_frames: int = 0
+    mc_count_gaps: int = 0
+    vc_count_gaps: int = 0
+    lost_packets: int = 0
+
+
+class _VirtualChannel:
+    def __init__(self):
+        self.last_count: Optional[int] = None
+        # Start of a packet which continues in the next frame
+        self.partial = bytearray()
+
+
+class TmFrameDemultiplexer:
+    """Extracts space packets from fixed-length TM transfer frames.
+
+    Packets spanning multiple frames are re-assembled separately for each virtual channel. Only
+    the parts of packets which span frames are copied into a re-assembly buffer, all other
+    packets are copied out of the frame directly. The frame counters are checked for gaps. On a
+    gap, the partially received packet of the virtual channel is discarded and the channel
+    re-synchronizes on the first header pointer of the next frame. Idle frames and idle packets
+    are discarded.
+    """
+
+    def __init__(self, cfg: TmFrameCfg):
+        self.cfg = cfg
+        self.stats = TmFrameStatistics()
+        self.__vcs: Dict[int, _VirtualChannel] = dict()
+        self.__last_mc_count: Optional[int] = None
+        self.__stream_buf = bytearray()
+
+    def reset(self):
+        self.__vcs.clear()
+        self.__last_mc_count = None
+        self.__stream_buf.clear()
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Feed a chunk of a stream of back-to-back frames. The chunk does not need to be
+        aligned to the frame boundaries.
+
+        :return: Extracted space packets.
+        """
+        frame_len = self.cfg.frame_len
+        packets = []
+        if self.__stream_buf:
+            missing = frame_len - len(self.__stream_buf)
+            self.__stream_buf.extend(data[:missing])
+            if len(self.__stream_buf) < frame_len:
+                return packets
+            packets.extend(self.feed_frame(self.__stream_buf))
+            self.__stream_buf = bytearray()
+            data = memoryview(data)[missing:]
+        view = memoryview(data)
+        idx = 0
+        while len(view) - idx >= frame_len:
+            packets.extend(self.feed_frame(view[idx : idx + frame_len]))
+            idx += frame_len
+        if idx < len(view):
+            self.__stream_buf.extend(view[idx:])
+        return packets
+
+    def feed_frame(self, frame: bytes) -> List[bytes]:
+        """Process one complete frame.
+
+        :return: Extracted space packets.
+        """
+        cfg = self.cfg
+        if len(frame) != cfg.frame_len or frame[0] >> 6 != 0:
+            self.stats.invalid_frames += 1
+            return []
+        if cfg.has_fecf and CRC16_CCITT_FUNC(frame) != 0:
+            self.stats.fecf_errors += 1
+            return []
+        scid = ((frame[0] & 0x3F) << 4) | (frame[1] >> 4)
+        if cfg.scid is not None and scid != cfg.scid:
+            self.stats.invalid_frames += 1
+            return []
+        self.stats.frames += 1
+        vcid = (frame[1] >> 1) & 0x07
+        mc_count = frame[2]
+        if self.__last_mc_count is not None and mc_count != (self.__last_mc_count + 1) & 0xFF:
+            self.stats.mc_count_gaps += 1
+        self.__last_mc_count = mc_count
+        vc = self.__vcs.get(vcid)
+        if vc is None:
+            vc = _VirtualChannel()
+            self.__vcs[vcid] = vc
+        vc_count = frame[3]
+        if vc.last_count is not None and vc_count != (vc.last_count + 1) & 0xFF:
+            self.stats.vc_count_gaps += 1
+            self.__lose_partial(vc)
+        vc.last_count = vc_count
+        fhp = ((frame[4] & 0x07) << 8) | frame[5]
+        if fhp == FHP_IDLE_FRAME:
+            self.stats.idle_frames += 1
+            return []
+        data_start = TM_PRIMARY_HEADER_LEN
+        if frame[4] & 0x80:
+            # Secondary header, the length field is the header length minus one.
+            data_start += (frame[data_start] & 0x3F) + 1
+        data = memoryview(frame)[data_start : cfg.frame_len - cfg.trailer_len]
+        return self.__handle_data(vc, data, fhp)
+
+    def __handle_data(self, vc: _VirtualChannel, data: memoryview, fhp: int) -> List[bytes]:
+        packets = []
+        if fhp != FHP_NO_PACKET_START and fhp >= len(data):
+            self.stats.invalid_frames += 1
+            self.__lose_partial(vc)
+            return packets
+        if vc.partial:
+            continuation_len = len(data) if fhp == FHP_NO_PACKET_START else fhp
+            vc.partial.extend(data[:continuation_len])
+            completed, trailing_len = split_space_packets(memoryview(vc.partial))
+            for packet in completed:
+                self.__store_packet(packets, packet)
+            if fhp == FHP_NO_PACKET_START:
+                if completed:
+                    # Keep a following packet start which is not covered by the pointer.
+                    vc.partial = vc.partial[len(vc.partial) - trailing_len :]
+                return packets
+            if trailing_len > 0:
+                # The packet did not end where the next one starts according to the pointer.
+                self.__lose_partial(vc)
+            vc.partial = bytearray()
+        elif fhp == FHP_NO_PACKET_START:
+            # Continuation of a packet which was not received from the start
+            return packets
+        completed, trailing_len = split_space_packets(data[fhp:])
+        for packet in completed:
+            self.__store_packet(packets, packet)
+        if trailing_len > 0:
+            vc.partial = bytearray(data[len(data) - trailing_len :])
+        return packets
+
+    def __store_packet(self, packets: List[bytes], packet: memoryview):
+        if ((packet[0] << 8) | packet[1]) & 0x7FF == IDLE_APID:
+            self.stats.idle_packets += 1
+            return
+        self.stats.packets += 1
+        packets.append(bytes(packet))
+
+    def __lose_partial(self, vc: _VirtualChannel):
+        if vc.partial:
+            self.stats.lost_packets += 1
+            vc.partial = bytearray()
+
+
+class TmFrameBuilder:
+    """Packs space packets into fixed-length TM transfer frames of one virtual channel, for
+    example to simulate a spacecraft. Packets are streamed into the frames and may span
+    multiple frames. :py:meth:`flush` fills the current frame with an idle packet."""
+
+    def __init__(self, cfg: TmFrameCfg, scid: int, vcid: int = 0):
+        self.cfg = cfg
+        self.scid = scid
+        self.vcid = vcid
+        self.mc_count = 0
+        self.vc_count = 0
+        self.__data_start = TM_PRIMARY_HEADER_LEN
+        self.__data_end = cfg.frame_len - cfg.trailer_len
+        self.__new_frame()
+
+    def add_packet(self, packet: bytes) -> List[bytearray]:
+        """Add a packet to the current frame.
+
+        :return: Frames which were completed.
+        """
+        frames = []
+        view = memoryview(packet)
+        if self.__fhp is None:
+            self.__fhp = self.__fill - self.__data_start
+        while True:
+            write_len = min(self.__data_end - self.__fill, len(view))
+            self.__frame[self.__fill : self.__fill + write_len] = view[:write_len]
+            self.__fill += write_len
+            view = view[write_len:]
+            if self.__fill == self.__data_end:
+                frames.append(self.__finish_frame())
+            if not view:
+                return frames
+
+    def flush(self) -> List[bytearray]:
+        """Complete the current frame with an idle packet if it contains any data."""
+        remaining = self.__data_end - self.__fill
+        if self.__fill == self.__data_start:
+            return []
+        if remaining < SPACE_PACKET_HEADER_SIZE + 1:
+            # The idle packet header does not fit anymore, so the idle packet fills the next
+            # frame as well.
+            remaining += self.__data_end - self.__data_start
+        idle_packet = bytearray(remaining)
+        idle_packet[0] = IDLE_APID >> 8
+        idle_packet[1] = IDLE_APID & 0xFF
+        idle_packet[2] = 0xC0
+        data_len = remaining - SPACE_PACKET_HEADER_SIZE - 1
+        idle_packet[4] = data_len >> 8
+        idle_packet[5] = data_len & 0xFF
+        return self.add_packet(idle_packet)
+
+    def __new_frame(self):
+        self.__frame = bytearray(self.cfg.frame_len)
+        self.__fill = self.__data_start
+        self.__fhp: Optional[int] = None
+
+    def __finish_frame(self) -> bytearray:
+        frame = self.__frame
+        frame[0] = (self.scid >> 4) & 0x3F
+        frame[1] = ((self.scid & 0x0F) << 4) | (self.vcid << 1) | int(self.cfg.has_ocf)
+        frame[2] = self.mc_count
+        frame[3] = self.vc_count
+        fhp = FHP_NO_PACKET_START if self.__fhp is None else self.__fhp
+        # Segment length ID 0b11, no secondary header
+        frame[4] = 0x18 | (fhp >> 8)
+        frame[5] = fhp & 0xFF
+        if self.cfg.has_fecf:
+            crc = CRC16_CCITT_FUNC(memoryview(frame)[:-FECF_LEN])
+            frame[-2] = crc >> 8
+            frame[-1] = crc & 0xFF
+        self.mc_count = (self.mc_count + 1) & 0xFF
+        self.vc_count = (self.vc_count + 1) & 0xFF
+        self.__new_frame()
+        return frame
+
+
+class TcFrameBuilder:
+    """Wraps telecommands into TC transfer frames, one packet per frame.
+
+    The frame is allocated once with its final size and the packet is copied into it once.
+    The frame sequence number is only incremented for sequence-controlled (type AD) frames.
+    """
+
+    def __init__(
+        self,
+        scid: int,
+        vcid: int = 0,
+        bypass: bool = True,
+        has_fecf: bool = True,
+        max_frame_len: int = MAX_TC_FRAME_LEN,
+    ):
+        self.scid = scid
+        self.vcid = vcid
+        self.bypass = bypass
+        self.has_fecf = has_fecf
+        self.max_frame_len = max_frame_len
+        self.frame_seq_num = 0
+
+    def build(self, packet: bytes) -> bytearray:
+        """Wrap a packet into a TC transfer frame.
+
+        :raises ValueError: The packet does not fit into one frame.
+        """
+        frame_len = TC_PRIMARY_HEADER_LEN + len(packet) + (FECF_LEN if self.has_fecf else 0)
+        if frame_len > self.max_frame_len:
+            raise ValueError(
+                f"packet with length {len(packet)} does not fit into a TC frame with a maximum "
+                f"length of {self.max_frame_len}"
+            )
+        frame = bytearray(frame_len)
+        frame[0] = (int(self.bypass) << 5) | ((self.scid >> 8) & 0x03)
+        frame[1] = self.scid & 0xFF
+        frame[2] = ((self.vcid & 0x3F) << 2) | ((frame_len - 1) >> 8)
+        frame[3] = (frame_len - 1) & 0xFF
+        frame[4] = self.frame_seq_num
+        frame[TC_PRIMARY_HEADER_LEN : TC_PRIMARY_HEADER_LEN + len(packet)] = packet
+        if self.has_fecf:
+            crc = CRC16_CCITT_FUNC(memoryview(frame)[:-FECF_LEN])
+            frame[-2] = crc >> 8
+            frame[-1] = crc & 0xFF
+        if not self.bypass:
+            self.frame_seq_num = (self.frame_seq_num + 1) & 0xFF
+        return frame
+
+
+class TransferFrameComIF(ComInterface):
+    """Wraps a communication interface which transports transfer frames instead of space
+    packets. :py:meth:`receive` demultiplexes the received TM frames and returns space packets,
+    so the interface can be used with the :py:class:`tmtccmd.tmtc.CcsdsTmListener`.
+    :py:meth:`send` wraps the passed telecommand into a TC transfer frame.
+
+    The received data may be whole frames, for example one frame per datagram, or arbitrary
+    chunks of a frame stream.
+    """
+
+    def __init__(
+        self,
+        com_if: ComInterface,
+        demux: TmFrameDemultiplexer,
+        tc_builder: Optional[TcFrameBuilder] = None,
+    ):
+        """
+        :param com_if: Interface which transports the frames.
+        :param demux:
+        :param tc_builder: Telecommands are passed to the wrapped interface unchanged if this
+            is None.
+        """
+        self.com_if = com_if
+        self.demux = demux
+        self.tc_builder = tc_builder
+
+    @property
+    def id(self) -> str:
+        return self.com_if.id
+
+    def initialize(self, args: Any = 0) -> Any:
+        return self.com_if.initialize(args)
+
+    def open(self, args: Any = 0):
+        self.demux.reset()
+        self.com_if.open(args)
+
+    def is_open(self) -> bool:
+        return self.com_if.is_open()
+
+    def close(self, args: Any = 0):
+        self.com_if.close(args)
+
+    def send(self, data: bytes):
+        if self.tc_builder is not None:
+            data = self.tc_builder.build(data)
+        self.com_if.send(data)
+
+    def receive(self, parameters: Any = 0) -> List[bytes]:
+        packet_list = []
+        for chunk in self.com_if.receive(parameters):
+            packet_list.extend(self.demux.feed(chunk))
+        return packet_list
+
+    def data_available(self, timeout: float = 0, parameters: Any = 0) -> int:
+        return self.com_if.data_available(timeout, parameters)
+
+    def flush(self):
+        self.com_if.flush()
+
+    def fileno(self) -> int:
+        return self.com_if.fileno()
+
+    @property
+    def link_stats(self):
+        return self.com_if.link_stats
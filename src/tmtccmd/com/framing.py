@@ -0,0 +1,265 @@
+"""Incremental framing of CCSDS space packets and DLE frames inside byte streams"""
+
+import socket
+from typing import List, Optional, Sequence, Tuple
+
+from dle_encoder import (
+    STX_CHAR,
+    ETX_CHAR,
+    DLE_CHAR,
+    ESCAPED_STX,
+    ESCAPED_ETX,
+    ESCAPED_CR,
+    CARRIAGE_RETURN,
+)
+from spacepackets.ccsds import PacketId, SPACE_PACKET_HEADER_SIZE
+from spacepackets.ccsds.spacepacket import PACKET_ID_MASK
+
+# Large enough to always hold at least one maximum sized space packet
+DEFAULT_FRAMER_CAPACITY = 2**17
+MAX_SPACE_PACKET_LEN = 2**16 + SPACE_PACKET_HEADER_SIZE
+
+
+def split_space_packets(data: memoryview) -> Tuple[List[memoryview], int]:
+    """Split a buffer which contains consecutive space packets, for example a datagram which
+    aggregates multiple packets, using the packet data length field of the space packet headers.
+
+    :return: Tuple of the packet views and the number of trailing bytes which do not form a
+        complete space packet.
+    """
+    packets = []
+    idx = 0
+    end_idx = len(data)
+    while end_idx - idx >= SPACE_PACKET_HEADER_SIZE:
+        packet_len = ((data[idx + 4] << 8) | data[idx + 5]) + SPACE_PACKET_HEADER_SIZE + 1
+        if end_idx - idx < packet_len:
+            break
+        packets.append(data[idx : idx + packet_len])
+        idx += packet_len
+    return packets, end_idx - idx
+
+
+class SpacePacketFramer:
+    """Incremental framer for CCSDS space packets in a byte stream, for example a TCP stream.
+
+    The stream is received into one contiguous buffer, either directly from a socket with
+    :py:meth:`recv_into` or by copying chunks with :py:meth:`feed`. The parse offset is kept
+    between calls of :py:meth:`parse`, so bytes which were already analysed are never scanned
+    again. Unparsed data is moved to the start of the buffer once the write position gets close
+    to the end of the buffer, so packets are always contiguous.
+
+    The packet IDs are used to detect the start of space packets. Bytes which do not belong to a
+    space packet with a known packet ID are skipped and counted in :py:attr:`skipped_bytes`.
+    """
+
+    def __init__(self, packet_ids: Sequence[PacketId], capacity: int = DEFAULT_FRAMER_CAPACITY):
+        if capacity < MAX_SPACE_PACKET_LEN:
+            raise ValueError(f"framer capacity must be at least {MAX_SPACE_PACKET_LEN} bytes")
+        self.packet_ids = packet_ids
+        self.skipped_bytes = 0
+        self._raw_packet_ids = frozenset(packet_id.raw() for packet_id in packet_ids)
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self._read_idx = 0
+        self._write_idx = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buf)
+
+    @property
+    def pending(self) -> int:
+        """Number of bytes which were received but were not framed yet."""
+        return self._write_idx - self._read_idx
+
+    def reset(self):
+        """Discard all pending data, for example after a reconnect."""
+        self._read_idx = 0
+        self._write_idx = 0
+
+    def recv_into(self, sock: socket.socket) -> int:
+        """Receive data from the socket directly into the framer buffer.
+
+        :return: Number of bytes received. 0 means that the peer has closed the connection.
+        """
+        self._make_space()
+        read_len = sock.recv_into(self._view[self._write_idx :])
+        self._write_idx += read_len
+        return read_len
+
+    def feed(self, data: bytes):
+        """Copy a chunk of the stream into the framer buffer.
+
+        :raises ValueError: Not enough space left in the buffer. :py:meth:`parse` needs to be
+            called to free up space.
+        """
+        self._make_space()
+        end_idx = self._write_idx + len(data)
+        if end_idx > len(self._buf):
+            self._compact()
+            end_idx = self._write_idx + len(data)
+            if end_idx > len(self._buf):
+                raise ValueError("not enough space in framer buffer")
+        self._buf[self._write_idx : end_idx] = data
+        self._write_idx = end_idx
+
+    def parse(self) -> List[memoryview]:
+        """Frame all complete space packets which were received since the last call.
+
+        The returned memory views point into the internal buffer. They are only valid until the
+        next call of :py:meth:`recv_into` or :py:meth:`feed` and need to be copied if they are
+        stored.
+        """
+        packets = []
+        buf = self._buf
+        view = self._view
+        raw_ids = self._raw_packet_ids
+        idx = self._read_idx
+        end_idx = self._write_idx
+        while end_idx - idx >= SPACE_PACKET_HEADER_SIZE:
+            packet_id = ((buf[idx] << 8) | buf[idx + 1]) & PACKET_ID_MASK
+            if packet_id not in raw_ids:
+                # Keep parsing until a packet ID is found
+                idx += 1
+                self.skipped_bytes += 1
+                continue
+            packet_len = ((buf[idx + 4] << 8) | buf[idx + 5]) + SPACE_PACKET_HEADER_SIZE + 1
+            if end_idx - idx < packet_len:
+                # Split packet, wait for more data to arrive.
+                break
+            packets.append(view[idx : idx + packet_len])
+            idx += packet_len
+        self._read_idx = idx
+        return packets
+
+    def _make_space(self):
+        if self._read_idx == self._write_idx:
+            self._read_idx = 0
+            self._write_idx = 0
+        elif self._read_idx > 0 and len(self._buf) - self._write_idx < MAX_SPACE_PACKET_LEN:
+            self._compact()
+
+    def _compact(self):
+        pending = self._write_idx - self._read_idx
+        self._buf[0:pending] = self._buf[self._read_idx : self._write_idx]
+        self._read_idx = 0
+        self._write_idx = pending
+
+
+class DleStreamDecoder:
+    """Incremental decoder for DLE encoded frames in a byte stream, for example a serial stream.
+
+    Only the escaped mode of the `DLE protocol <https://pypi.org/project/dle-encoder/>`_ is
+    supported. In that mode, the STX and ETX characters never occur inside a frame, so frame
+    boundaries can be searched chunk-wise instead of byte by byte. Chunks of arbitrary size are
+    passed to :py:meth:`decode`. Partial frames are kept until the rest of the frame arrives.
+
+    The decoder re-synchronises on the next STX character:
+
+    - Bytes outside of a frame are skipped and counted in :py:attr:`skipped_bytes`.
+    - A frame which is interrupted by a new STX character, which exceeds the maximum frame size
+      or which contains an invalid escape sequence is discarded and counted in
+      :py:attr:`decode_errors`.
+    """
+
+    def __init__(self, escape_cr: bool = False, max_frame_size: Optional[int] = None):
+        """
+        :param escape_cr: Carriage return characters are escaped as well.
+        :param max_frame_size: Maximum size of an encoded frame including STX and ETX. Larger
+            frames are discarded.
+        """
+        self.escape_cr = escape_cr
+        self.max_frame_size = max_frame_size
+        self.frames_decoded = 0
+        self.decode_errors = 0
+        self.skipped_bytes = 0
+        self._buf = bytearray()
+        self._in_frame = False
+        # Offset into the partial frame which was already searched for STX and ETX
+        self._scan_idx = 1
+
+    @property
+    def pending(self) -> int:
+        """Number of bytes of a partially received frame."""
+        return len(self._buf)
+
+    def reset(self):
+        """Discard a partially received frame."""
+        self._buf.clear()
+        self._in_frame = False
+        self._scan_idx = 1
+
+    def decode(self, data: bytes) -> List[bytes]:
+        """Decode all frames which were completed by the passed chunk.
+
+        :return: List of decoded packets, in the order they were received.
+        """
+        packets = []
+        buf = self._buf
+        buf.extend(data)
+        while buf:
+            if not self._in_frame:
+                stx_idx = buf.find(STX_CHAR)
+                if stx_idx == -1:
+                    self.skipped_bytes += len(buf)
+                    buf.clear()
+                    break
+                if stx_idx > 0:
+                    self.skipped_bytes += stx_idx
+                    del buf[:stx_idx]
+                self._in_frame = True
+                self._scan_idx = 1
+            etx_idx = buf.find(ETX_CHAR, self._scan_idx)
+            stx_idx = buf.find(STX_CHAR, self._scan_idx, None if etx_idx == -1 else etx_idx)
+            if stx_idx != -1:
+                # Frame was interrupted, start again at the new STX character.
+                self.decode_errors += 1
+                del buf[:stx_idx]
+                self._scan_idx = 1
+                continue
+            if etx_idx == -1:
+                if self.max_frame_size is not None and len(buf) >= self.max_frame_size:
+                    self.decode_errors += 1
+                    buf.clear()
+                    self._in_frame = False
+                else:
+                    self._scan_idx = len(buf)
+                break
+            self._in_frame = False
+            if self.max_frame_size is not None and etx_idx + 1 > self.max_frame_size:
+                self.decode_errors += 1
+            else:
+                packet = self._unescape(buf, etx_idx)
+                if packet is None:
+                    self.decode_errors += 1
+                else:
+                    self.frames_decoded += 1
+                    packets.append(packet)
+            del buf[: etx_idx + 1]
+        return packets
+
+    def _unescape(self, buf: bytearray, etx_idx: int) -> Optional[bytes]:
+        dle_idx = buf.find(DLE_CHAR, 1, etx_idx)
+        if dle_idx == -1:
+            return bytes(buf[1:etx_idx])
+        packet = bytearray()
+        start_idx = 1
+        while dle_idx != -1:
+            packet.extend(buf[start_idx:dle_idx])
+            if dle_idx + 1 >= etx_idx:
+                return None
+            escaped = buf[dle_idx + 1]
+            if escaped == DLE_CHAR:
+                packet.append(DLE_CHAR)
+            elif escaped == ESCAPED_STX:
+                packet.append(STX_CHAR)
+            elif escaped == ESCAPED_ETX:
+                packet.append(ETX_CHAR)
+            elif self.escape_cr and escaped == ESCAPED_CR:
+                packet.append(CARRIAGE_RETURN)
+            else:
+                return None
+            start_idx = dle_idx + 2
+            dle_idx = buf.find(DLE_CHAR, start_idx, etx_idx)
+        packet.extend(buf[start_idx:etx_idx])
+        return bytes(packet)
@@ -0,0 +1,245 @@
+"""Link statistics for communication interfaces: packet and byte counters, decode errors,
+send latencies, reception queue depths and rolling throughput rates"""
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, List, Optional, Tuple
+
+from tmtccmd.com import ComInterface
+
+NUM_LATENCY_BUCKETS = 32
+DEFAULT_RATE_WINDOWS = (1.0, 10.0, 60.0)
+
+
+@dataclass
+class LinkRates:
+    """Average rates per second over a time window."""
+
+    window: float
+    packets_in: float = 0.0
+    bytes_in: float = 0.0
+    packets_out: float = 0.0
+    bytes_out: float = 0.0
+
+
+class LatencyHistogram:
+    """Latency histogram with logarithmic buckets. Bucket 0 counts latencies below one
+    microsecond, bucket n counts latencies from 2 ** (n - 1) up to 2 ** n microseconds. The last
+    bucket also counts all larger latencies.
+    """
+
+    def __init__(self):
+        self.buckets = [0] * NUM_LATENCY_BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record_ns(self, latency_ns: int):
+        idx = (latency_ns // 1000).bit_length()
+        if idx >= NUM_LATENCY_BUCKETS:
+            idx = NUM_LATENCY_BUCKETS - 1
+        self.buckets[idx] += 1
+        self.count += 1
+        self.total_ns += latency_ns
+        if latency_ns > self.max_ns:
+            self.max_ns = latency_ns
+
+    @property
+    def mean(self) -> float:
+        """Mean latency in seconds."""
+        if self.count == 0:
+            return 0.0
+        return self.total_ns / self.count / 1e9
+
+    @property
+    def max(self) -> float:
+        """Maximum latency in seconds."""
+        return self.max_ns / 1e9
+
+    def percentile(self, percentile: float) -> float:
+        """Upper bound of the bucket which contains the given percentile, in seconds.
+
+        :param percentile: Percentile between 0 and 100.
+        """
+        if self.count == 0:
+            return 0.0
+        threshold = self.count * percentile / 100.0
+        accumulated = 0
+        for idx, bucket in enumerate(self.buckets):
+            accumulated += bucket
+            if accumulated >= threshold:
+                return min(2**idx * 1e-6, self.max)
+        return self.max
+
+    def reset(self):
+        self.__init__()
+
+
+class LinkStatistics:
+    """Statistics of one communication link.
+
+    The counters are plain integers without any locks to keep the overhead on the hot path
+    small. The reception counters are only written by the reception path and the send counters
+    only by the send path, so no update is lost if both run in different threads. Readers in
+    other threads might see slightly outdated values.
+
+    The rolling rates are calculated from snapshots of the counters, which are taken at most
+    once per sample interval when packets are recorded or rates are requested. The rate for a
+    window is therefore averaged over at least the window length. :py:meth:`rates` works on a
+    copy of the snapshots, so it can be called while other threads record packets.
+    """
+
+    def __init__(self, sample_interval: float = 1.0, history: float = 60.0):
+        """
+        :param sample_interval: Minimum time between two counter snapshots in seconds.
+        :param history: Longest supported rate window in seconds.
+        """
+        self.sample_interval = sample_interval
+        self.history = history
+        self.__samples: Deque[Tuple[float, int, int, int, int]] = deque(
+            maxlen=int(history / sample_interval) + 2
+        )
+        self.__next_sample_time = 0.0
+        self.reset()
+
+    def reset(self):
+        self.packets_in = 0
+        self.bytes_in = 0
+        self.packets_out = 0
+        self.bytes_out = 0
+        self.decode_errors = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.send_latency = LatencyHistogram()
+        self.__samples.clear()
+        self.__next_sample_time = 0.0
+        self.sample()
+
+    def record_in(self, packets: int, num_bytes: int):
+        self.packets_in += packets
+        self.bytes_in += num_bytes
+        self.sample()
+
+    def record_out(self, packets: int, num_bytes: int):
+        self.packets_out += packets
+        self.bytes_out += num_bytes
+        self.sample()
+
+    def record_send_latency_ns(self, latency_ns: int):
+        self.send_latency.record_ns(latency_ns)
+
+    def record_decode_errors(self, errors: int = 1):
+        self.decode_errors += errors
+
+    def record_queue_depth(self, depth: int):
+        """Record the current depth of a reception queue, usually after a reception thread
+        stored new packets."""
+        self.queue_depth = depth
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+
+    def sample(self, now: Optional[float] = None):
+        """Take a snapshot of the counters if the sample interval has passed since the last
+        snapshot."""
+        if now is None:
+            now = time.monotonic()
+        if now < self.__next_sample_time:
+            return
+        self.__next_sample_time = now + self.sample_interval
+        self.__samples.append(
+            (now, self.packets_in, self.bytes_in, self.packets_out, self.bytes_out)
+        )
+
+    def rates(self, window: float = 1.0) -> LinkRates:
+        """Average rates over the last window seconds."""
+        now = time.monotonic()
+        self.sample(now)
+        reference = None
+        # Copy the snapshots first because the reception and send threads may append to the
+        # deque while iterating over it. Copying a deque is atomic with the GIL.
+        samples = tuple(self.__samples)
+        for sample in reversed(samples):
+            reference = sample
+            if sample[0] <= now - window:
+                break
+        rates = LinkRates(window=window)
+        if reference is None or now <= reference[0]:
+            return rates
+        duration = now - reference[0]
+        rates.packets_in = (self.packets_in - reference[1]) / duration
+        rates.bytes_in = (self.bytes_in - reference[2]) / duration
+        rates.packets_out = (self.packets_out - reference[3]) / duration
+        rates.bytes_out = (self.bytes_out - reference[4]) / duration
+        return rates
+
+    def rolling_rates(self, windows=DEFAULT_RATE_WINDOWS) -> List[LinkRates]:
+        return [self.rates(window) for window in windows]
+
+    def __str__(self) -> str:
+        rates = self.rates(1.0)
+        return (
+            f"in: {self.packets_in} packets, {self.bytes_in} bytes, "
+            f"{rates.packets_in:.1f} packets/s | out: {self.packets_out} packets, "
+            f"{self.bytes_out} bytes, {rates.packets_out:.1f} packets/s | "
+            f"decode errors: {self.decode_errors} | "
+            f"max queue depth: {self.max_queue_depth} | "
+            f"mean send latency: {self.send_latency.mean * 1e6:.1f} us"
+        )
+
+
+class LinkStatsComIF(ComInterface):
+    """Wrapper which collects :py:class:`LinkStatistics` for any communication interface. This
+    is useful for interfaces which do not provide built-in statistics with
+    :py:attr:`tmtccmd.com.ComInterface.link_stats`. Decode errors and queue depths are only
+    known to the wrapped interface and are not recorded by the wrapper.
+    """
+
+    def __init__(self, com_if: ComInterface, link_stats: Optional[LinkStatistics] = None):
+        self.com_if = com_if
+        if link_stats is None:
+            link_stats = LinkStatistics()
+        self.__link_stats = link_stats
+
+    @property
+    def id(self) -> str:
+        return self.com_if.id
+
+    @property
+    def link_stats(self) -> LinkStatistics:
+        return self.__link_stats
+
+    def initialize(self, args: Any = 0) -> Any:
+        return self.com_if.initialize(args)
+
+    def open(self, args: Any = 0):
+        self.com_if.open(args)
+
+    def is_open(self) -> bool:
+        return self.com_if.is_open()
+
+    def close(self, args: Any = 0):
+        self.com_if.close(args)
+
+    def send(self, data: bytes):
+        start = time.perf_counter_ns()
+        self.com_if.send(data)
+        self.__link_stats.record_send_latency_ns(time.perf_counter_ns() - start)
+        self.__link_stats.record_out(1, len(data))
+
+    def flush(self):
+        self.com_if.flush()
+
+    def fileno(self) -> int:
+        return self.com_if.fileno()
+
+    def receive(self, parameters: Any = 0) -> List[bytes]:
+        packet_list = self.com_if.receive(parameters)
+        if packet_list:
+            self.__link_stats.record_in(
+                len(packet_list), sum(len(packet) for packet in packet_list)
+            )
+        return packet_list
+
+    def data_available(self, timeout: float = 0, parameters: Any = 0) -> int:
+        return self.com_if.data_available(timeout, parameters)
@@ -0,0 +1,86 @@
+"""Notification of waiting threads and selectors about data received by reception threads"""
+
+import socket
+import threading
+from typing import Optional, Sized
+
+
+class ReceptionNotifier:
+    """Signals that a reception thread has stored new data in a reception queue.
+
+    Two ways to wait for new data are supported:
+
+    1. :py:meth:`wait_for_queue` blocks the calling thread using a :py:class:`threading.Condition`
+       and returns as soon as the queue is not empty anymore.
+    2. :py:meth:`fileno` returns a file descriptor which becomes readable on new data. It can be
+       registered in a :py:mod:`selectors` based event loop. The descriptor is level-triggered
+       until :py:meth:`clear` is called, which should be done before draining the queue.
+
+    The descriptor is one end of a socket pair, so it can be used with selectors on all
+    platforms, including Windows.
+    """
+
+    def __init__(self):
+        self.__cond = threading.Condition()
+        self.__signalled = False
+        self.__recv_sock: Optional[socket.socket] = None
+        self.__send_sock: Optional[socket.socket] = None
+
+    def __del__(self):
+        self.close()
+
+    def fileno(self) -> int:
+        """File descriptor which is readable if new data was received since the last
+        :py:meth:`clear` call."""
+        with self.__cond:
+            if self.__recv_sock is None:
+                self.__recv_sock, self.__send_sock = socket.socketpair()
+                self.__recv_sock.setblocking(False)
+                self.__send_sock.setblocking(False)
+                if self.__signalled:
+                    self.__send_sock.send(b"\x00")
+            return self.__recv_sock.fileno()
+
+    def notify(self):
+        """Called by the reception thread after new data was stored."""
+        with self.__cond:
+            self.__cond.notify_all()
+            if self.__signalled:
+                return
+            self.__signalled = True
+            if self.__send_sock is not None:
+                try:
+                    self.__send_sock.send(b"\x00")
+                except BlockingIOError:
+                    pass
+
+    def clear(self):
+        """Reset the readable state of the file descriptor."""
+        with self.__cond:
+            if not self.__signalled:
+                return
+            self.__signalled = False
+            if self.__recv_sock is not None:
+                try:
+                    self.__recv_sock.recv(4096)
+                except BlockingIOError:
+                    pass
+
+    def wait_for_queue(self, queue: Sized, timeout: float) -> int:
+        """Wait until the reception queue is not empty or the timeout in seconds expires.
+
+        :return: Number of elements in the queue.
+        """
+        if timeout > 0 and not queue:
+            with self.__cond:
+                self.__cond.wait_for(lambda: len(queue) > 0, timeout)
+        return len(queue)
+
+    def close(self):
+        """Close the file descriptor. A new one is created on the next :py:meth:`fileno` call."""
+        with self.__cond:
+            if self.__recv_sock is not None:
+                self.__recv_sock.close()
+                self.__send_sock.close()
+                self.__recv_sock = None
+                self.__send_sock = None
@@ -0,0 +1,133 @@
+"""Bounded reception queue for packets received by communication interface threads"""
+
+import enum
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional
+
+
+class OverflowPolicy(enum.Enum):
+    """Determines what happens if a packet is stored in a full :py:class:`BoundedPacketQueue`."""
+
+    #: Drop the oldest packets in the queue until the new packet fits.
+    DROP_OLDEST = 0
+    #: Drop the new packet.
+    DROP_NEWEST = 1
+    #: Reject the new packet without dropping it. The reception thread keeps the packet and
+    #: stops reading from its source until there is space again.
+    BLOCK = 2
+
+
+@dataclass
+class PacketQueueStatistics:
+    """Statistics of a :py:class:`BoundedPacketQueue`.
+
+    :var dropped_oldest: Number of packets dropped with the
+        :py:attr:`OverflowPolicy.DROP_OLDEST` policy.
+    :var dropped_newest: Number of packets dropped with the
+        :py:attr:`OverflowPolicy.DROP_NEWEST` policy, or because a packet is larger than the
+        byte bound of the queue.
+    :var blocked: Number of packets rejected with the :py:attr:`OverflowPolicy.BLOCK` policy.
+    :var high_water_packets: Maximum number of packets stored at the same time.
+    :var high_water_bytes: Maximum number of bytes stored at the same time.
+    """
+
+    dropped_oldest: int = 0
+    dropped_newest: int = 0
+    blocked: int = 0
+    high_water_packets: int = 0
+    high_water_bytes: int = 0
+
+    @property
+    def dropped(self) -> int:
+        return self.dropped_oldest + self.dropped_newest
+
+
+class BoundedPacketQueue:
+    """Thread-safe FIFO queue for complete packets which is bounded by the number of packets and
+    the number of stored bytes. Packets are always stored or dropped as a whole, so an overflow
+    never corrupts the framing of the following packets.
+    """
+
+    def __init__(
+        self,
+        max_packets: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+    ):
+        """
+        :param max_packets: Maximum number of stored packets. None means no bound.
+        :param max_bytes: Maximum number of stored bytes. None means no bound.
+        :param policy:
+        """
+        self.max_packets = max_packets
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.stats = PacketQueueStatistics()
+        self.__lock = threading.Lock()
+        self.__packets: Deque[bytes] = deque()
+        self.__num_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self.__packets)
+
+    @property
+    def num_bytes(self) -> int:
+        return self.__num_bytes
+
+    def put(self, packet: bytes) -> bool:
+        """Store a packet, applying the overflow policy if the queue is full.
+
+        :return: False if the packet was rejected with the :py:attr:`OverflowPolicy.BLOCK`
+            policy, True otherwise, even if a packet was dropped.
+        """
+        packet_len = len(packet)
+        with self.__lock:
+            if self.max_bytes is not None and packet_len > self.max_bytes:
+                # Can never be stored, blocking would stall the reception forever.
+                self.stats.dropped_newest += 1
+                return True
+            if self.__fits(packet_len):
+                self.__append(packet)
+                return True
+            if self.policy == OverflowPolicy.BLOCK:
+                self.stats.blocked += 1
+                return False
+            if self.policy == OverflowPolicy.DROP_NEWEST:
+                self.stats.dropped_newest += 1
+                return True
+            while not self.__fits(packet_len):
+                self.__num_bytes -= len(self.__packets.popleft())
+                self.stats.dropped_oldest += 1
+            self.__append(packet)
+            return True
+
+    def has_space(self, packet_len: int) -> bool:
+        with self.__lock:
+            return self.__fits(packet_len)
+
+    def pop_all(self) -> List[bytes]:
+        with self.__lock:
+            packet_list = list(self.__packets)
+            self.__packets.clear()
+            self.__num_bytes = 0
+        return packet_list
+
+    def clear(self):
+        self.pop_all()
+
+    def __fits(self, packet_len: int) -> bool:
+        if self.max_packets is not None and len(self.__packets) >= self.max_packets:
+            return False
+        if self.max_bytes is not None and self.__num_bytes + packet_len > self.max_bytes:
+            return False
+        return True
+
+    def __append(self, packet: bytes):
+        self.__packets.append(packet)
+        self.__num_bytes += len(packet)
+        if len(self.__packets) > self.stats.high_water_packets:
+            self.stats.high_water_packets = len(self.__packets)
+        if self.__num_bytes > self.stats.high_water_bytes:
+            self.stats.high_water_bytes = self.__num_bytes
@@ -31,9 +31,11 @@ from threading import Thread
 from typing import Optional
 
 from tmtccmd.com import ComInterface
+from tmtccmd.com.framing import DleStreamDecoder
+from tmtccmd.com.notifier import ReceptionNotifier
 from tmtccmd.tmtc import TelemetryListT
 from tmtccmd.com.serial_base import SerialCfg, SerialCommunicationType
-from dle_encoder import DleEncoder, STX_CHAR, ETX_CHAR, DleErrorCodes
+from dle_encoder import DleEncoder
 
 _LOGGER = logging.getLogger(__name__)
 SERIAL_FRAME_LENGTH = 256
@@ -76,9 +78,12 @@ class QEMUComIF(ComInterface):
         self.background_loop_thread: Optional[Thread] = None
         self.usart = None
         self.encoder = None
+        self.decoder = None
+        self.notifier = ReceptionNotifier()
         self.ser_com_type = ser_com_type
         if self.ser_com_type == SerialCommunicationType.DLE_ENCODING:
             self.encoder = DleEncoder()
+            self.decoder = DleStreamDecoder(max_frame_size=DLE_FRAME_LENGTH)
             self.reception_buffer = None
             # Set to default value.
             self.dle_queue_len = 10
@@ -95,6 +100,10 @@ class QEMUComIF(ComInterface):
     def id(self) -> str:
         return self.cfg.com_if_id
 
+    def fileno(self) -> int:
+        """File descriptor which becomes readable when new packets were received."""
+        return self.notifier.fileno()
+
     def set_fixed_frame_settings(self, serial_frame_size: int):
         self.serial_frame_size = serial_frame_size
 
@@ -159,13 +168,9 @@ class QEMUComIF(ComInterface):
         packet_list = []
 
         if self.ser_com_type == SerialCommunicationType.DLE_ENCODING:
+            self.notifier.clear()
             while self.reception_buffer:
-                data = self.reception_buffer.pop()
-                dle_retval, decoded_packet, _ = self.encoder.decode(data)
-                if dle_retval == DleErrorCodes.OK:
-                    packet_list.append(decoded_packet)
-                else:
-                    _LOGGER.warning("DLE decoder error!")
+                packet_list.append(self.reception_buffer.pop())
 
         else:
             _LOGGER.warning("This communication type was not implemented yet!")
@@ -194,19 +199,9 @@ class QEMUComIF(ComInterface):
         return 0
 
     def data_available_dle(self, timeout: float = 0) -> int:
-        elapsed_time = 0
-        start_time = time.time()
-        sleep_time = timeout / 3.0
-        if timeout > 0:
-            while elapsed_time < timeout:
-                if self.reception_buffer:
-                    return len(self.reception_buffer)
-                time.sleep(sleep_time)
-                elapsed_time = time.time() - start_time
+        if self.reception_buffer is None:
             return 0
-        if self.reception_buffer:
-            return len(self.reception_buffer)
-        return 0
+        return self.notifier.wait_for_queue(self.reception_buffer, timeout)
 
     async def start_dle_polling(self):
         asyncio.create_task(self.poll_dle_packets())
@@ -215,30 +210,22 @@ class QEMUComIF(ComInterface):
         assert self.usart is not None
         assert self.reception_buffer is not None
         while True:
-            rcvd = await self.usart.read_async(1, timeout=None)
-
-            data = bytearray()
-            data.append(rcvd[0])
-
-            if data[0] == STX_CHAR:
-                data.extend(
-                    await self.usart.read_until_async(
-                        bytes([ETX_CHAR]), DLE_FRAME_LENGTH, self.cfg.serial_timeout
-                    )
-                )
-
-                # check for success
-                if data[-1] == ETX_CHAR:
-                    self.reception_buffer.appendleft(data)
-                    continue
-
-            else:  # not a start byte: flush input buffer
-                data.extend(self.usart.read(self.usart.get_data_in_waiting()))
-
-            # handle erroneous data
-            print(data)
-            # It is assumed that all packets are DLE encoded, so throw it away for now.
-            _LOGGER.info("Non DLE-Encoded data with length " + str(len(data) + 1) + " found..")
+            # Wait for at least one byte, then decode everything received up to now.
+            data = await self.usart.read_async(1, timeout=None)
+            data += self.usart.read_available()
+            decode_errors = self.decoder.decode_errors
+            skipped_bytes = self.decoder.skipped_bytes
+            packets = self.decoder.decode(data)
+            for packet in packets:
+                self.reception_buffer.appendleft(packet)
+            if packets:
+                self.notifier.notify()
+            if self.decoder.decode_errors != decode_errors:
+                _LOGGER.warning("DLE decoder error!")
+            if self.decoder.skipped_bytes != skipped_bytes:
+                # It is assumed that all packets are DLE encoded, so throw it away for now.
+                skipped_len = self.decoder.skipped_bytes - skipped_bytes
+                _LOGGER.info(f"Non DLE-Encoded data with length {skipped_len} found..")
 
 
 class QmpException(Exception):
@@ -563,6 +550,13 @@ class Usart:
             data, self.datab = self.datab[:n], self.datab[n:]
             return data
 
+    def read_available(self) -> bytes:
+        """Return all data which was received from the USART without waiting"""
+        while not self.dataq.empty():
+            self.datab += self.dataq.get_nowait().data
+        data, self.datab = self.datab, bytes()
+        return data
+
     def new_data_available(self) -> bool:
         return not self.dataq.empty()
 
@@ -0,0 +1,400 @@
+"""Recording of the traffic of communication interfaces and replay of recorded traffic.
+
+The recording file is a compact binary file which starts with a header, followed by the packet
+records and an index for fast seeking. All fields are big endian.
+
+- Header: 4 bytes magic ``TMRC``, 1 byte version, 3 reserved bytes.
+- Record: 8 bytes time offset in nanoseconds since the start of the recording, 1 byte
+  :py:class:`RecordDirection`, 4 bytes packet length, followed by the packet.
+- Index: Entries of 8 bytes time offset and 8 bytes file offset of the first record at or after
+  that time offset.
+- Footer: 8 bytes file offset of the index, 4 bytes number of index entries, 4 bytes magic
+  ``TMRI``.
+
+The index and the footer are written when the recording is closed. The index of files without
+a footer, for example because the recording process was killed, is rebuilt on opening.
+"""
+
+import bisect
+import enum
+import logging
+import struct
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, List, Optional, Tuple, Union
+
+from tmtccmd.com import ComInterface
+
+_LOGGER = logging.getLogger(__name__)
+
+FILE_MAGIC = b"TMRC"
+INDEX_MAGIC = b"TMRI"
+FILE_VERSION = 1
+DEFAULT_INDEX_INTERVAL = timedelta(seconds=1)
+DEFAULT_MAX_PACKETS_PER_RECEIVE = 1024
+
+_HEADER = struct.Struct("!4sB3x")
+_RECORD_HEADER = struct.Struct("!QBI")
+_INDEX_ENTRY = struct.Struct("!QQ")
+_FOOTER = struct.Struct("!QI4s")
+
+
+class RecordDirection(enum.IntEnum):
+    #: Packet received by the communication interface, usually TM
+    RECEIVED = 0
+    #: Packet sent by the communication interface, usually TC
+    SENT = 1
+
+
+@dataclass
+class PacketRecord:
+    time_offset_ns: int
+    direction: RecordDirection
+    data: bytes
+
+    @property
+    def time_offset(self) -> timedelta:
+        return timedelta(microseconds=self.time_offset_ns / 1000)
+
+
+class PacketRecorder:
+    """Writes packets with monotonic timestamps to a recording file."""
+
+    def __init__(self, path: Union[str, Path], index_interval: timedelta = DEFAULT_INDEX_INTERVAL):
+        """
+        :param path: Path of the recording file. An existing file is overwritten.
+        :param index_interval: Time between two index entries.
+        """
+        self.path = Path(path)
+        self.index_interval_ns = int(index_interval.total_seconds() * 1e9)
+        self.packets_recorded = 0
+        self.__file: Optional[BinaryIO] = None
+        self.__start_ns = 0
+        self.__next_index_ns = 0
+        self.__index: List[Tuple[int, int]] = []
+
+    def open(self):
+        self.__file = open(self.path, "wb")
+        self.__file.write(_HEADER.pack(FILE_MAGIC, FILE_VERSION))
+        self.__start_ns = time.monotonic_ns()
+        self.__next_index_ns = 0
+        self.__index = []
+
+    def is_open(self) -> bool:
+        return self.__file is not None
+
+    def record(self, direction: RecordDirection, data: bytes):
+        if self.__file is None:
+            return
+        time_offset_ns = time.monotonic_ns() - self.__start_ns
+        if time_offset_ns >= self.__next_index_ns:
+            self.__index.append((time_offset_ns, self.__file.tell()))
+            self.__next_index_ns = time_offset_ns + self.index_interval_ns
+        self.__file.write(_RECORD_HEADER.pack(time_offset_ns, direction, len(data)))
+        self.__file.write(data)
+        self.packets_recorded += 1
+
+    def close(self):
+        """Write the index and close the recording file."""
+        if self.__file is None:
+            return
+        index_offset = self.__file.tell()
+        for entry in self.__index:
+            self.__file.write(_INDEX_ENTRY.pack(*entry))
+        self.__file.write(_FOOTER.pack(index_offset, len(self.__index), INDEX_MAGIC))
+        self.__file.close()
+        self.__file = None
+
+
+class RecordingReader:
+    """Reads the records of a recording file written by a :py:class:`PacketRecorder`."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.__file: Optional[BinaryIO] = None
+        self.__records_end = 0
+        self.__index: List[Tuple[int, int]] = []
+        # Time offsets of the index entries, which are sorted, for bisection.
+        self.__index_times: List[int] = []
+
+    def open(self):
+        self.__file = open(self.path, "rb")
+        header = self.__file.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError(f"{self.path} is not a valid recording file")
+        magic, version = _HEADER.unpack(header)
+        if magic != FILE_MAGIC or version != FILE_VERSION:
+            raise ValueError(f"{self.path} is not a valid recording file")
+        if not self.__read_index():
+            _LOGGER.info(f"Recording {self.path} has no index, rebuilding it")
+            self.__rebuild_index()
+        self.__index_times = [entry_time_ns for entry_time_ns, _ in self.__index]
+        self.__file.seek(_HEADER.size)
+
+    def close(self):
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def duration(self) -> timedelta:
+        """Approximate duration of the recording, which is the time offset of the last index
+        entry."""
+        if not self.__index:
+            return timedelta()
+        return timedelta(microseconds=self.__index[-1][0] / 1000)
+
+    def seek(self, time_offset: timedelta):
+        """Move to the first record at or after the given time offset."""
+        time_offset_ns = int(time_offset.total_seconds() * 1e9)
+        # Last index entry at or before the time offset.
+        entry_idx = bisect.bisect_right(self.__index_times, time_offset_ns) - 1
+        if entry_idx >= 0:
+            self.__file.seek(self.__index[entry_idx][1])
+        else:
+            self.__file.seek(_HEADER.size)
+        # Skip the records inside the index interval which are before the time offset.
+        while True:
+            record_offset = self.__file.tell()
+            record = self.read_record()
+            if record is None or record.time_offset_ns >= time_offset_ns:
+                self.__file.seek(record_offset)
+                return
+
+    def read_record(self) -> Optional[PacketRecord]:
+        """Read the next record.
+
+        :return: None if all records were read.
+        """
+        if self.__file.tell() >= self.__records_end:
+            return None
+        header = self.__file.read(_RECORD_HEADER.size)
+        if len(header) < _RECORD_HEADER.size:
+            return None
+        time_offset_ns, direction, packet_len = _RECORD_HEADER.unpack(header)
+        data = self.__file.read(packet_len)
+        if len(data) < packet_len:
+            return None
+        return PacketRecord(time_offset_ns, RecordDirection(direction), data)
+
+    def records(self) -> Iterator[PacketRecord]:
+        while True:
+            record = self.read_record()
+            if record is None:
+                return
+            yield record
+
+    def __read_index(self) -> bool:
+        file_len = self.__file.seek(0, 2)
+        if file_len < _HEADER.size + _FOOTER.size:
+            return False
+        self.__file.seek(file_len - _FOOTER.size)
+        index_offset, num_entries, magic = _FOOTER.unpack(self.__file.read(_FOOTER.size))
+        if magic != INDEX_MAGIC:
+            return False
+        self.__file.seek(index_offset)
+        index_data = self.__file.read(num_entries * _INDEX_ENTRY.size)
+        self.__index = list(_INDEX_ENTRY.iter_unpack(index_data))
+        self.__records_end = index_offset
+        return True
+
+    def __rebuild_index(self):
+        self.__records_end = self.__file.seek(0, 2)
+        self.__file.seek(_HEADER.size)
+        self.__index = []
+        next_index_ns = 0
+        while True:
+            record_offset = self.__file.tell()
+            header = self.__file.read(_RECORD_HEADER.size)
+            if len(header) < _RECORD_HEADER.size:
+                break
+            time_offset_ns, _, packet_len = _RECORD_HEADER.unpack(header)
+            if record_offset + _RECORD_HEADER.size + packet_len > self.__records_end:
+                break
+            if time_offset_ns >= next_index_ns:
+                self.__index.append((time_offset_ns, record_offset))
+                next_index_ns = time_offset_ns + int(DEFAULT_INDEX_INTERVAL.total_seconds() * 1e9)
+            self.__file.seek(packet_len, 1)
+        # Truncated records at the end of the file are ignored.
+        self.__records_end = self.__file.tell()
+
+
+class RecordingComIF(ComInterface):
+    """Wraps a communication interface and records all received and sent packets to a file
+    while the interface is open. All other calls are forwarded to the wrapped interface."""
+
+    def __init__(
+        self,
+        com_if: ComInterface,
+        path: Union[str, Path],
+        index_interval: timedelta = DEFAULT_INDEX_INTERVAL,
+    ):
+        self.com_if = com_if
+        self.recorder = PacketRecorder(path, index_interval)
+
+    @property
+    def id(self) -> str:
+        return self.com_if.id
+
+    @property
+    def link_stats(self):
+        return self.com_if.link_stats
+
+    def initialize(self, args: Any = 0) -> Any:
+        return self.com_if.initialize(args)
+
+    def open(self, args: Any = 0):
+        self.com_if.open(args)
+        self.recorder.open()
+
+    def is_open(self) -> bool:
+        return self.com_if.is_open()
+
+    def close(self, args: Any = 0):
+        self.com_if.close(args)
+        self.recorder.close()
+
+    def send(self, data: bytes):
+        self.recorder.record(RecordDirection.SENT, data)
+        self.com_if.send(data)
+
+    def receive(self, parameters: Any = 0) -> List[bytes]:
+        packet_list = self.com_if.receive(parameters)
+        for packet in packet_list:
+            self.recorder.record(RecordDirection.RECEIVED, packet)
+        return packet_list
+
+    def data_available(self, timeout: float = 0, parameters: Any = 0) -> int:
+        return self.com_if.data_available(timeout, parameters)
+
+    def flush(self):
+        self.com_if.flush()
+
+    def fileno(self) -> int:
+        return self.com_if.fileno()
+
+
+class ReplayComIF(ComInterface):
+    """Communication interface which replays the received packets of a recording file, for
+    example to profile the TM handling with real traffic.
+
+    The packets are returned by :py:meth:`receive` once their time offset was reached, scaled
+    by the replay speed. Sent packets are discarded and only counted.
+    """
+
+    def __init__(
+        self,
+        com_if_id: str,
+        path: Union[str, Path],
+        speed: Optional[float] = 1.0,
+        start_offset: timedelta = timedelta(),
+        max_packets_per_receive: int = DEFAULT_MAX_PACKETS_PER_RECEIVE,
+    ):
+        """
+        :param com_if_id:
+        :param path: Path of the recording file.
+        :param speed: Replay speed. For example, 2.0 replays twice as fast as the packets were
+            recorded. None replays as fast as possible.
+        :param start_offset: Time offset inside the recording where the replay starts.
+        :param max_packets_per_receive: Maximum number of packets returned by one
+            :py:meth:`receive` call.
+        """
+        self.com_if_id = com_if_id
+        self.speed = speed
+        self.start_offset = start_offset
+        self.max_packets_per_receive = max_packets_per_receive
+        self.packets_sent = 0
+        self.__reader = RecordingReader(path)
+        self.__open = False
+        self.__finished = False
+        self.__next_record: Optional[PacketRecord] = None
+        self.__replay_start_ns = 0
+        self.__start_offset_ns = 0
+
+    @property
+    def id(self) -> str:
+        return self.com_if_id
+
+    @property
+    def finished(self) -> bool:
+        """All packets of the recording were replayed."""
+        return self.__finished
+
+    def initialize(self, args: Any = 0) -> Any:
+        pass
+
+    def open(self, args: Any = 0):
+        self.__reader.open()
+        self.__open = True
+        self.seek(self.start_offset)
+
+    def is_open(self) -> bool:
+        return self.__open
+
+    def close(self, args: Any = 0):
+        self.__reader.close()
+        self.__open = False
+
+    def seek(self, time_offset: timedelta):
+        """Continue the replay at the given time offset of the recording."""
+        self.__reader.seek(time_offset)
+        self.__start_offset_ns = int(time_offset.total_seconds() * 1e9)
+        self.__replay_start_ns = time.monotonic_ns()
+        self.__finished = False
+        self.__next_record = None
+        self.__read_next_received()
+
+    def send(self, data: bytes):
+        self.packets_sent += 1
+
+    def receive(self, parameters: Any = 0) -> List[bytes]:
+        packet_list = []
+        if not self.__open:
+            return packet_list
+        max_time_offset_ns = self.__replay_time_offset_ns()
+        while (
+            self.__next_record is not None
+            and self.__next_record.time_offset_ns <= max_time_offset_ns
+            and len(packet_list) < self.max_packets_per_receive
+        ):
+            packet_list.append(self.__next_record.data)
+            self.__read_next_received()
+        return packet_list
+
+    def data_available(self, timeout: float = 0, parameters: Any = 0) -> int:
+        if not self.__open or self.__next_record is None:
+            return 0
+        if self.speed is not None:
+            wait_time_ns = self.__next_record.time_offset_ns - self.__replay_time_offset_ns()
+            if wait_time_ns > 0:
+                if wait_time_ns / self.speed > timeout * 1e9:
+                    time.sleep(timeout)
+                    return 0
+                time.sleep(wait_time_ns / self.speed / 1e9)
+        return 1
+
+    def __replay_time_offset_ns(self) -> Union[int, float]:
+        if self.speed is None:
+            return float("inf")
+        elapsed_ns = time.monotonic_ns() - self.__replay_start_ns
+        return self.__start_offset_ns + elapsed_ns * self.speed
+
+    def __read_next_received(self):
+        while True:
+            record = self.__reader.read_record()
+            if record is None:
+                self.__next_record = None
+                self.__finished = True
+                return
+            if record.direction == RecordDirection.RECEIVED:
+                self.__next_record = record
+                return
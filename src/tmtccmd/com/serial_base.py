@@ -8,6 +8,9 @@ from typing import Optional
 
 import serial
 
+from tmtccmd.com.link_stats import LinkStatistics
+from tmtccmd.com.notifier import ReceptionNotifier
+
 
 class SerialConfigIds(enum.Enum):
     SERIAL_PORT = auto()
@@ -50,6 +53,20 @@ class SerialComBase:
         self.ser_cfg = ser_cfg
         self.ser_com_type = ser_com_type
         self.serial: Optional[serial.Serial] = None
+        # Signalled by the reception threads of the concrete implementations
+        self.notifier = ReceptionNotifier()
+        # Updated by the reception threads and send methods of the concrete implementations.
+        # The byte counters count the encoded bytes on the serial line.
+        self._link_stats = LinkStatistics()
+
+    @property
+    def link_stats(self) -> LinkStatistics:
+        return self._link_stats
+
+    def fileno(self) -> int:
+        """File descriptor which becomes readable when new packets were received. This allows
+        using the interface in a :py:mod:`selectors` based event loop."""
+        return self.notifier.fileno()
 
     def open_port(self):
         try:
@@ -72,6 +89,14 @@ class SerialComBase:
     def is_port_open(self) -> bool:
         return self.serial is not None
 
+    def wait_for_queue(self, timeout: float, reception_buffer: collections.deque) -> int:
+        """Wait until the reception thread stored packets in the reception buffer or the timeout
+        expires. Returns as soon as a packet was stored.
+
+        :return: Number of packets in the reception buffer.
+        """
+        return self.notifier.wait_for_queue(reception_buffer, timeout)
+
     @staticmethod
     def data_available_from_queue(timeout: float, reception_buffer: collections.deque):
         elapsed_time = 0
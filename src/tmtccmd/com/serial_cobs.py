@@ -1,12 +1,15 @@
 import collections
 import logging
 import threading
+import time
 from typing import List, Optional
 
 from tmtccmd.com import ComInterface, ReceptionDecodeError
 from tmtccmd.com.serial_base import SerialComBase, SerialCfg, SerialCommunicationType
 from cobs import cobs
 
+DEFAULT_MAX_FRAME_LEN = 4096
+
 
 class SerialCobsComIF(SerialComBase, ComInterface):
     """Serial communication interface which uses the
@@ -15,9 +18,19 @@ class SerialCobsComIF(SerialComBase, ComInterface):
     This class will spin up a receiver thread on the :meth:`open` call to poll
     for COBS encoded packets.
     This means that the :meth:`close` call might block until the receiver thread has shut down.
+
+    The receiver thread reads all bytes waiting in the serial input buffer at once and splits
+    the frames on the zero delimiter bytes. The number of received frames and of discarded
+    broken frames are counted in :py:attr:`frames_received` and :py:attr:`broken_frames`.
     """
 
-    def __init__(self, ser_cfg: SerialCfg):
+    def __init__(self, ser_cfg: SerialCfg, max_frame_len: int = DEFAULT_MAX_FRAME_LEN):
+        """
+        :param ser_cfg: Serial configuration.
+        :param max_frame_len: Maximum length of an encoded frame without the delimiters. A frame
+            which exceeds this length is discarded up to the next zero delimiter and counted as
+            a broken frame.
+        """
         super().__init__(
             logging.getLogger(__name__),
             ser_cfg=ser_cfg,
@@ -26,6 +39,9 @@ class SerialCobsComIF(SerialComBase, ComInterface):
         self.__polling_shutdown = threading.Event()
         self.__reception_thread: Optional[threading.Thread] = None
         self.__reception_buffer = collections.deque()
+        self.frames_received = 0
+        self.broken_frames = 0
+        self.max_frame_len = max_frame_len
 
     @property
     def id(self) -> str:
@@ -53,44 +69,66 @@ class SerialCobsComIF(SerialComBase, ComInterface):
         encoded = bytearray([0])
         encoded.extend(cobs.encode(data))
         encoded.append(0)
+        start = time.perf_counter_ns()
         self.serial.write(encoded)
+        self._link_stats.record_send_latency_ns(time.perf_counter_ns() - start)
+        self._link_stats.record_out(1, len(encoded))
 
     def receive(self, parameters: any = 0) -> List[bytes]:
         packet_list = []
+        self.notifier.clear()
         while self.__reception_buffer:
             data = self.__reception_buffer.pop()
             try:
                 packet_list.append(cobs.decode(data))
             except cobs.DecodeError as e:
+                self._link_stats.record_decode_errors()
                 raise ReceptionDecodeError(f"COBS decoding error: {e}", e)
         return packet_list
 
     def data_available(self, timeout: float, parameters: any = 0) -> int:
-        return SerialComBase.data_available_from_queue(timeout, self.__reception_buffer)
+        return self.wait_for_queue(timeout, self.__reception_buffer)
 
     def __poll_cobs_packets(self):
-        last_byte_was_zero = False
         # Poll permanently, but it is possible to join this thread every 200 ms
         self.serial.timeout = 0.2
-        while True:
-            byte = self.serial.read()
-            if len(byte) == 1:
-                if byte[0] == 0:
-                    last_byte_was_zero = True
-                else:
-                    if last_byte_was_zero:
-                        self.serial.timeout = 0.1
-                        possible_cobs_frame = bytearray(byte)
-                        possible_cobs_frame.extend(self.serial.read_until(bytes([0])))
-                        self.__reception_buffer.appendleft(possible_cobs_frame[:-1])
-                        self.serial.timeout = 0.2
-                        last_byte_was_zero = True
+        frame_buf = bytearray()
+        # Data received before the first zero byte might be the remainder of a frame which was
+        # sent before the port was opened.
+        synced = False
+        # Set while the remainder of an oversized frame is skipped.
+        discarding = False
+        while not self.__polling_shutdown.is_set():
+            data = self.serial.read(max(1, self.serial.in_waiting))
+            if not data:
+                continue
+            frame_buf.extend(data)
+            frames_received = self.frames_received
+            broken_frames = self.broken_frames
+            start_idx = 0
+            while True:
+                delimiter_idx = frame_buf.find(0, start_idx)
+                if delimiter_idx == -1:
+                    break
+                if delimiter_idx > start_idx and not discarding:
+                    if synced and delimiter_idx - start_idx <= self.max_frame_len:
+                        self.__reception_buffer.appendleft(frame_buf[start_idx:delimiter_idx])
+                        self.frames_received += 1
                     else:
-                        broken_cobs_frame = self.serial.read_until(bytes([0]))
-                        self.logger.warning(
-                            "Discarding possibly broken COBS frame: "
-                            f"{broken_cobs_frame.hex(sep=',')}"
-                        )
-                        last_byte_was_zero = True
-            elif self.__polling_shutdown.is_set():
-                break
+                        self.broken_frames += 1
+                synced = True
+                discarding = False
+                start_idx = delimiter_idx + 1
+            # Keep the partial trailing frame for the next read.
+            del frame_buf[:start_idx]
+            if len(frame_buf) > self.max_frame_len or (discarding and frame_buf):
+                if not discarding:
+                    self.broken_frames += 1
+                    discarding = True
+                frame_buf.clear()
+            if self.broken_frames != broken_frames:
+                self._link_stats.record_decode_errors(self.broken_frames - broken_frames)
+            self._link_stats.record_in(self.frames_received - frames_received, len(data))
+            if self.frames_received != frames_received:
+                self._link_stats.record_queue_depth(len(self.__reception_buffer))
+                self.notifier.notify()
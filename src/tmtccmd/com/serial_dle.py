@@ -1,13 +1,14 @@
 import dataclasses
 import logging
 import threading
+import time
 from collections import deque
 from typing import List, Optional
 
-import serial
-from dle_encoder import DleEncoder, STX_CHAR, ETX_CHAR, DleErrorCodes
+from dle_encoder import DleEncoder
 
 from tmtccmd.com import ComInterface
+from tmtccmd.com.framing import DleStreamDecoder
 from tmtccmd.com.serial_base import SerialComBase, SerialCfg, SerialCommunicationType
 
 
@@ -24,7 +25,9 @@ class SerialDleComIF(SerialComBase, ComInterface):
 
     This class will spin up a receiver thread on the :meth:`open` call to poll for DLE encoded
     packets. This means that the :meth:`close` call might block until the receiver thread has shut
-    down.
+    down. The thread reads all available bytes in bulk and decodes them incrementally with a
+    :py:class:`tmtccmd.com.framing.DleStreamDecoder`, so only decoded packets are stored in the
+    reception queue.
     """
 
     def __init__(self, ser_cfg: SerialCfg, dle_cfg: Optional[DleCfg]):
@@ -35,6 +38,7 @@ class SerialDleComIF(SerialComBase, ComInterface):
         )
         self.dle_cfg = dle_cfg
         self.__encoder = DleEncoder()
+        self.__decoder = DleStreamDecoder()
         self.__reception_thread = None
         self.__reception_buffer = deque()
         self.__polling_shutdown: Optional[threading.Event] = threading.Event()
@@ -43,9 +47,16 @@ class SerialDleComIF(SerialComBase, ComInterface):
     def id(self) -> str:
         return self.ser_cfg.com_if_id
 
+    @property
+    def decoder(self) -> DleStreamDecoder:
+        """Stream decoder used by the receiver thread. It also holds the decoder statistics."""
+        return self.__decoder
+
     def initialize(self, args: any = None) -> any:
         if self.dle_cfg and self.dle_cfg.dle_queue_len:
             self.__reception_buffer = deque(maxlen=self.dle_cfg.dle_queue_len)
+        if self.dle_cfg and self.dle_cfg.dle_max_frame:
+            self.__decoder.max_frame_size = self.dle_cfg.dle_max_frame
 
     def open(self, args: any = None) -> None:
         """Spins up a receiver thread to permanently check for new DLE encoded packets."""
@@ -57,25 +68,24 @@ class SerialDleComIF(SerialComBase, ComInterface):
     def __poll_dle_packets(self):
         # Poll permanently, but it is possible to join this thread every 200 ms
         self.serial.timeout = 0.2
-        data = bytearray()
         while True:
-            byte = self.serial.read()
-            if len(byte) == 1:
-                if byte[0] == STX_CHAR:
-                    data.append(byte[0])
-                    self.serial.timeout = 0.1
-                    if self.dle_cfg and self.dle_cfg.dle_max_frame:
-                        bytes_rcvd = self.serial.read_until(
-                            serial.to_bytes([ETX_CHAR]), self.dle_cfg.dle_max_frame
-                        )
-                    else:
-                        bytes_rcvd = self.serial.read_until(serial.to_bytes([ETX_CHAR]))
-                    self.serial.timeout = 0.2
-                    if bytes_rcvd[len(bytes_rcvd) - 1] == ETX_CHAR:
-                        data.extend(bytes_rcvd)
-                        # deque is thread-safe for appends and pops from and to the opposite side
-                        self.__reception_buffer.appendleft(data)
-                data = bytearray()
+            # Blocks for one byte at most until the timeout, then reads everything available
+            data = self.serial.read(max(1, self.serial.in_waiting))
+            if data:
+                decode_errors = self.__decoder.decode_errors
+                packets = self.__decoder.decode(data)
+                for packet in packets:
+                    # deque is thread-safe for appends and pops from and to the opposite side
+                    self.__reception_buffer.appendleft(packet)
+                self._link_stats.record_in(len(packets), len(data))
+                if packets:
+                    self._link_stats.record_queue_depth(len(self.__reception_buffer))
+                    self.notifier.notify()
+                if self.__decoder.decode_errors != decode_errors:
+                    self._link_stats.record_decode_errors(
+                        self.__decoder.decode_errors - decode_errors
+                    )
+                    self.logger.warning("DLE decoder error!")
             elif self.__polling_shutdown.is_set():
                 break
 
@@ -89,18 +99,17 @@ class SerialDleComIF(SerialComBase, ComInterface):
 
     def send(self, data: bytes):
         encoded_data = self.__encoder.encode(source_packet=data, add_stx_etx=True)
+        start = time.perf_counter_ns()
         self.serial.write(encoded_data)
+        self._link_stats.record_send_latency_ns(time.perf_counter_ns() - start)
+        self._link_stats.record_out(1, len(encoded_data))
 
     def receive(self, parameters: any = 0) -> List[bytes]:
         packet_list = []
+        self.notifier.clear()
         while self.__reception_buffer:
-            data = self.__reception_buffer.pop()
-            dle_retval, decoded_packet, read_len = self.__encoder.decode(source_packet=data)
-            if dle_retval == DleErrorCodes.OK:
-                packet_list.append(decoded_packet)
-            else:
-                self.logger.warning("DLE decoder error!")
+            packet_list.append(self.__reception_buffer.pop())
         return packet_list
 
     def data_available(self, timeout: float, parameters: any = 0) -> int:
-        return SerialComBase.data_available_from_queue(timeout, self.__reception_buffer)
+        return self.wait_for_queue(timeout, self.__reception_buffer)
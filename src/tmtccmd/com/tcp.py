@@ -5,20 +5,30 @@ import queue
 import socket
 import time
 import enum
+import itertools
+import random
 import threading
 import select
 from collections import deque
-from typing import Any, List, Optional, Sequence
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, List, Optional, Sequence
 
-from spacepackets.ccsds.spacepacket import parse_space_packets, PacketId
+from spacepackets.ccsds.spacepacket import PacketId
 
 from tmtccmd.com import ComInterface, SendError
+from tmtccmd.com.framing import SpacePacketFramer
+from tmtccmd.com.link_stats import LinkStatistics
+from tmtccmd.com.notifier import ReceptionNotifier
+from tmtccmd.com.packet_queue import BoundedPacketQueue, OverflowPolicy, PacketQueueStatistics
 from tmtccmd.com.tcpip_utils import EthAddr
 
 _LOGGER = logging.getLogger(__name__)
 
 TCP_RECV_WIRETAPPING_ENABLED = False
 TCP_SEND_WIRETAPPING_ENABLED = False
+# Upper bound for the number of buffers passed to one vectorised send call. POSIX only
+# guarantees an IOV_MAX of 16, Linux uses 1024.
+MAX_BUFFERS_PER_SEND = 1024
 
 
 class TcpCommunicationType(enum.Enum):
@@ -27,9 +37,89 @@ class TcpCommunicationType(enum.Enum):
     SPACE_PACKETS = 0
 
 
+class ConnectionState(enum.Enum):
+    DISCONNECTED = 0
+    CONNECTED = 1
+
+
+class UnsentTcPolicy(enum.Enum):
+    """Determines what happens to TCs which were not sent yet when the connection is lost.
+    A TC which was only sent partially is always dropped, because the server can not
+    re-assemble it with the remainder sent over a new connection."""
+
+    #: Keep the TCs and send them after the connection was re-established.
+    KEEP = 0
+    #: Drop all TCs which were not sent yet and all TCs sent while the connection is down.
+    DROP = 1
+
+
+@dataclass
+class ReconnectCfg:
+    """Configuration for the automatic reconnection of the TCP client.
+
+    The delay before reconnection attempt n (starting at 0) is
+    ``min(max_backoff, initial_backoff * backoff_factor ** n)``, randomized by the
+    relative ``jitter`` to avoid many clients reconnecting at the same time.
+    """
+
+    initial_backoff: float = 0.5
+    max_backoff: float = 30.0
+    backoff_factor: float = 2.0
+    jitter: float = 0.1
+    connect_timeout: float = 2.0
+    unsent_tc_policy: UnsentTcPolicy = UnsentTcPolicy.KEEP
+
+    def backoff_delay(self, attempt: int) -> float:
+        delay = min(self.max_backoff, self.initial_backoff * self.backoff_factor**attempt)
+        return max(0.0, delay * (1.0 + random.uniform(-self.jitter, self.jitter)))
+
+
+@dataclass
+class SendStatistics:
+    """Statistics for the TC send path of the TCP client.
+
+    :var send_calls: Number of send system calls.
+    :var bytes_sent: Total number of bytes sent.
+    :var packets_sent: Number of packets which were sent completely.
+    :var partial_writes: Number of send calls which did not send all passed buffers completely.
+    :var packets_dropped: Number of packets dropped because the connection was lost.
+    """
+
+    send_calls: int = 0
+    bytes_sent: int = 0
+    packets_sent: int = 0
+    partial_writes: int = 0
+    packets_dropped: int = 0
+
+    @property
+    def bytes_per_send_call(self) -> float:
+        if self.send_calls == 0:
+            return 0.0
+        return self.bytes_sent / self.send_calls
+
+
 class TcpSpacepacketsClient(ComInterface):
     """Communication interface for TCP communication. This particular interface expects
     raw space packets to be sent via TCP and uses a list of passed packet IDs to parse for them.
+
+    The TCP thread receives the stream directly into the buffer of a
+    :py:class:`tmtccmd.com.framing.SpacePacketFramer` and only stores complete space packets
+    inside the TM queue. The TM queue is bounded by the number of packets and bytes, and the
+    :py:class:`tmtccmd.com.packet_queue.OverflowPolicy` determines what happens if it is full.
+    With the :py:attr:`tmtccmd.com.packet_queue.OverflowPolicy.BLOCK` policy, the TCP thread
+    stops reading from the socket until the TM was retrieved, so the TCP flow control throttles
+    the server.
+
+    All TCs queued with :py:meth:`send` are sent with one vectorised send call (``sendmsg``)
+    when the socket becomes writable. Data which could not be sent is kept in a send backlog and
+    sent first on the next write opportunity. The :py:attr:`send_stats` can be used to monitor
+    the send path.
+
+    If a :py:class:`ReconnectCfg` is passed, the TCP thread re-establishes lost connections with
+    an exponential backoff. The optional state callback is called from the TCP thread on every
+    connection state change. It can be used to pause the TC sending of the backend while the
+    link is down, for example by calling
+    :py:meth:`tmtccmd.core.ccsds_backend.CcsdsTmtcBackend.pause_tc_sending`.
     """
 
     def __init__(
@@ -39,6 +129,10 @@ class TcpSpacepacketsClient(ComInterface):
         inner_thread_delay: float,
         target_address: EthAddr,
         max_packets_stored: Optional[int] = None,
+        max_bytes_stored: Optional[int] = None,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        reconnect_cfg: Optional[ReconnectCfg] = None,
+        state_cb: Optional[Callable[[ConnectionState], None]] = None,
     ):
         """Initialize a communication interface to send and receive TMTC via TCP.
 
@@ -46,23 +140,38 @@ class TcpSpacepacketsClient(ComInterface):
         :param space_packet_ids: Valid packet IDs for CCSDS space packets. Those will be used
             to parse for space packets inside the TCP stream.
         :param inner_thread_delay: Polling frequency of TCP thread in seconds.
+        :param max_packets_stored: Maximum number of space packets stored in the TM queue.
+        :param max_bytes_stored: Maximum number of bytes stored in the TM queue.
+        :param overflow_policy: Applied if the TM queue is full.
+        :param reconnect_cfg: Enables automatic reconnection if the connection is lost. The
+            first connection attempt in :py:meth:`open` is retried in the background as well.
+        :param state_cb: Called with the new state on every connection state change.
         """
         self.com_if_id = com_if_id
         self.com_type = TcpCommunicationType.SPACE_PACKETS
         self.space_packet_ids = space_packet_ids
         self.__inner_thread_delay = inner_thread_delay
         self.target_address = target_address
-        self.max_packets_stored = max_packets_stored
+        self.reconnect_cfg = reconnect_cfg
+        self.state_cb = state_cb
         self.__conn_lock = threading.Lock()
         self.__connected = False
+        self.__conn_state = ConnectionState.DISCONNECTED
+        self.__backlog_head_partial = False
         self.__tcp_socket = None
         self.__thread_kill_signal = threading.Event()
         # Separate thread to request TM packets periodically if no TCs are being sent
         self.__tcp_thread = None
-        self.__tm_queue = queue.Queue()
+        self.__tm_queue = BoundedPacketQueue(max_packets_stored, max_bytes_stored, overflow_policy)
+        # Packets which were rejected by the TM queue with the blocking policy
+        self.__blocked_tm: Deque[bytes] = deque()
+        self.__tm_notifier = ReceptionNotifier()
         self.__tc_queue = queue.Queue()
-        self.__analysis_queue = deque()
+        self.__send_backlog: Deque[memoryview] = deque()
+        self.__framer = SpacePacketFramer(space_packet_ids)
         self.tm_packet_list = []
+        self.send_stats = SendStatistics()
+        self.__link_stats = LinkStatistics()
 
     @property
     def id(self) -> str:
@@ -81,6 +190,7 @@ class TcpSpacepacketsClient(ComInterface):
         if self.is_open():
             return
         self.__thread_kill_signal.clear()
+        self.__framer.reset()
         try:
             self.__init_socket()
             self.__connect_socket()
@@ -88,15 +198,42 @@ class TcpSpacepacketsClient(ComInterface):
             _LOGGER.exception("Issues setting up the TCP socket")
             raise e
         if self.__tcp_thread is None:
-            self.__tcp_thread = threading.Thread(target=self.__tcp_task)
-            self.__tcp_thread.start()
+            # Set before starting the thread, which resets it if the connection attempt failed
+            # and reconnection is disabled.
             with self.__conn_lock:
                 self.__connected = True
+            self.__tcp_thread = threading.Thread(target=self.__tcp_task)
+            self.__tcp_thread.start()
 
     def is_open(self) -> bool:
         with self.__conn_lock:
             return self.__connected
 
+    @property
+    def link_stats(self) -> LinkStatistics:
+        return self.__link_stats
+
+    @property
+    def max_packets_stored(self) -> Optional[int]:
+        return self.__tm_queue.max_packets
+
+    @property
+    def max_bytes_stored(self) -> Optional[int]:
+        return self.__tm_queue.max_bytes
+
+    @property
+    def overflow_policy(self) -> OverflowPolicy:
+        return self.__tm_queue.policy
+
+    @property
+    def tm_queue_stats(self) -> PacketQueueStatistics:
+        """Drop counters and high-water marks of the TM queue."""
+        return self.__tm_queue.stats
+
+    @property
+    def conn_state(self) -> ConnectionState:
+        return self.__conn_state
+
     def __init_socket(self):
         if self.__tcp_socket is None:
             self.__tcp_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -106,73 +243,128 @@ class TcpSpacepacketsClient(ComInterface):
         assert self.__tcp_socket is not None
         try:
             self.__tcp_socket.connect(self.target_address.to_tuple)
-        except socket.timeout as e:
+        except OSError as e:
+            # The TCP thread or the next open call creates a new socket.
+            self.__tcp_socket.close()
+            self.__tcp_socket = None
+            if self.reconnect_cfg is None and not isinstance(e, socket.timeout):
+                raise e
             _LOGGER.warning(
                 "Could not connect to socket with address" f" {self.target_address}: {e}"
             )
-        finally:
-            self.__tcp_socket.settimeout(None)
+            return
+        # Non-blocking because select is used. This also allows partial writes.
+        self.__tcp_socket.setblocking(False)
+        self.__set_conn_state(ConnectionState.CONNECTED)
 
     def close(self, args: any = None) -> None:
         if not self.is_open():
             return
         self.__thread_kill_signal.set()
         if self.__tcp_thread is not None:
-            self.__tcp_thread.join(self.__inner_thread_delay)
+            # A reconnection attempt might block for the connect timeout.
+            join_timeout = self.__inner_thread_delay
+            if self.reconnect_cfg is not None:
+                join_timeout += self.reconnect_cfg.connect_timeout
+            self.__tcp_thread.join(join_timeout)
+            if self.__tcp_thread.is_alive():
+                _LOGGER.warning("TCP thread did not terminate in time")
             with self.__conn_lock:
                 self.__connected = False
+            self.__tcp_thread = None
         self.__tcp_socket = None
 
     def send(self, data: bytes):
+        if (
+            self.reconnect_cfg is not None
+            and self.reconnect_cfg.unsent_tc_policy == UnsentTcPolicy.DROP
+            and self.__conn_state == ConnectionState.DISCONNECTED
+            and self.is_open()
+        ):
+            self.send_stats.packets_dropped += 1
+            return
         self.__tc_queue.put(data)
 
+    def fileno(self) -> int:
+        return self.__tm_notifier.fileno()
+
     def receive(self, poll_timeout: float = 0) -> List[bytes]:
+        self.__tm_notifier.clear()
         self.__tm_queue_to_packet_list()
         tm_packet_list = self.tm_packet_list
         self.tm_packet_list = []
         return tm_packet_list
 
     def __tm_queue_to_packet_list(self):
-        while self.__tm_queue.qsize() > 0:
-            self.__analysis_queue.append(self.__tm_queue.get())
-        # TCP is stream based, so there might be broken packets or multiple packets in one recv
-        # call. We parse the space packets contained in the stream here
-        if self.com_type == TcpCommunicationType.SPACE_PACKETS:
-            self.tm_packet_list.extend(
-                parse_space_packets(
-                    analysis_queue=self.__analysis_queue,
-                    packet_ids=self.space_packet_ids,
-                )
-            )
-        else:
-            while self.__analysis_queue:
-                self.tm_packet_list.append(self.__analysis_queue.popleft())
+        # The TCP thread only inserts complete packets, so no further parsing is required here.
+        self.tm_packet_list.extend(self.__tm_queue.pop_all())
 
     def __tcp_task(self):
-        while True and not self.__thread_kill_signal.is_set():
-            try:
-                self.__tmtc_event_loop()
-            except ConnectionRefusedError:
-                _LOGGER.warning("TCP connection attempt failed..")
-            time.sleep(self.__inner_thread_delay)
+        reconnect_attempt = 0
+        while not self.__thread_kill_signal.is_set():
+            if self.__conn_state == ConnectionState.CONNECTED:
+                reconnect_attempt = 0
+                try:
+                    self.__tmtc_event_loop()
+                except ConnectionRefusedError:
+                    _LOGGER.warning("TCP connection attempt failed..")
+                    time.sleep(self.__inner_thread_delay)
+            elif self.reconnect_cfg is None:
+                with self.__conn_lock:
+                    self.__connected = False
+                break
+            else:
+                delay = self.reconnect_cfg.backoff_delay(reconnect_attempt)
+                reconnect_attempt += 1
+                if self.__thread_kill_signal.wait(delay):
+                    break
+                self.__reconnect()
+        # The interface might have been closed right after a reconnection was established.
+        if self.__conn_state == ConnectionState.CONNECTED and self.__thread_kill_signal.is_set():
+            self.__tcp_socket.close()
+            self.__set_conn_state(ConnectionState.DISCONNECTED)
+
+    def __reconnect(self):
+        assert self.reconnect_cfg is not None
+        tcp_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        tcp_socket.settimeout(self.reconnect_cfg.connect_timeout)
+        try:
+            tcp_socket.connect(self.target_address.to_tuple)
+        except OSError as e:
+            tcp_socket.close()
+            _LOGGER.debug(f"TCP reconnection attempt to {self.target_address} failed: {e}")
+            return
+        if self.__thread_kill_signal.is_set():
+            # The interface was closed while connecting.
+            tcp_socket.close()
+            return
+        tcp_socket.setblocking(False)
+        self.__tcp_socket = tcp_socket
+        self.__framer.reset()
+        _LOGGER.info(f"TCP connection to {self.target_address} re-established")
+        self.__set_conn_state(ConnectionState.CONNECTED)
 
     def __tmtc_event_loop(self):
         assert self.__tcp_socket is not None
         try:
-            while True:
+            while self.__conn_state == ConnectionState.CONNECTED:
+                inputs = []
                 outputs = []
-                queue_size = self.__tc_queue.qsize()
-                if queue_size > 0:
+                # Do not read new TM while packets are waiting for space in the TM queue.
+                if not self.__store_blocked_tm():
+                    inputs.append(self.__tcp_socket)
+                if self.__send_backlog or self.__tc_queue.qsize() > 0:
                     outputs.append(self.__tcp_socket)
                 (readable, writable, _) = select.select(
-                    [self.__tcp_socket], outputs, [], self.__inner_thread_delay
+                    inputs, outputs, [], self.__inner_thread_delay
                 )
                 if self.__thread_kill_signal.is_set():
                     self.__tcp_socket.close()
+                    self.__set_conn_state(ConnectionState.DISCONNECTED)
                     break
-                if queue_size > 0 and writable and writable[0]:
-                    self.__tc_handling(queue_size)
-                if readable and readable[0]:
+                if writable and writable[0]:
+                    self.__tc_handling()
+                if readable and readable[0] and self.__conn_state == ConnectionState.CONNECTED:
                     self.__tm_handling()
         except KeyboardInterrupt:
             _LOGGER.info("Keyboard interrupt, shutting down TCP task")
@@ -180,42 +372,131 @@ class TcpSpacepacketsClient(ComInterface):
         except ConnectionResetError:
             self.__force_shutdown()
             _LOGGER.exception("ConnectionResetError. TCP server might not be up")
+        except SendError as e:
+            _LOGGER.warning(f"{e}")
 
-    def __tc_handling(self, queue_size: int):
+    def __tc_handling(self):
+        # Drain the TC queue into the send backlog and send as much as possible in one call.
+        while True:
+            try:
+                self.__send_backlog.append(memoryview(self.__tc_queue.get_nowait()))
+            except queue.Empty:
+                break
+        buffers = list(itertools.islice(self.__send_backlog, MAX_BUFFERS_PER_SEND))
+        start = time.perf_counter_ns()
         try:
-            self.__tcp_socket.sendto(self.__tc_queue.get(), self.target_address.to_tuple)
-            queue_size -= 1
-        except BrokenPipeError as e:
-            raise SendError(f"{e}", e)
-        except ConnectionRefusedError or OSError as e:
+            if hasattr(self.__tcp_socket, "sendmsg"):
+                bytes_sent = self.__tcp_socket.sendmsg(buffers)
+            else:
+                # Windows does not support sendmsg.
+                bytes_sent = self.__tcp_socket.send(b"".join(buffers))
+        except BlockingIOError:
+            return
+        except OSError as e:
             self.__force_shutdown()
-            raise SendError(f"TCP connection attempt failed with exception: {e}", e)
+            raise SendError(f"TCP send failed with exception: {e}", e)
+        self.__link_stats.record_send_latency_ns(time.perf_counter_ns() - start)
+        self.send_stats.send_calls += 1
+        self.send_stats.bytes_sent += bytes_sent
+        packets_sent = self.send_stats.packets_sent
+        total_sent = bytes_sent
+        if bytes_sent < sum(len(buf) for buf in buffers):
+            self.send_stats.partial_writes += 1
+        while bytes_sent > 0:
+            next_buf = self.__send_backlog[0]
+            if bytes_sent >= len(next_buf):
+                bytes_sent -= len(next_buf)
+                self.__send_backlog.popleft()
+                self.__backlog_head_partial = False
+                self.send_stats.packets_sent += 1
+            else:
+                # Partial write, keep the remainder for the next write opportunity.
+                self.__send_backlog[0] = next_buf[bytes_sent:]
+                self.__backlog_head_partial = True
+                bytes_sent = 0
+        self.__link_stats.record_out(self.send_stats.packets_sent - packets_sent, total_sent)
 
     def __tm_handling(self):
-        bytes_recvd = self.__tcp_socket.recv(4096)
-        if bytes_recvd == b"":
+        # TCP is stream based, so there might be broken packets or multiple packets in one recv
+        # call. The framer keeps its parse offset, so only newly received data is analysed here.
+        try:
+            read_len = self.__framer.recv_into(self.__tcp_socket)
+        except BlockingIOError:
+            return
+        if read_len == 0:
             self.__force_shutdown()
             _LOGGER.info("TCP server has been closed")
             return
-        if (
-            self.max_packets_stored is not None
-            and self.__tm_queue.qsize() >= self.max_packets_stored
-        ):
-            _LOGGER.warning(
-                "Number of packets in TCP queue too large. " "Overwriting old packets.."
-            )
-            self.__tm_queue.get()
-            # TODO: If segments are received but the receiver is unable to parse packets
-            #       properly, it might make sense to have a timeout which then also
-            #       logs that there might be an issue reading packets
-        self.__tm_queue.put(bytes(bytes_recvd))
+        skipped_bytes = self.__framer.skipped_bytes
+        packets = self.__framer.parse()
+        if self.__framer.skipped_bytes != skipped_bytes:
+            self.__link_stats.record_decode_errors()
+        dropped_before = self.__tm_queue.stats.dropped
+        bytes_received = 0
+        for packet in packets:
+            bytes_received += len(packet)
+            # This is the only copy of the packet data. The framer buffer is re-used.
+            packet = bytes(packet)
+            if self.__blocked_tm or not self.__tm_queue.put(packet):
+                self.__blocked_tm.append(packet)
+        dropped = self.__tm_queue.stats.dropped - dropped_before
+        if dropped > 0:
+            _LOGGER.warning(f"TCP TM queue full, dropped {dropped} packets")
+        if packets:
+            self.__link_stats.record_in(len(packets), bytes_received)
+            self.__link_stats.record_queue_depth(len(self.__tm_queue) + len(self.__blocked_tm))
+            self.__tm_notifier.notify()
+
+    def __store_blocked_tm(self) -> bool:
+        """Move packets rejected by the TM queue into the queue once there is space.
+
+        :return: True if there are still packets waiting for space.
+        """
+        moved = 0
+        while self.__blocked_tm and self.__tm_queue.has_space(len(self.__blocked_tm[0])):
+            self.__tm_queue.put(self.__blocked_tm.popleft())
+            moved += 1
+        if moved > 0:
+            # Wake up waiters on the file descriptor, the packets are new for them.
+            self.__tm_notifier.notify()
+        return len(self.__blocked_tm) > 0
 
     def data_available(self, timeout: float = 0, parameters: any = 0) -> int:
-        self.__tm_queue_to_packet_list()
-        return len(self.tm_packet_list)
+        # The TM is left inside the bounded TM queue until it is received.
+        return len(self.tm_packet_list) + len(self.__tm_queue)
 
     def __force_shutdown(self):
         assert self.__tcp_socket is not None
         self.__tcp_socket.close()
-        with self.__conn_lock:
-            self.__connected = False
+        if self.reconnect_cfg is None:
+            with self.__conn_lock:
+                self.__connected = False
+        self.__handle_unsent_tcs()
+        self.__set_conn_state(ConnectionState.DISCONNECTED)
+
+    def __handle_unsent_tcs(self):
+        if self.__backlog_head_partial:
+            self.__send_backlog.popleft()
+            self.__backlog_head_partial = False
+            self.send_stats.packets_dropped += 1
+        if self.reconnect_cfg is None or (
+            self.reconnect_cfg.unsent_tc_policy == UnsentTcPolicy.DROP
+        ):
+            self.send_stats.packets_dropped += len(self.__send_backlog)
+            self.__send_backlog.clear()
+            while True:
+                try:
+                    self.__tc_queue.get_nowait()
+                    self.send_stats.packets_dropped += 1
+                except queue.Empty:
+                    break
+
+    def __set_conn_state(self, state: ConnectionState):
+        if state == self.__conn_state:
+            return
+        self.__conn_state = state
+        if self.state_cb is not None:
+            try:
+                self.state_cb(state)
+            except Exception:
+                _LOGGER.exception("TCP connection state callback failed")
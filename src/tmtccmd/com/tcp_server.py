@@ -0,0 +1,336 @@
+"""TCP server communication interface which can serve many ground clients"""
+
+import enum
+import itertools
+import logging
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+from spacepackets.ccsds.spacepacket import PacketId
+
+from tmtccmd.com import ComInterface
+from tmtccmd.com.framing import SpacePacketFramer
+from tmtccmd.com.link_stats import LinkStatistics
+from tmtccmd.com.notifier import ReceptionNotifier
+from tmtccmd.com.tcp import MAX_BUFFERS_PER_SEND
+from tmtccmd.com.tcpip_utils import EthAddr
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_CLIENT_BACKLOG = 2**20
+
+_ACCEPT_TAG = "accept"
+_WAKEUP_TAG = "wakeup"
+
+
+class SlowConsumerPolicy(enum.Enum):
+    """Determines what happens if the send backlog of a client exceeds its maximum size."""
+
+    #: Drop the packets for the slow client. The other clients still receive them.
+    DROP_PACKETS = 0
+    #: Disconnect the slow client.
+    DISCONNECT = 1
+
+
+class TcpClientInfo:
+    """State of one client connected to the :py:class:`TcpSpacepacketsServer`."""
+
+    def __init__(self, sock: socket.socket, addr: EthAddr, packet_ids: Sequence[PacketId]):
+        self.sock = sock
+        self.addr = addr
+        self.framer = SpacePacketFramer(packet_ids)
+        self.backlog: Deque[memoryview] = deque()
+        self.backlog_bytes = 0
+        self.dropped_packets = 0
+        self.tcs_received = 0
+
+
+class TcpSpacepacketsServer(ComInterface):
+    """Communication interface for a TCP server which serves many clients, for example multiple
+    ground consoles attached to one link to the spacecraft.
+
+    From the point of view of this interface, the clients are the peer:
+
+    - :py:meth:`send` broadcasts the passed packet, usually TM received from the spacecraft link,
+      to all connected clients.
+    - :py:meth:`receive` returns the space packets received from all clients, usually TCs, in one
+      queue which is ordered by arrival time.
+
+    A single thread serves all clients using a :py:mod:`selectors` based event loop. Each client
+    has a bounded send backlog. If the backlog of a client exceeds ``max_client_backlog`` bytes,
+    the configured :py:class:`SlowConsumerPolicy` is applied to that client only. Unexpected
+    errors while serving a client are logged and only disconnect that client. If the event loop
+    itself terminates because of an error, :py:meth:`is_open` returns False.
+    """
+
+    def __init__(
+        self,
+        com_if_id: str,
+        space_packet_ids: Sequence[PacketId],
+        bind_address: EthAddr,
+        max_clients: Optional[int] = None,
+        max_client_backlog: int = DEFAULT_MAX_CLIENT_BACKLOG,
+        slow_consumer_policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP_PACKETS,
+    ):
+        """Initialize a TCP server communication interface.
+
+        :param com_if_id:
+        :param space_packet_ids: Valid packet IDs for CCSDS space packets. Those will be used
+            to parse for space packets inside the TCP streams of the clients.
+        :param bind_address: Address the server is bound to. Port 0 lets the OS assign a port,
+            which can be retrieved with :py:attr:`bound_address` after opening the interface.
+        :param max_clients: Maximum number of clients. Further connections are closed
+            immediately.
+        :param max_client_backlog: Maximum number of bytes stored for each client.
+        :param slow_consumer_policy:
+        """
+        self.com_if_id = com_if_id
+        self.space_packet_ids = space_packet_ids
+        self.bind_address = bind_address
+        self.max_clients = max_clients
+        self.max_client_backlog = max_client_backlog
+        self.slow_consumer_policy = slow_consumer_policy
+        self.dropped_packets = 0
+        self.__selector: Optional[selectors.BaseSelector] = None
+        self.__server_socket: Optional[socket.socket] = None
+        self.__wakeup_recv: Optional[socket.socket] = None
+        self.__wakeup_send: Optional[socket.socket] = None
+        self.__server_thread: Optional[threading.Thread] = None
+        self.__thread_kill_signal = threading.Event()
+        self.__clients: Dict[socket.socket, TcpClientInfo] = dict()
+        # Both deques are thread-safe for appends and pops from opposite sides.
+        self.__tm_queue: Deque[bytes] = deque()
+        self.__tc_queue: Deque[bytes] = deque()
+        self.__tc_notifier = ReceptionNotifier()
+        self.__link_stats = LinkStatistics()
+
+    @property
+    def id(self) -> str:
+        return self.com_if_id
+
+    @property
+    def bound_address(self) -> Optional[EthAddr]:
+        if self.__server_socket is None:
+            return None
+        return EthAddr.from_tuple(self.__server_socket.getsockname())
+
+    @property
+    def link_stats(self) -> LinkStatistics:
+        """Statistics of all clients. Sent packets are counted for each client."""
+        return self.__link_stats
+
+    @property
+    def clients(self) -> List[TcpClientInfo]:
+        return list(self.__clients.values())
+
+    @property
+    def num_clients(self) -> int:
+        return len(self.__clients)
+
+    def __del__(self):
+        try:
+            self.close()
+        except IOError:
+            _LOGGER.warning("Could not close TCP server communication interface!")
+
+    def initialize(self, args: Any = None):
+        pass
+
+    def open(self, args: Any = None):
+        if self.is_open():
+            return
+        # Clean up after a server thread which terminated because of an error.
+        self.close()
+        self.__thread_kill_signal.clear()
+        self.__server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.__server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.__server_socket.bind(self.bind_address.to_tuple)
+        self.__server_socket.listen()
+        self.__server_socket.setblocking(False)
+        self.__wakeup_recv, self.__wakeup_send = socket.socketpair()
+        self.__wakeup_recv.setblocking(False)
+        self.__wakeup_send.setblocking(False)
+        self.__selector = selectors.DefaultSelector()
+        self.__selector.register(self.__server_socket, selectors.EVENT_READ, _ACCEPT_TAG)
+        self.__selector.register(self.__wakeup_recv, selectors.EVENT_READ, _WAKEUP_TAG)
+        self.__server_thread = threading.Thread(target=self.__server_task, daemon=True)
+        self.__server_thread.start()
+
+    def is_open(self) -> bool:
+        return self.__server_thread is not None and self.__server_thread.is_alive()
+
+    def close(self, args: Any = None):
+        if self.__server_thread is None:
+            return
+        self.__thread_kill_signal.set()
+        self.__wakeup()
+        self.__server_thread.join()
+        self.__server_thread = None
+        for client in list(self.__clients.values()):
+            self.__disconnect(client)
+        self.__selector.close()
+        self.__server_socket.close()
+        self.__wakeup_recv.close()
+        self.__wakeup_send.close()
+        self.__server_socket = None
+
+    def send(self, data: bytes):
+        """Broadcast a packet to all connected clients. The packet is not copied, so the passed
+        object should not be modified afterwards."""
+        self.__tm_queue.append(data)
+        self.__wakeup()
+
+    def fileno(self) -> int:
+        return self.__tc_notifier.fileno()
+
+    def receive(self, parameters: Any = 0) -> List[bytes]:
+        packet_list = []
+        self.__tc_notifier.clear()
+        while self.__tc_queue:
+            packet_list.append(self.__tc_queue.popleft())
+        return packet_list
+
+    def data_available(self, timeout: float = 0, parameters: Any = 0) -> int:
+        return len(self.__tc_queue)
+
+    def __wakeup(self):
+        try:
+            self.__wakeup_send.send(b"\x00")
+        except (OSError, AttributeError):
+            # A wakeup is already pending or the interface is not open.
+            pass
+
+    def __server_task(self):
+        try:
+            self.__serve()
+        except Exception:
+            _LOGGER.exception("TCP server thread terminated because of an unexpected error")
+
+    def __serve(self):
+        while not self.__thread_kill_signal.is_set():
+            for key, events in self.__selector.select():
+                if key.data == _ACCEPT_TAG:
+                    self.__accept()
+                elif key.data == _WAKEUP_TAG:
+                    try:
+                        self.__wakeup_recv.recv(4096)
+                    except BlockingIOError:
+                        pass
+                else:
+                    self.__handle_client_events(key.data, events)
+            self.__distribute_tm()
+
+    def __handle_client_events(self, client: TcpClientInfo, events: int):
+        try:
+            if events & selectors.EVENT_WRITE:
+                self.__handle_write(client)
+            if events & selectors.EVENT_READ and client.sock in self.__clients:
+                self.__handle_read(client)
+        except Exception:
+            _LOGGER.exception(f"Unexpected error serving TCP client {client.addr}")
+            self.__disconnect(client)
+
+    def __accept(self):
+        try:
+            sock, addr = self.__server_socket.accept()
+        except BlockingIOError:
+            return
+        if self.max_clients is not None and len(self.__clients) >= self.max_clients:
+            _LOGGER.warning(f"Maximum number of clients reached, rejecting client {addr}")
+            sock.close()
+            return
+        sock.setblocking(False)
+        client = TcpClientInfo(sock, EthAddr.from_tuple(addr), self.space_packet_ids)
+        self.__clients[sock] = client
+        self.__selector.register(sock, selectors.EVENT_READ, client)
+        _LOGGER.info(f"TCP client {client.addr} connected")
+
+    def __disconnect(self, client: TcpClientInfo):
+        if self.__clients.pop(client.sock, None) is None:
+            return
+        self.__selector.unregister(client.sock)
+        client.sock.close()
+        _LOGGER.info(f"TCP client {client.addr} disconnected")
+
+    def __distribute_tm(self):
+        while self.__tm_queue:
+            packet = memoryview(self.__tm_queue.popleft())
+            for client in list(self.__clients.values()):
+                if client.backlog_bytes + len(packet) > self.max_client_backlog:
+                    self.__handle_slow_consumer(client)
+                    continue
+                if not client.backlog:
+                    self.__selector.modify(
+                        client.sock, selectors.EVENT_READ | selectors.EVENT_WRITE, client
+                    )
+                client.backlog.append(packet)
+                client.backlog_bytes += len(packet)
+
+    def __handle_slow_consumer(self, client: TcpClientInfo):
+        client.dropped_packets += 1
+        self.dropped_packets += 1
+        if self.slow_consumer_policy == SlowConsumerPolicy.DISCONNECT:
+            _LOGGER.warning(f"Disconnecting slow TCP client {client.addr}")
+            self.__disconnect(client)
+
+    def __handle_write(self, client: TcpClientInfo):
+        buffers = list(itertools.islice(client.backlog, MAX_BUFFERS_PER_SEND))
+        start = time.perf_counter_ns()
+        try:
+            if hasattr(client.sock, "sendmsg"):
+                bytes_sent = client.sock.sendmsg(buffers)
+            else:
+                # Windows does not support sendmsg.
+                bytes_sent = client.sock.send(b"".join(buffers))
+        except BlockingIOError:
+            return
+        except OSError as e:
+            _LOGGER.warning(f"Sending to TCP client {client.addr} failed: {e}")
+            self.__disconnect(client)
+            return
+        self.__link_stats.record_send_latency_ns(time.perf_counter_ns() - start)
+        client.backlog_bytes -= bytes_sent
+        total_sent = bytes_sent
+        packets_sent = 0
+        while bytes_sent > 0:
+            next_buf = client.backlog[0]
+            if bytes_sent >= len(next_buf):
+                bytes_sent -= len(next_buf)
+                client.backlog.popleft()
+                packets_sent += 1
+            else:
+                client.backlog[0] = next_buf[bytes_sent:]
+                bytes_sent = 0
+        self.__link_stats.record_out(packets_sent, total_sent)
+        if not client.backlog:
+            self.__selector.modify(client.sock, selectors.EVENT_READ, client)
+
+    def __handle_read(self, client: TcpClientInfo):
+        try:
+            read_len = client.framer.recv_into(client.sock)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            _LOGGER.warning(f"Receiving from TCP client {client.addr} failed: {e}")
+            self.__disconnect(client)
+            return
+        if read_len == 0:
+            self.__disconnect(client)
+            return
+        skipped_bytes = client.framer.skipped_bytes
+        packets = client.framer.parse()
+        if client.framer.skipped_bytes != skipped_bytes:
+            self.__link_stats.record_decode_errors()
+        bytes_received = 0
+        for packet in packets:
+            client.tcs_received += 1
+            bytes_received += len(packet)
+            self.__tc_queue.append(bytes(packet))
+        if packets:
+            self.__link_stats.record_in(len(packets), bytes_received)
+            self.__link_stats.record_queue_depth(len(self.__tc_queue))
+            self.__tc_notifier.notify()
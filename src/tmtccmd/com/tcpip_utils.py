@@ -12,6 +12,8 @@ from tmtccmd.util.json import check_json_file, JsonKeyNames
 
 _LOGGER = logging.getLogger(__name__)
 DEFAULT_MAX_RECV_SIZE = 1500
+# Datagrams larger than the receive size are truncated, so this is larger than a typical MTU.
+DEFAULT_UDP_RECV_MAX_SIZE = 4096
 
 
 @dataclass
@@ -169,6 +171,25 @@ def determine_recv_buffer_len(json_cfg_path: str, tcpip_type: TcpIpType):
     return recv_max_size
 
 
+def read_recv_max_size(json_cfg_path: str, tcpip_type: TcpIpType) -> int:
+    """Read the maximum receive size from the JSON configuration file without prompting the user.
+
+    :return: The configured size, or :py:const:`DEFAULT_UDP_RECV_MAX_SIZE` for UDP and
+        :py:const:`DEFAULT_MAX_RECV_SIZE` for TCP if no size was configured.
+    """
+    if tcpip_type == TcpIpType.TCP:
+        json_key = JsonKeyNames.TCPIP_TCP_RECV_MAX_SIZE.value
+        default_size = DEFAULT_MAX_RECV_SIZE
+    else:
+        json_key = JsonKeyNames.TCPIP_UDP_RECV_MAX_SIZE.value
+        default_size = DEFAULT_UDP_RECV_MAX_SIZE
+    if not check_json_file(json_cfg_path=json_cfg_path):
+        return default_size
+    with open(json_cfg_path, "r") as read:
+        load_data = json.load(read)
+    return int(load_data.get(json_key, default_size))
+
+
 def prompt_recv_buffer_len(tcpip_type: TcpIpType) -> int:
     if tcpip_type == TcpIpType.UDP:
         type_str = "UDP"
@@ -1,40 +1,134 @@
 """UDP Communication Interface"""
 
+import dataclasses
 import logging
 import select
 import socket
-from typing import List, Optional
+import struct
+import time
+from dataclasses import dataclass
+from typing import Any, List, Optional, Set
 
 from tmtccmd.com import ComInterface
-from tmtccmd.com.tcpip_utils import EthAddr
+from tmtccmd.com.framing import split_space_packets
+from tmtccmd.com.link_stats import LinkStatistics
+from tmtccmd.com.tcpip_utils import EthAddr, DEFAULT_UDP_RECV_MAX_SIZE
 
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass
+class UdpStatistics:
+    """Statistics of the UDP client.
+
+    :var datagrams_received: Number of received datagrams.
+    :var packets_received: Number of received packets. This can be larger than the number of
+        datagrams if space packet framing is enabled.
+    :var broken_datagrams: Number of received datagrams which ended with an incomplete space
+        packet. The incomplete packet is dropped.
+    :var datagrams_sent: Number of sent datagrams.
+    :var packets_sent: Number of sent packets.
+    :var oversize_packets: Number of packets which were larger than the send MTU and were sent
+        in a datagram of their own.
+    """
+
+    datagrams_received: int = 0
+    packets_received: int = 0
+    broken_datagrams: int = 0
+    datagrams_sent: int = 0
+    packets_sent: int = 0
+    oversize_packets: int = 0
+
+
+@dataclass
+class MulticastCfg:
+    """Multicast configuration of the UDP client.
+
+    :var group: IPv4 multicast group address, for example ``239.255.0.1``.
+    :var interface: Address of the local interface used to join the group and to send
+        multicast datagrams. ``0.0.0.0`` lets the OS select the interface.
+    :var ttl: Time-to-live of sent multicast datagrams. 1 keeps them inside the local network.
+    :var loopback: Deliver sent multicast datagrams to listeners on the same host.
+    :var join: Join the group when opening the interface to receive datagrams sent to it.
+    """
+
+    group: str
+    interface: str = "0.0.0.0"
+    ttl: int = 1
+    loopback: bool = True
+    join: bool = True
+
+
 class UdpClient(ComInterface):
-    """Communication interface for UDP communication"""
+    """Communication interface for UDP communication.
+
+    By default, each datagram is one packet. Ground stations might aggregate multiple space
+    packets into one datagram to reduce the per-packet overhead. This is supported with the
+    following options:
+
+    - With ``space_packet_framing`` enabled, received datagrams are split into space packets
+      using the packet data length field of the space packet headers.
+    - With a ``send_mtu``, sent packets are buffered and coalesced into datagrams which are not
+      larger than the MTU. The buffered packets are sent with :py:meth:`flush`, which the
+      :py:class:`tmtccmd.core.ccsds_backend.CcsdsTmtcBackend` calls once no further TC is due
+      immediately.
+
+    With a :py:class:`MulticastCfg`, the client can receive datagrams sent to a multicast group,
+    so one source can publish TM once for many listeners. The receive socket is bound with
+    address re-use, so multiple listeners on the same host can bind the same port. To publish
+    to the group, the group address is used as the send address.
+    """
 
     def __init__(
         self,
         com_if_id: str,
         send_address: EthAddr,
         recv_addr: Optional[EthAddr] = None,
+        recv_max_size: int = DEFAULT_UDP_RECV_MAX_SIZE,
+        recv_pool_size: int = 64,
+        space_packet_framing: bool = False,
+        send_mtu: Optional[int] = None,
+        multicast_cfg: Optional[MulticastCfg] = None,
     ):
         """Initialize a communication interface to send and receive UDP datagrams.
 
         :param send_address:
         :param recv_addr:
+        :param recv_max_size: Maximum size of a received datagram. Larger datagrams will be
+            truncated.
+        :param recv_pool_size: Number of datagram slots in the reception buffer pool used by
+            :py:meth:`receive_views`. This is also the maximum number of datagrams returned by
+            one call of that method. The pool is allocated by the first call of that method.
+        :param space_packet_framing: Split received datagrams into space packets.
+        :param send_mtu: Maximum size of sent datagrams. Enables the coalescing of sent packets
+            if it is not None.
+        :param multicast_cfg: Enables the multicast options of the socket.
         """
         self.udp_socket = None
         self.com_if_id = com_if_id
         self.send_address = send_address
         self.recv_addr = recv_addr
+        self.recv_max_size = recv_max_size
+        self.recv_pool_size = recv_pool_size
+        self._recv_pool_view: Optional[memoryview] = None
+        self.space_packet_framing = space_packet_framing
+        self.send_mtu = send_mtu
+        self.multicast_cfg = multicast_cfg
+        self.joined_groups: Set[str] = set()
+        self.stats = UdpStatistics()
+        self.__link_stats = LinkStatistics()
+        self.__send_backlog: List[bytes] = []
+        self.__send_backlog_len = 0
 
     @property
     def id(self) -> str:
         return self.com_if_id
 
+    @property
+    def link_stats(self) -> LinkStatistics:
+        return self.__link_stats
+
     def __del__(self):
         try:
             self.close()
@@ -46,6 +140,8 @@ class UdpClient(ComInterface):
 
     def open(self, args: any = None):
         self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        if self.multicast_cfg is not None:
+            self.__configure_multicast(self.multicast_cfg)
         # Bind is possible but should not be necessary, and introduces risk of port already
         # being used.
         # See: https://docs.microsoft.com/en-us/windows/win32/api/winsock/nf-winsock-bind
@@ -54,22 +150,107 @@ class UdpClient(ComInterface):
                 f"Binding UDP socket to {self.recv_addr.ip_addr} and port" f" {self.recv_addr.port}"
             )
             self.udp_socket.bind(self.recv_addr.to_tuple)
+        if self.multicast_cfg is not None and self.multicast_cfg.join:
+            self.join_group(self.multicast_cfg.group, self.multicast_cfg.interface)
         # Set non-blocking because we use select
         self.udp_socket.setblocking(False)
 
+    def __configure_multicast(self, cfg: MulticastCfg):
+        self.udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, "SO_REUSEPORT"):
+            # Required on BSD and macOS so multiple listeners can bind the same port.
+            self.udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        self.udp_socket.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, cfg.ttl)
+        self.udp_socket.setsockopt(
+            socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1 if cfg.loopback else 0
+        )
+        self.udp_socket.setsockopt(
+            socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(cfg.interface)
+        )
+
+    def join_group(self, group: str, interface: str = "0.0.0.0"):
+        """Join a multicast group to receive the datagrams sent to it. Can be called for
+        multiple groups while the interface is open."""
+        if self.udp_socket is None:
+            raise ValueError("UDP socket is not open")
+        self.udp_socket.setsockopt(
+            socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, self.__mreq(group, interface)
+        )
+        self.joined_groups.add(group)
+        _LOGGER.info(f"Joined multicast group {group}")
+
+    def leave_group(self, group: str, interface: str = "0.0.0.0"):
+        if self.udp_socket is None or group not in self.joined_groups:
+            return
+        self.udp_socket.setsockopt(
+            socket.IPPROTO_IP, socket.IP_DROP_MEMBERSHIP, self.__mreq(group, interface)
+        )
+        self.joined_groups.discard(group)
+        _LOGGER.info(f"Left multicast group {group}")
+
+    @staticmethod
+    def __mreq(group: str, interface: str) -> bytes:
+        return struct.pack("4s4s", socket.inet_aton(group), socket.inet_aton(interface))
+
     def is_open(self) -> bool:
         return self.udp_socket is not None
 
     def close(self, args: any = None) -> None:
         if self.udp_socket is not None:
+            self.flush()
+            # Closing the socket also leaves all joined multicast groups.
             self.udp_socket.close()
+            self.joined_groups.clear()
 
     def send(self, data: bytes):
         if self.udp_socket is None:
             return
+        if self.send_mtu is None:
+            self.__send_datagram(data, 1)
+            return
+        if self.__send_backlog_len + len(data) > self.send_mtu:
+            self.flush()
+        if len(data) > self.send_mtu:
+            self.stats.oversize_packets += 1
+            self.__send_datagram(data, 1)
+            return
+        self.__send_backlog.append(data)
+        self.__send_backlog_len += len(data)
+
+    def flush(self):
+        """Send all buffered packets coalesced into one datagram."""
+        if not self.__send_backlog or self.udp_socket is None:
+            return
+        if len(self.__send_backlog) == 1:
+            datagram = self.__send_backlog[0]
+        else:
+            datagram = b"".join(self.__send_backlog)
+        packets = len(self.__send_backlog)
+        self.__send_backlog = []
+        self.__send_backlog_len = 0
+        self.__send_datagram(datagram, packets)
+
+    def __send_datagram(self, data: bytes, packets: int):
+        start = time.perf_counter_ns()
         bytes_sent = self.udp_socket.sendto(data, self.send_address.to_tuple)
+        self.__link_stats.record_send_latency_ns(time.perf_counter_ns() - start)
         if bytes_sent != len(data):
             _LOGGER.warning("Not all bytes were sent!")
+        self.stats.datagrams_sent += 1
+        self.stats.packets_sent += packets
+        self.__link_stats.record_out(packets, bytes_sent)
+
+    def __split_datagram(self, datagram: memoryview) -> List[memoryview]:
+        packets, trailing_len = split_space_packets(datagram)
+        if trailing_len > 0:
+            self.stats.broken_datagrams += 1
+            self.__link_stats.record_decode_errors()
+        return packets
+
+    def fileno(self) -> int:
+        if self.udp_socket is None:
+            raise ValueError("UDP socket is not open")
+        return self.udp_socket.fileno()
 
     def data_available(self, timeout: float = 0, parameters: any = 0) -> bool:
         if self.udp_socket is None:
@@ -80,14 +261,152 @@ class UdpClient(ComInterface):
         return False
 
     def receive(self, poll_timeout: float = 0) -> List[bytes]:
+        """Receive all pending datagrams. The socket is only polled once with the given timeout,
+        all datagrams which are pending after that are read without further polling.
+        """
         packet_list = []
         if self.udp_socket is None:
             return packet_list
-        try:
-            while self.data_available(poll_timeout):
-                data, sender_addr = self.udp_socket.recvfrom(4096)
-                packet_list.append(bytearray(data))
+        # Also required with a zero timeout: Reading an unbound socket raises an error on
+        # Windows.
+        if not self.data_available(poll_timeout):
             return packet_list
+        bytes_received = 0
+        try:
+            while True:
+                datagram = self.udp_socket.recv(self.recv_max_size)
+                self.stats.datagrams_received += 1
+                bytes_received += len(datagram)
+                if self.space_packet_framing:
+                    packet_list.extend(
+                        bytes(packet) for packet in self.__split_datagram(memoryview(datagram))
+                    )
+                else:
+                    packet_list.append(datagram)
+        except BlockingIOError:
+            pass
         except ConnectionResetError:
             _LOGGER.warning("Connection reset exception occured!")
             return []
+        self.stats.packets_received += len(packet_list)
+        self.__link_stats.record_in(len(packet_list), bytes_received)
+        return packet_list
+
+    def receive_views(self, poll_timeout: float = 0) -> List[memoryview]:
+        """Drain mode reception which reads all pending datagrams into an internal reusable buffer
+        pool without any per-datagram copies or allocations of the datagram data.
+
+        The returned memory views point into the internal buffer pool and are only valid until the
+        next call of this method. The user needs to copy them if they need to be stored.
+        If more datagrams are pending than there are pool slots, the remaining datagrams are
+        returned by the next call.
+        """
+        view_list = []
+        if self.udp_socket is None:
+            return view_list
+        if not self.data_available(poll_timeout):
+            return view_list
+        max_size = self.recv_max_size
+        pool_len = self.recv_pool_size * max_size
+        # Allocated on demand because many clients only send or never use this method.
+        if self._recv_pool_view is None or len(self._recv_pool_view) != pool_len:
+            self._recv_pool_view = memoryview(bytearray(pool_len))
+        pool_view = self._recv_pool_view
+        offset = 0
+        bytes_received = 0
+        try:
+            while offset < len(pool_view):
+                slot = pool_view[offset : offset + max_size]
+                read_len = self.udp_socket.recv_into(slot, max_size)
+                self.stats.datagrams_received += 1
+                bytes_received += read_len
+                if self.space_packet_framing:
+                    view_list.extend(self.__split_datagram(slot[:read_len]))
+                else:
+                    view_list.append(slot[:read_len])
+                offset += max_size
+        except BlockingIOError:
+            pass
+        except ConnectionResetError:
+            _LOGGER.warning("Connection reset exception occured!")
+            return []
+        self.stats.packets_received += len(view_list)
+        self.__link_stats.record_in(len(view_list), bytes_received)
+        return view_list
+
+
+class UdpMulticastRelay(ComInterface):
+    """Wraps the communication interface of the uplink and publishes all received packets to a
+    multicast group. This allows one process to own the link to the spacecraft or simulator
+    while many listeners receive the TM with a multicast :py:class:`UdpClient`.
+
+    The received packets are passed to the publisher without any copies. All other calls are
+    forwarded to the wrapped interface. The publisher is flushed after each :py:meth:`receive`
+    call, so packets can be coalesced into datagrams by using a publisher with a send MTU and
+    space packet framing on the listener side.
+    """
+
+    def __init__(self, com_if: ComInterface, publisher: UdpClient):
+        """
+        :param com_if: Interface of the uplink.
+        :param publisher: UDP client which sends to the multicast group address.
+        """
+        self.com_if = com_if
+        self.publisher = publisher
+
+    @classmethod
+    def with_group(
+        cls, com_if: ComInterface, group_addr: EthAddr, cfg: Optional[MulticastCfg] = None, **kwargs
+    ) -> "UdpMulticastRelay":
+        """Create a relay with a publisher which sends to the given group address. Additional
+        keyword arguments are passed to the :py:class:`UdpClient` of the publisher."""
+        if cfg is None:
+            cfg = MulticastCfg(group=group_addr.ip_addr)
+        # The publisher does not need to receive its own datagrams.
+        cfg = dataclasses.replace(cfg, join=False)
+        publisher = UdpClient(
+            f"{com_if.id}_mcast", send_address=group_addr, multicast_cfg=cfg, **kwargs
+        )
+        return cls(com_if, publisher)
+
+    @property
+    def id(self) -> str:
+        return self.com_if.id
+
+    def initialize(self, args: Any = 0) -> Any:
+        self.publisher.initialize()
+        return self.com_if.initialize(args)
+
+    def open(self, args: Any = 0):
+        self.com_if.open(args)
+        self.publisher.open()
+
+    def is_open(self) -> bool:
+        return self.com_if.is_open()
+
+    def close(self, args: Any = 0):
+        self.com_if.close(args)
+        self.publisher.close()
+
+    def send(self, data: bytes):
+        self.com_if.send(data)
+
+    def receive(self, parameters: Any = 0) -> List[bytes]:
+        packet_list = self.com_if.receive(parameters)
+        for packet in packet_list:
+            self.publisher.send(packet)
+        self.publisher.flush()
+        return packet_list
+
+    def data_available(self, timeout: float = 0, parameters: Any = 0) -> int:
+        return self.com_if.data_available(timeout, parameters)
+
+    def flush(self):
+        self.com_if.flush()
+
+    def fileno(self) -> int:
+        return self.com_if.fileno()
+
+    @property
+    def link_stats(self):
+        return self.com_if.link_stats
@@ -14,7 +14,7 @@ from tmtccmd.com.serial_dle import SerialDleComIF
 from tmtccmd.com.serial_cobs import SerialCobsComIF
 
 from tmtccmd.com.ser_utils import determine_com_port, determine_baud_rate
-from tmtccmd.com.tcpip_utils import TcpIpType, EthAddr
+from tmtccmd.com.tcpip_utils import TcpIpType, EthAddr, DEFAULT_UDP_RECV_MAX_SIZE
 from tmtccmd.com.udp import UdpClient
 from tmtccmd.com.tcp import TcpSpacepacketsClient
 
@@ -40,12 +40,14 @@ class TcpipCfg(ComCfgBase):
         send_addr: EthAddr,
         space_packet_ids: Optional[Sequence[PacketId]],
         recv_addr: Optional[EthAddr] = None,
+        recv_max_size: int = DEFAULT_UDP_RECV_MAX_SIZE,
     ):
         super().__init__(com_if_key, json_cfg_path)
         self.space_packet_ids = space_packet_ids
         self.if_type = if_type
         self.send_addr = send_addr
         self.recv_addr = recv_addr
+        self.recv_max_size = recv_max_size
 
 
 class SerialCfgWrapper(ComCfgBase):
@@ -168,6 +170,7 @@ def default_tcpip_cfg_setup(
     from tmtccmd.com.tcpip_utils import (
         determine_udp_send_address,
         determine_tcp_send_address,
+        read_recv_max_size,
     )
 
     if tcpip_type == TcpIpType.UDP:
@@ -182,6 +185,7 @@ def default_tcpip_cfg_setup(
         json_cfg_path=json_cfg_path,
         send_addr=send_addr,
         space_packet_ids=space_packet_ids,
+        recv_max_size=read_recv_max_size(json_cfg_path=json_cfg_path, tcpip_type=tcpip_type),
     )
     return cfg
 
@@ -212,6 +216,7 @@ def create_default_tcpip_interface(tcpip_cfg: TcpipCfg) -> Optional[ComInterface
             com_if_id=tcpip_cfg.com_if_key,
             send_address=tcpip_cfg.send_addr,
             recv_addr=tcpip_cfg.recv_addr,
+            recv_max_size=tcpip_cfg.recv_max_size,
         )
     elif tcpip_cfg.com_if_key == CoreComInterfaces.TCP.value:
         assert tcpip_cfg.space_packet_ids is not None
@@ -0,0 +1,135 @@
+"""Variant of the :py:class:`tmtccmd.core.ccsds_backend.CcsdsTmtcBackend` for asynchronous
+communication interfaces"""
+
+import asyncio
+from datetime import timedelta
+from typing import Optional
+
+from tmtccmd.com.aio import AsyncComInterface, SyncComAdapter
+from tmtccmd.core.backend_state import BackendState
+from tmtccmd.core.base import BackendRequest, TcMode, TmMode
+from tmtccmd.core.ccsds_backend import CcsdsTmtcBackend
+from tmtccmd.tmtc.ccsds_tm_listener import CcsdsTmListener
+from tmtccmd.tmtc.handler import TcHandlerBase
+
+DEFAULT_IDLE_TIMEOUT = timedelta(seconds=3.0)
+
+
+class AsyncCcsdsTmtcBackend(CcsdsTmtcBackend):
+    """TMTC backend which runs the TM listener and the TC sequence sender as :py:mod:`asyncio`
+    tasks on top of an :py:class:`tmtccmd.com.aio.AsyncComInterface`. Multiple backends can be
+    run concurrently inside one event loop.
+
+    The TM task waits for received packets and passes them to the TM listener while the TM mode
+    is set to the listener mode. The TC task consumes the TC queues like the synchronous
+    backend and sleeps until the next TC is due. The TC handler and the TM listener are called
+    with a :py:class:`tmtccmd.com.aio.SyncComAdapter`, so existing handlers can be re-used.
+
+    Example usage:
+
+    .. code-block:: python
+
+        backend = AsyncCcsdsTmtcBackend(tc_mode, tm_mode, com_if, tm_listener, tc_handler)
+        backend.current_procedure = TreeCommandingProcedure(cmd_path="/ping")
+        await backend.open_async()
+        try:
+            await backend.run()
+        finally:
+            await backend.close_async()
+    """
+
+    def __init__(
+        self,
+        tc_mode: TcMode,
+        tm_mode: TmMode,
+        com_if: AsyncComInterface,
+        tm_listener: CcsdsTmListener,
+        tc_handler: TcHandlerBase,
+        idle_timeout: timedelta = DEFAULT_IDLE_TIMEOUT,
+    ):
+        """
+        :param idle_timeout: Maximum wait time of the tasks if there is nothing to do. Calling
+            :py:meth:`wakeup` after changing the modes or the procedure interrupts the wait.
+        """
+        super().__init__(tc_mode, tm_mode, SyncComAdapter(com_if), tm_listener, tc_handler)
+        self.async_com_if = com_if
+        self.idle_timeout = idle_timeout
+        self.__stop_requested = False
+        self.__wakeup_event: Optional[asyncio.Event] = None
+
+    async def open_async(self):
+        await self.async_com_if.open()
+        self._com_if_active = True
+
+    async def close_async(self):
+        await self.async_com_if.close()
+        self._com_if_active = False
+
+    def wakeup(self):
+        """Wake up the tasks, for example after the modes or the procedure were changed."""
+        if self.__wakeup_event is not None:
+            self.__wakeup_event.set()
+
+    def stop(self):
+        """Request :py:meth:`run` to return."""
+        self.__stop_requested = True
+        self.wakeup()
+
+    async def run(self) -> BackendState:
+        """Run the TM and the TC task until the backend requests termination or
+        :py:meth:`stop` is called.
+
+        :raises NoValidProcedureSet: No valid procedure set to be passed to the feed callback of
+            the TC handler
+        :return: Last state of the backend.
+        """
+        self.__stop_requested = False
+        self.__wakeup_event = asyncio.Event()
+        tm_task = asyncio.create_task(self.tm_task())
+        try:
+            return await self.tc_task()
+        finally:
+            tm_task.cancel()
+            try:
+                await tm_task
+            except asyncio.CancelledError:
+                pass
+
+    async def tm_task(self):
+        """Pass received TM to the TM listener while the TM mode is the listener mode."""
+        while not self.__stop_requested:
+            if self.tm_mode != TmMode.LISTENER:
+                await self.__wait_for_wakeup(self.idle_timeout.total_seconds())
+                continue
+            if await self.async_com_if.wait_for_data(self.idle_timeout.total_seconds()):
+                self.tm_operation()
+            # Do not starve the other tasks if TM arrives continuously
+            await asyncio.sleep(0)
+
+    async def tc_task(self) -> BackendState:
+        """Consume TC queues until the backend requests termination or :py:meth:`stop` is
+        called."""
+        while True:
+            self.__wakeup_event.clear()
+            self.tc_operation()
+            self.mode_to_req()
+            if self._state.sender_res.tc_sent:
+                await self.async_com_if.drain()
+            request = self._state.request
+            if request == BackendRequest.TERMINATION_NO_ERROR or self.__stop_requested:
+                return self._state
+            if request == BackendRequest.CALL_NEXT:
+                # Still give other tasks the chance to run
+                await asyncio.sleep(0)
+                continue
+            if request == BackendRequest.DELAY_CUSTOM:
+                timeout = self._state.next_delay.total_seconds()
+            else:
+                timeout = self.idle_timeout.total_seconds()
+            await self.__wait_for_wakeup(timeout)
+
+    async def __wait_for_wakeup(self, timeout: float):
+        try:
+            await asyncio.wait_for(self.__wakeup_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
@@ -17,9 +17,14 @@ from tmtccmd.tmtc.ccsds_seq_sender import (
     SenderMode,
 )
 from tmtccmd.tmtc.ccsds_tm_listener import CcsdsTmListener
+from tmtccmd.tmtc.shaper import TcShaper
 from tmtccmd.com import ComInterface
 
 
+# Recommended delay while TC sending is paused
+PAUSED_SENDER_DELAY = timedelta(milliseconds=100)
+
+
 class NoValidProcedureSet(Exception):
     pass
 
@@ -104,6 +109,30 @@ class CcsdsTmtcBackend(BackendBase):
     def tm_listener(self):
         return self._tm_listener
 
+    @property
+    def tc_sending_paused(self) -> bool:
+        return self._seq_handler.paused
+
+    def pause_tc_sending(self):
+        """Pause the consumption of the current TC queue without discarding it. This can be used
+        to stop sending telecommands while the link of the communication interface is down, for
+        example by calling this function from the state callback of the
+        :py:class:`tmtccmd.com.tcp.TcpSpacepacketsClient`."""
+        self._seq_handler.pause()
+
+    def resume_tc_sending(self):
+        self._seq_handler.unpause()
+
+    @property
+    def tc_shaper(self) -> Optional[TcShaper]:
+        return self._seq_handler.shaper
+
+    @tc_shaper.setter
+    def tc_shaper(self, shaper: Optional[TcShaper]):
+        """Set a token bucket shaper which limits the TC uplink rate according to the TC sizes.
+        The backend requests a delay until the next TC may be sent."""
+        self._seq_handler.shaper = shaper
+
     def try_set_com_if(self, com_if: ComInterface) -> bool:
         if not self.com_if_active():
             self._com_if = com_if
@@ -149,6 +178,7 @@ class CcsdsTmtcBackend(BackendBase):
             self._com_if.close()
         except IOError:
             self.__listener_io_error_handler("close")
+        self._tm_listener.close()
         self._com_if_active = False
 
     def periodic_op(self, _args: Optional[any] = None) -> BackendState:
@@ -195,13 +225,16 @@ class CcsdsTmtcBackend(BackendBase):
                     self._state.mode_wrapper.tc_mode = TcMode.IDLE
                 self._state._req = BackendRequest.CALL_NEXT
         else:
-            if (
+            if self._state.sender_res.paused:
+                self._state._recommended_delay = PAUSED_SENDER_DELAY
+                self._state._req = BackendRequest.DELAY_CUSTOM
+            elif (
                 not self._state.sender_res.next_entry_is_tc
                 and not self._state.sender_res.queue_empty
             ):
                 self._state._req = BackendRequest.CALL_NEXT
             else:
-                if int(self._state.sender_res.longest_rem_delay.microseconds / 1000.0) > 0:
+                if self._state.sender_res.longest_rem_delay >= timedelta(milliseconds=1):
                     self._state._recommended_delay = self._state.sender_res.longest_rem_delay
                     self._state._req = BackendRequest.DELAY_CUSTOM
                 else:
@@ -227,11 +260,26 @@ class CcsdsTmtcBackend(BackendBase):
         It is necessary to set a valid procedure before calling this by using the
         :py:attr:`current_proc_info` setter function.
 
+        Buffered packets are flushed with :py:meth:`tmtccmd.com.ComInterface.flush` unless the
+        next TC is due immediately, so TCs which are sent back to back can be coalesced by the
+        communication interface.
+
         :raises NoValidProcedureSet: No valid procedure set to be passed to the feed callback of
             the TC handler
         """
         if self._state.tc_mode != TcMode.IDLE:
             self.__check_and_execute_queue()
+            if not self.__next_tc_due():
+                self._com_if.flush()
+
+    def __next_tc_due(self) -> bool:
+        sender_res = self._state.sender_res
+        return (
+            self._seq_handler.mode == SenderMode.BUSY
+            and not sender_res.paused
+            and sender_res.next_entry_is_tc
+            and sender_res.longest_rem_delay < timedelta(milliseconds=1)
+        )
 
     def __check_and_execute_queue(self):
         if self._seq_handler.mode == SenderMode.DONE:
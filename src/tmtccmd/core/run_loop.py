@@ -0,0 +1,206 @@
+"""Event driven run loop for the :py:class:`tmtccmd.core.ccsds_backend.CcsdsTmtcBackend`"""
+
+import logging
+import selectors
+import socket
+import time
+from datetime import timedelta
+from typing import Optional
+
+from tmtccmd.com import ComInterface
+from tmtccmd.core.base import BackendRequest, TmMode
+from tmtccmd.core.backend_state import BackendState
+from tmtccmd.core.ccsds_backend import CcsdsTmtcBackend
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_IDLE_TIMEOUT = timedelta(seconds=3.0)
+DEFAULT_LISTENER_TIMEOUT = timedelta(seconds=2.0)
+# Used to poll interfaces which do not provide a file descriptor
+DEFAULT_POLL_INTERVAL = timedelta(milliseconds=400)
+
+_TM_TAG = "tm"
+_WAKEUP_TAG = "wakeup"
+
+
+def com_if_fileno(com_if: ComInterface) -> Optional[int]:
+    """Retrieve the file descriptor which signals TM readiness of a communication interface.
+
+    :return: File descriptor or None if the interface does not provide a usable one.
+    """
+    try:
+        fd = com_if.fileno()
+    except (NotImplementedError, OSError, ValueError):
+        return None
+    if fd < 0:
+        return None
+    return fd
+
+
+def wait_for_tm(com_if: ComInterface, timeout: float) -> bool:
+    """Block until the communication interface has TM available or the timeout in seconds
+    expires. Interfaces which do not provide a file descriptor are not polled, the full timeout
+    is waited instead.
+
+    :return: True if TM is available.
+    """
+    fd = com_if_fileno(com_if)
+    if fd is None:
+        time.sleep(timeout)
+        return False
+    with selectors.DefaultSelector() as selector:
+        selector.register(fd, selectors.EVENT_READ)
+        return len(selector.select(timeout)) > 0
+
+
+class BackendRunLoop:
+    """Run loop for the :py:class:`tmtccmd.core.ccsds_backend.CcsdsTmtcBackend` which replaces
+    calling :py:meth:`tmtccmd.core.ccsds_backend.CcsdsTmtcBackend.periodic_op` with fixed
+    sleeps in between.
+
+    After each periodic operation, the loop waits on a :py:mod:`selectors` selector until
+
+    - the communication interface has TM available, if the backend is in listener mode and the
+      interface provides a file descriptor with :py:meth:`tmtccmd.com.ComInterface.fileno`,
+    - the next TC of the current queue is due, which is the recommended delay of the backend,
+    - :py:meth:`wakeup` or :py:meth:`stop` is called from another thread.
+
+    Interfaces which do not provide a file descriptor are polled with the poll interval.
+
+    Example usage:
+
+    .. code-block:: python
+
+        run_loop = BackendRunLoop(tmtc_backend)
+        try:
+            run_loop.run()
+        finally:
+            run_loop.close()
+            tmtc_backend.close_com_if()
+    """
+
+    def __init__(
+        self,
+        backend: CcsdsTmtcBackend,
+        idle_timeout: timedelta = DEFAULT_IDLE_TIMEOUT,
+        listener_timeout: timedelta = DEFAULT_LISTENER_TIMEOUT,
+        poll_interval: timedelta = DEFAULT_POLL_INTERVAL,
+    ):
+        """
+        :param backend:
+        :param idle_timeout: Maximum wait time if the TC and the TM mode are both idle.
+        :param listener_timeout: Maximum wait time for TM in listener mode if no TC is pending.
+        :param poll_interval: Maximum wait time if the communication interface does not provide
+            a file descriptor.
+        """
+        self.backend = backend
+        self.idle_timeout = idle_timeout
+        self.listener_timeout = listener_timeout
+        self.poll_interval = poll_interval
+        self.__stop_requested = False
+        self.__selector = selectors.DefaultSelector()
+        self.__wakeup_recv, self.__wakeup_send = socket.socketpair()
+        self.__wakeup_recv.setblocking(False)
+        self.__wakeup_send.setblocking(False)
+        self.__selector.register(self.__wakeup_recv, selectors.EVENT_READ, _WAKEUP_TAG)
+        self.__tm_fd: Optional[int] = None
+        self.__tm_com_if: Optional[ComInterface] = None
+
+    def wakeup(self):
+        """Interrupt the current wait. Can be called from any thread, for example after a new
+        procedure was set or the TC mode was changed."""
+        try:
+            self.__wakeup_send.send(b"\x00")
+        except OSError:
+            # A wakeup is already pending or the loop was closed.
+            pass
+
+    def stop(self):
+        """Request :py:meth:`run` to return. Can be called from any thread."""
+        self.__stop_requested = True
+        self.wakeup()
+
+    def run(self) -> BackendState:
+        """Call the periodic operation of the backend until it requests termination or
+        :py:meth:`stop` is called.
+
+        :return: Last state of the backend.
+        """
+        self.__stop_requested = False
+        while True:
+            state = self.run_once()
+            if state.request == BackendRequest.TERMINATION_NO_ERROR or self.__stop_requested:
+                return state
+
+    def run_once(self) -> BackendState:
+        """Call the periodic operation of the backend once and then wait until there is work
+        to do."""
+        state = self.backend.periodic_op(None)
+        if state.request in (BackendRequest.TERMINATION_NO_ERROR, BackendRequest.CALL_NEXT):
+            return state
+        self.wait(self.__wait_time(state))
+        return state
+
+    def wait(self, timeout: float) -> bool:
+        """Wait for TM, a wakeup or the timeout in seconds.
+
+        :return: True if TM is available.
+        """
+        self.__update_tm_registration()
+        if self.__stop_requested:
+            return False
+        tm_ready = False
+        for key, _ in self.__selector.select(timeout):
+            if key.data == _TM_TAG:
+                tm_ready = True
+            else:
+                try:
+                    self.__wakeup_recv.recv(4096)
+                except BlockingIOError:
+                    pass
+        return tm_ready
+
+    def close(self):
+        if self.__tm_fd is not None:
+            self.__selector.unregister(self.__tm_fd)
+            self.__tm_fd = None
+        self.__selector.close()
+        self.__wakeup_recv.close()
+        self.__wakeup_send.close()
+
+    def __wait_time(self, state: BackendState) -> float:
+        tm_fd_available = self.__tm_fd_wanted() is not None
+        if state.request == BackendRequest.DELAY_IDLE:
+            return self.idle_timeout.total_seconds()
+        if state.request == BackendRequest.DELAY_LISTENER:
+            if tm_fd_available:
+                return self.listener_timeout.total_seconds()
+            return self.poll_interval.total_seconds()
+        if state.request == BackendRequest.DELAY_CUSTOM:
+            wait_time = state.next_delay
+            if self.backend.tm_mode == TmMode.LISTENER and not tm_fd_available:
+                wait_time = min(wait_time, self.poll_interval)
+            return max(wait_time.total_seconds(), 0.0)
+        return self.poll_interval.total_seconds()
+
+    def __tm_fd_wanted(self) -> Optional[int]:
+        # TM is only retrieved in listener mode. Waiting on the descriptor in other modes
+        # would cause a busy loop because the descriptor stays readable.
+        if self.backend.tm_mode != TmMode.LISTENER or not self.backend.com_if_active():
+            return None
+        return com_if_fileno(self.backend.com_if)
+
+    def __update_tm_registration(self):
+        tm_fd = self.__tm_fd_wanted()
+        if tm_fd == self.__tm_fd and self.backend.com_if is self.__tm_com_if:
+            return
+        if self.__tm_fd is not None:
+            try:
+                self.__selector.unregister(self.__tm_fd)
+            except (KeyError, ValueError):
+                pass
+        self.__tm_fd = tm_fd
+        self.__tm_com_if = self.backend.com_if
+        if tm_fd is not None:
+            _LOGGER.debug(f"Waiting for TM on file descriptor {tm_fd}")
+            self.__selector.register(tm_fd, selectors.EVENT_READ, _TM_TAG)
@@ -7,6 +7,7 @@ from PyQt6.QtCore import QRunnable, pyqtSlot, QObject, pyqtSignal
 from tmtccmd.config.hook import HookBase
 
 from tmtccmd.core import TmMode, TcMode, BackendRequest
+from tmtccmd.core.run_loop import wait_for_tm
 from tmtccmd.gui.defs import LocalArgs, SharedArgs, WorkerOperationsCode
 from tmtccmd.tmtc.procedure import TreeCommandingProcedure
 
@@ -124,8 +125,9 @@ class FrontendWorker(QRunnable):
         else:
             # We only should run the TM operation here
             self._shared.backend.tm_operation()
-            # Poll TM every 400 ms for now
-            time.sleep(self._locals.op_args)
+            # Wait for TM, but check the stop and abort signals at least every 400 ms.
+            # Interfaces without a file descriptor are polled with that interval.
+            wait_for_tm(self._shared.backend.com_if, self._locals.op_args)
 
     def __loop(self, op_code: WorkerOperationsCode) -> bool:
         if op_code == WorkerOperationsCode.ONE_QUEUE_MODE:
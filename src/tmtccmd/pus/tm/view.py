@@ -0,0 +1,118 @@
+"""Zero-copy view on raw PUS TM packets which decodes the header fields on demand"""
+
+import struct
+from typing import Union
+
+from spacepackets.ccsds.time import CdsShortTimestamp
+from spacepackets.crc import CRC16_CCITT_FUNC
+from spacepackets.ecss import PusTelemetry
+from spacepackets.exceptions import BytesTooShortError
+
+# Space packet header, PUS C secondary header without the timestamp and the CRC
+PUS_TM_OVERHEAD_WITHOUT_TIMESTAMP = 6 + 7 + 2
+
+RawPacketT = Union[bytes, bytearray, memoryview]
+
+
+class PusTmView:
+    """Read-only view on a raw PUS C TM packet. Only the packet length is checked on
+    construction. All other fields are decoded from the raw data when they are accessed, and the
+    timestamp and the source data are returned as memoryviews without copying them. This makes
+    routing, filtering and counting packets cheap compared to :py:meth:`PusTelemetry.unpack`,
+    which can still be used with :py:meth:`to_pus_tm` for packets which need to be fully
+    decoded.
+
+    The raw data may be larger than the packet, for example a memoryview into a reception
+    buffer. The packet length is taken from the space packet header.
+    """
+
+    __slots__ = ("_buf", "timestamp_len")
+
+    def __init__(self, raw: RawPacketT, timestamp_len: int = CdsShortTimestamp.TIMESTAMP_SIZE):
+        """
+        :param raw: Raw packet data.
+        :param timestamp_len: Length of the timestamp in the secondary header.
+        :raises BytesTooShortError: Raw data shorter than the packet length in the header or
+            than a PUS TM with the given timestamp length.
+        """
+        if len(raw) < 6:
+            raise BytesTooShortError(6, len(raw))
+        packet_len = struct.unpack_from("!H", raw, 4)[0] + 7
+        if packet_len < PUS_TM_OVERHEAD_WITHOUT_TIMESTAMP + timestamp_len:
+            raise BytesTooShortError(PUS_TM_OVERHEAD_WITHOUT_TIMESTAMP + timestamp_len, packet_len)
+        if len(raw) < packet_len:
+            raise BytesTooShortError(packet_len, len(raw))
+        self._buf = memoryview(raw)[:packet_len]
+        self.timestamp_len = timestamp_len
+
+    @property
+    def raw(self) -> memoryview:
+        return self._buf
+
+    def tobytes(self) -> bytes:
+        return self._buf.tobytes()
+
+    @property
+    def packet_len(self) -> int:
+        return len(self._buf)
+
+    @property
+    def apid(self) -> int:
+        return struct.unpack_from("!H", self._buf, 0)[0] & 0x7FF
+
+    @property
+    def seq_flags(self) -> int:
+        return self._buf[2] >> 6
+
+    @property
+    def seq_count(self) -> int:
+        return struct.unpack_from("!H", self._buf, 2)[0] & 0x3FFF
+
+    @property
+    def pus_version(self) -> int:
+        return self._buf[6] >> 4
+
+    @property
+    def service(self) -> int:
+        return self._buf[7]
+
+    @property
+    def subservice(self) -> int:
+        return self._buf[8]
+
+    @property
+    def message_counter(self) -> int:
+        return struct.unpack_from("!H", self._buf, 9)[0]
+
+    @property
+    def dest_id(self) -> int:
+        return struct.unpack_from("!H", self._buf, 11)[0]
+
+    @property
+    def timestamp(self) -> memoryview:
+        return self._buf[13 : 13 + self.timestamp_len]
+
+    @property
+    def source_data(self) -> memoryview:
+        return self._buf[13 + self.timestamp_len : -2]
+
+    @property
+    def crc16(self) -> int:
+        return struct.unpack_from("!H", self._buf, len(self._buf) - 2)[0]
+
+    def crc_valid(self) -> bool:
+        return CRC16_CCITT_FUNC(self._buf) == 0
+
+    def to_pus_tm(self) -> PusTelemetry:
+        """Fully decode the packet.
+
+        :raises InvalidTmCrc16Error: Invalid CRC of the packet.
+        """
+        return PusTelemetry.unpack(self._buf.tobytes(), self.timestamp_len)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(apid={self.apid:#05x}, seq_count={self.seq_count},"
+            f" service={self.service}, subservice={self.subservice},"
+            f" packet_len={self.packet_len})"
+        )
@@ -16,6 +16,7 @@ from tmtccmd.tmtc import (
 )
 from tmtccmd.tmtc.handler import SendCbParams, TcHandlerBase
 from tmtccmd.tmtc.queue import QueueWrapper
+from tmtccmd.tmtc.shaper import TcShaper
 
 
 class SenderMode(enum.IntEnum):
@@ -30,6 +31,7 @@ class SeqResultWrapper:
         self.tc_sent: bool = False
         self.queue_empty: bool = False
         self.next_entry_is_tc: bool = False
+        self.paused: bool = False
 
 
 class SequentialCcsdsSender:
@@ -39,10 +41,13 @@ class SequentialCcsdsSender:
         self,
         queue_wrapper: QueueWrapper,
         tc_handler: TcHandlerBase,
+        shaper: Optional[TcShaper] = None,
     ):
         """
         :param queue_wrapper: Wrapper object containing the queue and queue handling properties
         :param tc_handler:
+        :param shaper: Optional token bucket shaper which delays TCs according to their size
+            in addition to the inter-command delay.
         """
         self._tc_handler = tc_handler
         self._queue_wrapper = queue_wrapper
@@ -55,6 +60,9 @@ class SequentialCcsdsSender:
         self._op_divider = 0
         self._last_queue_entry: Optional[TcQueueEntryBase] = None
         self._last_tc: Optional[TcQueueEntryBase] = None
+        self._paused = False
+        self.shaper = shaper
+        self._shaper_cd = Countdown(None)
 
     @property
     def queue_wrapper(self):
@@ -84,13 +92,30 @@ class SequentialCcsdsSender:
         if self._mode == SenderMode.DONE and self.queue_wrapper.queue:
             self._mode = SenderMode.BUSY
 
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    def pause(self):
+        """Pause the consumption of the TC queue, for example because the link of the
+        communication interface is down. The queue is kept as it is and the next entry will be
+        handled after :py:meth:`unpause` was called."""
+        self._paused = True
+
+    def unpause(self):
+        self._paused = False
+
     def operation(self, com_if: ComInterface) -> SeqResultWrapper:
         """Primary function which should be called periodically to consume a TC queue.
 
         :param com_if: Communication interface used to send telecommands. Will be passed to the
             user send function
         """
-        self._handle_current_tc_queue(com_if)
+        self._current_res.paused = self._paused
+        if self._paused:
+            self._current_res.tc_sent = False
+        else:
+            self._handle_current_tc_queue(com_if)
         self._current_res.mode = self._mode
         return self._current_res
 
@@ -130,10 +155,13 @@ class SequentialCcsdsSender:
         is_tc = self.handle_non_tc_entry(next_queue_entry)
         consume_queue_entry = True
         if is_tc:
-            if self.no_delay_remaining():
+            if self.no_delay_remaining() and self.__shaper_allows(next_queue_entry):
                 self._current_res.tc_sent = True
             else:
+                # The TC is held back by a delay or the shaper, so the caller should wait for
+                # the remaining delay instead of calling again immediately.
                 self._current_res.tc_sent = False
+                self._current_res.next_entry_is_tc = True
                 consume_queue_entry = False
         else:
             self._current_res.tc_sent = False
@@ -142,6 +170,8 @@ class SequentialCcsdsSender:
                 SendCbParams(self._proc_wrapper, QueueEntryHelper(next_queue_entry), com_if)
             )
             if is_tc:
+                if self.shaper is not None:
+                    self.shaper.consume_for_entry(next_queue_entry)
                 if self.queue_wrapper.inter_cmd_delay != self._send_cd.timeout:
                     self._send_cd.reset(self.queue_wrapper.inter_cmd_delay)
                 else:
@@ -155,6 +185,15 @@ class SequentialCcsdsSender:
             self._tc_handler.queue_finished_cb(ProcedureWrapper(self._queue_wrapper.info))
             self._mode = SenderMode.DONE
 
+    def __shaper_allows(self, queue_entry: TcQueueEntryBase) -> bool:
+        if self.shaper is None:
+            return True
+        delay = self.shaper.delay_for_entry(queue_entry)
+        if delay > timedelta():
+            self._shaper_cd.reset(new_timeout=delay)
+            return False
+        return True
+
     def no_delay_remaining(self) -> bool:
         return self.__send_cd_timed_out() and self.__wait_cd_timed_out()
 
@@ -193,5 +232,7 @@ class SequentialCcsdsSender:
 
     def _update_largest_delay(self):
         self._current_res.longest_rem_delay = max(
-            self._wait_cd.remaining_time(), self._send_cd.remaining_time()
+            self._wait_cd.remaining_time(),
+            self._send_cd.remaining_time(),
+            self._shaper_cd.remaining_time(),
         )
@@ -1,10 +1,12 @@
 """Contains the TmListener which can be used to listen to Telemetry in the background"""
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from spacepackets.ccsds.spacepacket import get_apid_from_raw_space_packet
 
 from tmtccmd.tmtc.common import TelemetryQueueT, CcsdsTmHandler
+from tmtccmd.tmtc.tm_decode import DecodedTmList, TmDecodeStage
+from tmtccmd.tmtc.tm_pipeline import TmPipeline, TmPipelineCfg
 from tmtccmd.com import ComInterface
 
 
@@ -28,13 +30,72 @@ class CcsdsTmListener:
     def __init__(
         self,
         tm_handler: CcsdsTmHandler,
+        batch_mode: bool = False,
+        pipeline_cfg: Optional[TmPipelineCfg] = None,
+        decode_stage: Optional[TmDecodeStage] = None,
     ):
         """Initiate a TM listener.
 
         :param tm_handler: If valid CCSDS packets are found, they are dispatched to
             the passed handler
+        :param batch_mode: Group each received packet list by APID and dispatch each group with
+            one :py:meth:`tmtccmd.tmtc.CcsdsTmHandler.handle_packet_batch` call. The order of
+            the packets is preserved for each APID, but not across APIDs.
+        :param pipeline_cfg: Enables the pipeline mode if set. The listener only acts as the
+            receive stage and submits the packets grouped by APID to a
+            :py:class:`tmtccmd.tmtc.tm_pipeline.TmPipeline`, which calls the handler from a
+            thread pool. The pipeline is stopped with :py:meth:`close`.
+        :param decode_stage: Optional stage which decodes the packets in worker processes. The
+            decoded packets are passed to
+            :py:meth:`tmtccmd.tmtc.CcsdsTmHandler.handle_decoded_packet` in arrival order.
+            Each :py:meth:`operation` call waits up to the collect timeout of the stage for the
+            submitted packets, packets which take longer are handled by a later call. The
+            stage is closed with :py:meth:`close`. It can not be combined with the pipeline
+            mode.
+        :raises ValueError: Decode stage and pipeline mode are both used.
         """
+        if decode_stage is not None and pipeline_cfg is not None:
+            raise ValueError("decode stage can not be combined with the pipeline mode")
         self.__tm_handler = tm_handler
+        self.batch_mode = batch_mode
+        self.__decode_stage = decode_stage
+        self.__pipeline = None
+        if pipeline_cfg is not None:
+            self.__pipeline = TmPipeline(tm_handler, pipeline_cfg)
+
+    @property
+    def pipeline(self) -> Optional[TmPipeline]:
+        return self.__pipeline
+
+    @property
+    def decode_stage(self) -> Optional[TmDecodeStage]:
+        return self.__decode_stage
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the pipeline or the decode stage handled all received packets. Returns True
+        immediately if neither is used.
+
+        :param timeout: Timeout for the pipeline. Decoding is always waited for.
+        :return: False if the timeout expired.
+        """
+        if self.__decode_stage is not None:
+            self.__handle_decoded(self.__decode_stage.flush())
+        if self.__pipeline is None:
+            return True
+        return self.__pipeline.flush(timeout)
+
+    def close(self, drain: bool = True):
+        """Stop the pipeline or the decode stage, if used.
+
+        :param drain: Handle all received packets before stopping. See
+            :py:meth:`tmtccmd.tmtc.tm_pipeline.TmPipeline.close`.
+        """
+        if self.__pipeline is not None:
+            self.__pipeline.close(drain)
+        if self.__decode_stage is not None:
+            if drain:
+                self.__handle_decoded(self.__decode_stage.flush())
+            self.__decode_stage.close()
 
     def operation(self, com_if: ComInterface) -> int:
         """Core operation to route packet to the provided handler.
@@ -46,10 +107,55 @@ class CcsdsTmListener:
         :return:
         """
         packet_list = com_if.receive()
+        if self.__decode_stage is not None:
+            self.__handle_with_decode_stage(packet_list)
+            return len(packet_list)
+        if self.__pipeline is not None or self.batch_mode:
+            self.__handle_batch(packet_list)
+            return len(packet_list)
         for tm_packet in packet_list:
             self.__handle_ccsds_space_packet(tm_packet)
         return len(packet_list)
 
+    def __handle_with_decode_stage(self, packet_list: List[bytes]):
+        valid_packets = [tm_packet for tm_packet in packet_list if len(tm_packet) >= 6]
+        if valid_packets:
+            self.__decode_stage.submit(valid_packets)
+        self.__handle_decoded(self.__decode_stage.poll(self.__decode_stage.cfg.collect_timeout))
+        if len(valid_packets) < len(packet_list):
+            raise PacketsTooSmallForCcsds(
+                [tm_packet for tm_packet in packet_list if len(tm_packet) < 6]
+            )
+
+    def __handle_decoded(self, decoded: DecodedTmList):
+        handler = self.__tm_handler
+        for tm_packet, record in decoded:
+            handler.handle_decoded_packet(
+                ((tm_packet[0] << 8) | tm_packet[1]) & 0x7FF, tm_packet, record
+            )
+
+    def __handle_batch(self, packet_list: List[bytes]):
+        apid_groups: Dict[int, List[bytes]] = dict()
+        invalid_packets = []
+        for tm_packet in packet_list:
+            if len(tm_packet) < 6:
+                invalid_packets.append(tm_packet)
+                continue
+            apid = ((tm_packet[0] << 8) | tm_packet[1]) & 0x7FF
+            group = apid_groups.get(apid)
+            if group is None:
+                apid_groups[apid] = [tm_packet]
+            else:
+                group.append(tm_packet)
+        if self.__pipeline is not None:
+            for apid, packets in apid_groups.items():
+                self.__pipeline.submit(apid, packets)
+        else:
+            for apid, packets in apid_groups.items():
+                self.__tm_handler.handle_packet_batch(apid, packets)
+        if len(invalid_packets) > 0:
+            raise PacketsTooSmallForCcsds(invalid_packets)
+
     def __handle_ccsds_space_packet(self, tm_packet: bytes):
         invalid_packets = []
         if len(tm_packet) < 6:
@@ -1,9 +1,12 @@
 import enum
 import abc
 import logging
-from typing import Deque, List, Any, Dict, Optional
+from typing import Callable, Deque, List, Any, Dict, Optional, Set, Tuple
 from spacepackets.ecss.tm import PusTelemetry
 
+from tmtccmd.pus.tm.view import PusTmView
+from tmtccmd.tmtc.subscription import TmSubscriptions
+
 
 TelemetryList = List[bytes]
 # Deprecated type alias.
@@ -31,6 +34,28 @@ class SpecificApidHandlerBase(abc.ABC):
     def handle_tm(self, _packet: bytes, _user_args: Any):
         logging.getLogger(__name__).warning(f"No TM handling implemented for APID {self.apid}")
 
+    def handle_tm_batch(self, packets: List[bytes], user_args: Any):
+        """Called with all packets for the APID of one reception batch, in arrival order, if the
+        batch mode of the :py:class:`tmtccmd.tmtc.CcsdsTmListener` is used. Can be overriden to
+        amortise decoding, database writes or logging across the batch. The default
+        implementation calls :py:meth:`handle_tm` for each packet."""
+        for packet in packets:
+            self.handle_tm(packet, user_args)
+
+    def handle_decoded_tm(self, packet: bytes, record: Any, user_args: Any):
+        """Called with the packet and the record created by the decoder if a
+        :py:class:`tmtccmd.tmtc.tm_decode.TmDecodeStage` is used. The record is a
+        :py:class:`tmtccmd.tmtc.tm_decode.TmDecodeError` if the decoder failed. The default
+        implementation calls :py:meth:`handle_tm` with the raw packet."""
+        self.handle_tm(packet, user_args)
+
+    def handle_tm_view(self, view: PusTmView, user_args: Any):
+        """Called with a :py:class:`tmtccmd.pus.tm.view.PusTmView` if packets are dispatched with
+        :py:meth:`CcsdsTmHandler.handle_packet_view`. Can be overriden to route or filter
+        packets without fully unpacking them. The default implementation calls
+        :py:meth:`handle_tm` with a copy of the raw packet."""
+        self.handle_tm(view.tobytes(), user_args)
+
 
 class GenericApidHandlerBase(abc.ABC):
     """This class is similar to the :py:class:`SpecificApidHandlerBase` but it is not specific
@@ -44,6 +69,22 @@ class GenericApidHandlerBase(abc.ABC):
     def handle_tm(self, apid: int, _packet: bytes, _user_args: Any):
         pass
 
+    def handle_tm_batch(self, apid: int, packets: List[bytes], user_args: Any):
+        """Batch variant of :py:meth:`handle_tm`, see
+        :py:meth:`SpecificApidHandlerBase.handle_tm_batch`."""
+        for packet in packets:
+            self.handle_tm(apid, packet, user_args)
+
+    def handle_decoded_tm(self, apid: int, packet: bytes, record: Any, user_args: Any):
+        """Variant of :py:meth:`handle_tm` for decoded packets, see
+        :py:meth:`SpecificApidHandlerBase.handle_decoded_tm`."""
+        self.handle_tm(apid, packet, user_args)
+
+    def handle_tm_view(self, apid: int, view: PusTmView, user_args: Any):
+        """Variant of :py:meth:`handle_tm` for packet views, see
+        :py:meth:`SpecificApidHandlerBase.handle_tm_view`."""
+        self.handle_tm(apid, view.tobytes(), user_args)
+
 
 class DefaultApidHandler(GenericApidHandlerBase):
     def handle_tm(self, apid: int, _packet: bytes, _user_args: Any):
@@ -51,6 +92,7 @@ class DefaultApidHandler(GenericApidHandlerBase):
 
 
 HandlerDictT = Dict[int, SpecificApidHandlerBase]
+PusTmCallback = Callable[[bytes], Any]
 
 
 class TmTypes(enum.Enum):
@@ -69,11 +111,25 @@ class TmHandlerBase:
 class CcsdsTmHandler(TmHandlerBase):
     """Generic CCSDS handler class. The user can create an instance of this class to handle
     CCSDS packets by adding dedicated APID handlers or a generic handler for all APIDs with no
-    dedicated handler"""
+    dedicated handler.
+
+    PUS TM can also be routed to callbacks for an APID, service and subservice with
+    :py:meth:`add_pus_tm_callback`. These routes are checked before the APID handlers. They are
+    compiled into one flat dictionary keyed by the packed APID, service and subservice, so the
+    routing of a packet is a single dictionary lookup with the service and subservice read from
+    the raw packet, independent of the number of routes.
+
+    Independently of the dispatch, all packets are passed to the matching subscribers of
+    :py:attr:`subscriptions`, for example archive writers or alarm engines.
+    """
 
     def __init__(self, generic_handler: Optional[GenericApidHandlerBase]):
         super().__init__(tm_type=TmTypes.CCSDS_SPACE_PACKETS)
         self._handler_dict: HandlerDictT = dict()
+        self._pus_routes: Dict[Tuple[int, int, Optional[int]], PusTmCallback] = dict()
+        self._pus_table: Dict[int, PusTmCallback] = dict()
+        self._pus_apids: Set[int] = set()
+        self.subscriptions = TmSubscriptions()
         if generic_handler is None:
             self.generic_handler = DefaultApidHandler(None)
         else:
@@ -91,6 +147,61 @@ class CcsdsTmHandler(TmHandlerBase):
     def has_apid(self, apid: int) -> bool:
         return apid in self._handler_dict
 
+    def add_pus_tm_callback(
+        self, apid: int, service: int, subservice: Optional[int], callback: PusTmCallback
+    ):
+        """Route PUS TM with the given APID, service and subservice to a callback, which is
+        called with the raw packet. Packets which are routed to a callback are not passed to
+        the APID handlers.
+
+        :param apid:
+        :param service:
+        :param subservice: None routes all subservices of the service which do not have a
+            dedicated route.
+        :param callback:
+        """
+        if not 0 <= apid <= 0x7FF or not 0 <= service <= 0xFF:
+            raise ValueError(f"invalid APID {apid} or service {service}")
+        if subservice is not None and not 0 <= subservice <= 0xFF:
+            raise ValueError(f"invalid subservice {subservice}")
+        self._pus_routes[(apid, service, subservice)] = callback
+        self.__compile_pus_table()
+
+    def remove_pus_tm_callback(self, apid: int, service: int, subservice: Optional[int]) -> bool:
+        """Remove a route added with :py:meth:`add_pus_tm_callback`.
+
+        :return: False if the route does not exist.
+        """
+        if self._pus_routes.pop((apid, service, subservice), None) is None:
+            return False
+        self.__compile_pus_table()
+        return True
+
+    def __compile_pus_table(self):
+        table = dict()
+        # Service wildcards first, so dedicated subservice routes override them.
+        for (apid, service, subservice), callback in self._pus_routes.items():
+            if subservice is None:
+                base_key = (apid << 16) | (service << 8)
+                for wildcard_subservice in range(256):
+                    table[base_key | wildcard_subservice] = callback
+        for (apid, service, subservice), callback in self._pus_routes.items():
+            if subservice is not None:
+                table[(apid << 16) | (service << 8) | subservice] = callback
+        self._pus_table = table
+        self._pus_apids = {apid for apid, _, _ in self._pus_routes}
+
+    def __route_pus_tm(self, apid: int, packet: bytes) -> bool:
+        # Packets without a secondary header or too short for the PUS service and subservice
+        # can not be routed.
+        if len(packet) < 9 or not packet[0] & 0x08:
+            return False
+        callback = self._pus_table.get((apid << 16) | (packet[7] << 8) | packet[8])
+        if callback is None:
+            return False
+        callback(packet)
+        return True
+
     def user_hook(self, apid: int, packet: bytes):
         """Can be overriden to trace all packets received."""
         pass
@@ -102,12 +213,89 @@ class CcsdsTmHandler(TmHandlerBase):
 
         :param apid:
         :param packet:
-        :return: True if the packet was passed to as dedicated APID handler, False otherwise
+        :return: True if the packet was passed to a PUS TM callback or a dedicated APID handler,
+            False otherwise
         """
         self.user_hook(apid, packet)
+        if self.subscriptions.active:
+            self.subscriptions.dispatch(packet)
+        if self._pus_table and self.__route_pus_tm(apid, packet):
+            return True
         specific_handler = self._handler_dict.get(apid)
         if specific_handler is None:
             self.generic_handler.handle_tm(apid, packet, self.generic_handler.user_args)
             return False
         specific_handler.handle_tm(packet, specific_handler.user_args)
         return True
+
+    def user_batch_hook(self, apid: int, packets: List[bytes]):
+        """Batch variant of :py:meth:`user_hook`. The default implementation calls
+        :py:meth:`user_hook` for each packet."""
+        for packet in packets:
+            self.user_hook(apid, packet)
+
+    def handle_packet_batch(self, apid: int, packets: List[bytes]) -> bool:
+        """Handle a list of packets with the same APID with one call of the batch handler
+        of the APID handler or of the handler for unknown APIDs. If PUS TM callbacks exist for
+        the APID, the routed packets are passed to the callbacks first and only the remaining
+        packets are passed to the batch handler.
+
+        :param apid:
+        :param packets: Packets in arrival order.
+        :return: True if the packets were passed to PUS TM callbacks or a dedicated APID
+            handler, False otherwise
+        """
+        self.user_batch_hook(apid, packets)
+        if self.subscriptions.active:
+            for packet in packets:
+                self.subscriptions.dispatch(packet)
+        if apid in self._pus_apids:
+            packets = [packet for packet in packets if not self.__route_pus_tm(apid, packet)]
+            if not packets:
+                return True
+        specific_handler = self._handler_dict.get(apid)
+        if specific_handler is None:
+            self.generic_handler.handle_tm_batch(apid, packets, self.generic_handler.user_args)
+            return False
+        specific_handler.handle_tm_batch(packets, specific_handler.user_args)
+        return True
+
+    def handle_packet_view(self, view: PusTmView) -> bool:
+        """Handle a PUS TM packet view, which avoids copying and unpacking the packet for the
+        dispatch. The :py:meth:`user_hook` and PUS TM callbacks receive the raw packet as a
+        memoryview.
+
+        :return: True if the packet was passed to a PUS TM callback or a dedicated APID handler,
+            False otherwise
+        """
+        apid = view.apid
+        self.user_hook(apid, view.raw)
+        if self.subscriptions.active:
+            self.subscriptions.dispatch(view.raw)
+        if self._pus_table and self.__route_pus_tm(apid, view.raw):
+            return True
+        specific_handler = self._handler_dict.get(apid)
+        if specific_handler is None:
+            self.generic_handler.handle_tm_view(apid, view, self.generic_handler.user_args)
+            return False
+        specific_handler.handle_tm_view(view, specific_handler.user_args)
+        return True
+
+    def handle_decoded_packet(self, apid: int, packet: bytes, record: Any) -> bool:
+        """Handle a packet together with the record which was created by the decoder of a
+        :py:class:`tmtccmd.tmtc.tm_decode.TmDecodeStage`. Decoded packets are only dispatched
+        by APID and are not routed to PUS TM callbacks.
+
+        :return: True if the packet was passed to as dedicated APID handler, False otherwise
+        """
+        self.user_hook(apid, packet)
+        if self.subscriptions.active:
+            self.subscriptions.dispatch(packet)
+        specific_handler = self._handler_dict.get(apid)
+        if specific_handler is None:
+            self.generic_handler.handle_decoded_tm(
+                apid, packet, record, self.generic_handler.user_args
+            )
+            return False
+        specific_handler.handle_decoded_tm(packet, record, specific_handler.user_args)
+        return True
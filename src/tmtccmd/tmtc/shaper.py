@@ -0,0 +1,183 @@
+"""Token bucket based rate shaping of the TC uplink"""
+
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Dict, Optional, Tuple
+
+from tmtccmd.tmtc.queue import TcQueueEntryBase, TcQueueEntryType
+
+# Start bit, 8 data bits and stop bit of an UART frame
+DEFAULT_BITS_PER_BYTE = 10
+
+
+@dataclass
+class ShaperLimit:
+    """Rate limit of a token bucket.
+
+    :var rate: Sustained rate in bytes per second.
+    :var burst: Bucket size in bytes which may be sent at once after an idle period.
+    """
+
+    rate: float
+    burst: int
+
+    @classmethod
+    def from_baud_rate(
+        cls, baud_rate: int, burst: int, bits_per_byte: int = DEFAULT_BITS_PER_BYTE
+    ) -> "ShaperLimit":
+        return cls(rate=baud_rate / bits_per_byte, burst=burst)
+
+
+class TokenBucket:
+    """Token bucket which holds up to ``burst`` bytes and is refilled with ``rate`` bytes per
+    second. A packet larger than the bucket can be sent when the bucket is full. The bucket
+    becomes negative then, which delays the following packets accordingly."""
+
+    def __init__(self, limit: ShaperLimit):
+        if limit.rate <= 0 or limit.burst <= 0:
+            raise ValueError("rate and burst need to be positive")
+        self.limit = limit
+        self.tokens = float(limit.burst)
+        self.__last_refill = time.monotonic()
+
+    def refill(self, now: float):
+        elapsed = now - self.__last_refill
+        self.__last_refill = now
+        self.tokens = min(float(self.limit.burst), self.tokens + elapsed * self.limit.rate)
+
+    def delay(self, num_bytes: int) -> float:
+        """Time in seconds until the given number of bytes may be sent."""
+        missing = min(num_bytes, self.limit.burst) - self.tokens
+        if missing <= 0:
+            return 0.0
+        return missing / self.limit.rate
+
+    def consume(self, num_bytes: int):
+        self.tokens -= num_bytes
+
+
+@dataclass
+class ShaperStatistics:
+    """Statistics of the :py:class:`TcShaper`.
+
+    :var packets_sent: Number of packets which passed the shaper.
+    :var bytes_sent: Number of bytes which passed the shaper, including the per-packet overhead.
+    :var packets_delayed: Number of packets which had to wait for the shaper.
+    :var total_queue_delay: Sum of the time the packets waited for the shaper.
+    :var max_queue_delay: Longest time a packet waited for the shaper.
+    """
+
+    packets_sent: int = 0
+    bytes_sent: int = 0
+    packets_delayed: int = 0
+    total_queue_delay: timedelta = timedelta()
+    max_queue_delay: timedelta = timedelta()
+    first_send_time: Optional[float] = None
+    last_send_time: Optional[float] = None
+
+    @property
+    def mean_queue_delay(self) -> timedelta:
+        if self.packets_sent == 0:
+            return timedelta()
+        return self.total_queue_delay / self.packets_sent
+
+    @property
+    def throughput(self) -> float:
+        """Average throughput in bytes per second between the first and the last packet."""
+        if self.first_send_time is None or self.last_send_time == self.first_send_time:
+            return 0.0
+        return self.bytes_sent / (self.last_send_time - self.first_send_time)
+
+
+class TcShaper:
+    """Token bucket shaper which limits the TC uplink to the capacity of the link, for example
+    the baud rate of a radio, instead of a fixed delay between telecommands.
+
+    Each packet needs to fit into the global bucket and, if one is configured for the APID of
+    the packet, into the bucket of its APID. The shaper does not buffer packets. The
+    :py:class:`tmtccmd.tmtc.ccsds_seq_sender.SequentialCcsdsSender` keeps a TC in its queue
+    until :py:meth:`delay` returns zero and includes the delay in the longest remaining delay
+    of its result, so the backend sleeps until the TC may be sent.
+    """
+
+    def __init__(
+        self,
+        limit: ShaperLimit,
+        apid_limits: Optional[Dict[int, ShaperLimit]] = None,
+        per_packet_overhead: int = 0,
+    ):
+        """
+        :param limit: Limit of the whole uplink.
+        :param apid_limits: Optional limits for specific APIDs.
+        :param per_packet_overhead: Bytes added to each packet by the lower layers, for example
+            the frame header or the encoding overhead.
+        """
+        self.bucket = TokenBucket(limit)
+        self.apid_buckets: Dict[int, TokenBucket] = dict()
+        if apid_limits is not None:
+            for apid, apid_limit in apid_limits.items():
+                self.apid_buckets[apid] = TokenBucket(apid_limit)
+        self.per_packet_overhead = per_packet_overhead
+        self.stats = ShaperStatistics()
+        self.__wait_start: Optional[float] = None
+
+    def delay(self, packet_len: int, apid: Optional[int] = None) -> timedelta:
+        """Time until a packet with the given length may be sent. A non-zero delay starts the
+        measurement of the queueing delay of the packet."""
+        now = time.monotonic()
+        num_bytes = packet_len + self.per_packet_overhead
+        self.bucket.refill(now)
+        delay = self.bucket.delay(num_bytes)
+        apid_bucket = self.apid_buckets.get(apid)
+        if apid_bucket is not None:
+            apid_bucket.refill(now)
+            delay = max(delay, apid_bucket.delay(num_bytes))
+        if delay > 0 and self.__wait_start is None:
+            self.__wait_start = now
+        return timedelta(seconds=delay)
+
+    def consume(self, packet_len: int, apid: Optional[int] = None):
+        """Take the tokens for a sent packet from the buckets."""
+        now = time.monotonic()
+        num_bytes = packet_len + self.per_packet_overhead
+        self.bucket.consume(num_bytes)
+        apid_bucket = self.apid_buckets.get(apid)
+        if apid_bucket is not None:
+            apid_bucket.consume(num_bytes)
+        stats = self.stats
+        stats.packets_sent += 1
+        stats.bytes_sent += num_bytes
+        if stats.first_send_time is None:
+            stats.first_send_time = now
+        stats.last_send_time = now
+        if self.__wait_start is not None:
+            queue_delay = timedelta(seconds=now - self.__wait_start)
+            self.__wait_start = None
+            stats.packets_delayed += 1
+            stats.total_queue_delay += queue_delay
+            if queue_delay > stats.max_queue_delay:
+                stats.max_queue_delay = queue_delay
+
+    def delay_for_entry(self, entry: TcQueueEntryBase) -> timedelta:
+        packet_len, apid = tc_entry_len_and_apid(entry)
+        return self.delay(packet_len, apid)
+
+    def consume_for_entry(self, entry: TcQueueEntryBase):
+        packet_len, apid = tc_entry_len_and_apid(entry)
+        self.consume(packet_len, apid)
+
+
+def tc_entry_len_and_apid(entry: TcQueueEntryBase) -> Tuple[int, Optional[int]]:
+    """Packet length and APID of a TC queue entry. The APID is None for raw TCs which are too
+    short for a space packet header."""
+    if entry.etype == TcQueueEntryType.PUS_TC:
+        return entry.pus_tc.packet_len, entry.pus_tc.apid
+    if entry.etype == TcQueueEntryType.CCSDS_TC:
+        return entry.space_packet.sp_header.packet_len, entry.space_packet.apid
+    if entry.etype == TcQueueEntryType.RAW_TC:
+        tc = entry.tc
+        if len(tc) < 6:
+            return len(tc), None
+        return len(tc), ((tc[0] << 8) | tc[1]) & 0x7FF
+    raise ValueError(f"queue entry {entry!r} is not a TC")
@@ -0,0 +1,300 @@
+"""Subscriptions to subsets of the TM, for example for an archive writer, a GUI or an alarm
+engine. The declarative filters of all subscriptions are compiled into one small decision tree,
+so each packet is tested once and then passed to all matching subscribers."""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Collection, Dict, List, Optional, Sequence, Tuple, Union
+
+from spacepackets.ccsds.time import CdsShortTimestamp
+
+_LOGGER = logging.getLogger(__name__)
+
+# Offset of the source data in a PUS C TM packet without the timestamp.
+PUS_TM_SOURCE_DATA_OFFSET = 13
+SEQ_COUNT_MASK = 0x3FFF
+
+TmSubscriber = Callable[[bytes], Any]
+
+
+@dataclass(frozen=True)
+class FieldMatch:
+    """Matches if the raw packet contains the given bytes at the given offset.
+
+    :var offset: Byte offset in the raw packet.
+    :var value: Expected bytes.
+    """
+
+    offset: int
+    value: bytes
+
+    @classmethod
+    def from_int(cls, offset: int, value: int, width: int, byteorder: str = "big") -> "FieldMatch":
+        return cls(offset=offset, value=value.to_bytes(width, byteorder))
+
+    @classmethod
+    def source_data_field(
+        cls,
+        offset: int,
+        value: int,
+        width: int,
+        timestamp_len: int = CdsShortTimestamp.TIMESTAMP_SIZE,
+    ) -> "FieldMatch":
+        """Field at an offset in the source data of a PUS C TM packet, for example the object ID
+        of a housekeeping packet at offset 0."""
+        return cls.from_int(PUS_TM_SOURCE_DATA_OFFSET + timestamp_len + offset, value, width)
+
+
+@dataclass
+class TmFilter:
+    """Declarative TM filter. All given conditions need to match. A condition which is None
+    matches all packets.
+
+    :var apids: Matching APIDs.
+    :var services: Matching PUS services. Packets without a PUS secondary header do not match if
+        services are given.
+    :var subservices: Matching PUS subservices. Same as the services otherwise.
+    :var fields: Byte fields which need to match, for example object IDs.
+    :var seq_count_range: Inclusive range of matching sequence counts. The range wraps around
+        if the first count is larger than the last count.
+    """
+
+    apids: Optional[Collection[int]] = None
+    services: Optional[Collection[int]] = None
+    subservices: Optional[Collection[int]] = None
+    fields: Sequence[FieldMatch] = field(default_factory=tuple)
+    seq_count_range: Optional[Tuple[int, int]] = None
+
+
+class _Entry:
+    """Filter conditions which are checked after the decision tree."""
+
+    __slots__ = ("sub_id", "fields", "seq_count_range")
+
+    def __init__(self, sub_id: int, fields: Sequence[FieldMatch], seq_count_range):
+        self.sub_id = sub_id
+        self.fields = fields
+        self.seq_count_range = seq_count_range
+
+    def check(self, packet: bytes) -> bool:
+        for field_match in self.fields:
+            end = field_match.offset + len(field_match.value)
+            if packet[field_match.offset : end] != field_match.value:
+                return False
+        if self.seq_count_range is not None:
+            seq_count = ((packet[2] << 8) | packet[3]) & SEQ_COUNT_MASK
+            first, last = self.seq_count_range
+            if first <= last:
+                return first <= seq_count <= last
+            return seq_count >= first or seq_count <= last
+        return True
+
+
+class _Leaf:
+    __slots__ = ("always", "field_groups", "entries")
+
+    def __init__(self, entries: List[_Entry]):
+        # Subscriptions without further conditions
+        self.always: Tuple[int, ...] = tuple(
+            sorted(
+                {
+                    entry.sub_id
+                    for entry in entries
+                    if not entry.fields and entry.seq_count_range is None
+                }
+            )
+        )
+        # Entries grouped by their first field, so each distinct field is only read once and
+        # looked up in a dictionary.
+        groups: Dict[Tuple[int, int], Dict[bytes, List[_Entry]]] = dict()
+        self.entries: List[_Entry] = []
+        for entry in entries:
+            if entry.fields:
+                first = entry.fields[0]
+                values = groups.setdefault((first.offset, len(first.value)), dict())
+                values.setdefault(first.value, []).append(
+                    _Entry(entry.sub_id, entry.fields[1:], entry.seq_count_range)
+                )
+            elif entry.seq_count_range is not None:
+                self.entries.append(entry)
+        self.field_groups = [
+            (offset, offset + width, values) for (offset, width), values in groups.items()
+        ]
+
+    def match(self, packet: bytes) -> List[int]:
+        matched = list(self.always)
+        for start, end, values in self.field_groups:
+            entries = values.get(bytes(packet[start:end]))
+            if entries is not None:
+                for entry in entries:
+                    if entry.check(packet):
+                        matched.append(entry.sub_id)
+        for entry in self.entries:
+            if entry.check(packet):
+                matched.append(entry.sub_id)
+        return matched
+
+
+# A node maps the field value of its level to a child node and has a default child for all
+# other values.
+_NodeT = Tuple[Dict[int, Any], Any]
+
+
+def _matches(keys: Optional[Collection[int]], key: int) -> bool:
+    return keys is None or key in keys
+
+
+def _compile_level(
+    candidates: List[Tuple[int, TmFilter]], levels: Sequence[str]
+) -> Optional[Union[_NodeT, _Leaf]]:
+    if not candidates:
+        return None
+    if not levels:
+        return _Leaf(
+            [
+                _Entry(sub_id, tuple(tm_filter.fields), tm_filter.seq_count_range)
+                for sub_id, tm_filter in candidates
+            ]
+        )
+    attr = levels[0]
+    keys = set()
+    for _, tm_filter in candidates:
+        level_keys = getattr(tm_filter, attr)
+        if level_keys is not None:
+            keys.update(level_keys)
+    children = dict()
+    for key in keys:
+        child = _compile_level(
+            [c for c in candidates if _matches(getattr(c[1], attr), key)], levels[1:]
+        )
+        if child is not None:
+            children[key] = child
+    default = _compile_level([c for c in candidates if getattr(c[1], attr) is None], levels[1:])
+    return children, default
+
+
+class TmSubscriptions:
+    """Set of TM subscriptions.
+
+    Each subscription consists of a subscriber callback and one or more :py:class:`TmFilter`s.
+    The subscriber is called once with the raw packet for each packet which matches any of its
+    filters. The filters are compiled into a decision tree which branches on the APID, the
+    service and the subservice with one dictionary lookup per level. The leaves group the
+    remaining field conditions by their offset, so each distinct field is read once per packet.
+
+    Subscribing and unsubscribing re-compiles the tree, which is then swapped in atomically, so
+    it is safe to change the subscriptions while another thread dispatches packets. Subscribers
+    are called in the order of their subscription. Exceptions raised by subscribers are logged
+    and do not affect the other subscribers.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__next_id = 0
+        self.__subscriptions: Dict[int, Tuple[TmSubscriber, Tuple[TmFilter, ...]]] = dict()
+        # Decision tree, subscribers by ID and whether a subscription has multiple filters,
+        # which might match the same packet. Swapped as a whole on changes.
+        self.__compiled: Tuple[Optional[_NodeT], Dict[int, TmSubscriber], bool] = (
+            None,
+            dict(),
+            False,
+        )
+
+    @property
+    def active(self) -> bool:
+        """True if there is at least one subscription."""
+        return self.__compiled[0] is not None
+
+    def __len__(self) -> int:
+        return len(self.__subscriptions)
+
+    def subscribe(
+        self, subscriber: TmSubscriber, filters: Union[TmFilter, Sequence[TmFilter]]
+    ) -> int:
+        """Add a subscription.
+
+        :param subscriber: Called with each matching raw packet.
+        :param filters: The subscriber receives all packets which match any of these filters.
+        :return: Subscription ID which can be used to unsubscribe.
+        """
+        if isinstance(filters, TmFilter):
+            filters = (filters,)
+        filters = tuple(filters)
+        if not filters:
+            raise ValueError("at least one filter is required")
+        with self.__lock:
+            sub_id = self.__next_id
+            self.__next_id += 1
+            self.__subscriptions[sub_id] = (subscriber, filters)
+            self.__compile()
+        return sub_id
+
+    def unsubscribe(self, sub_id: int) -> bool:
+        """:return: False if the subscription does not exist."""
+        with self.__lock:
+            if self.__subscriptions.pop(sub_id, None) is None:
+                return False
+            self.__compile()
+        return True
+
+    def match(self, packet: bytes) -> List[int]:
+        """IDs of all subscriptions which match the packet, in the order of their subscription."""
+        return self.__match_compiled(self.__compiled, packet)
+
+    def dispatch(self, packet: bytes) -> int:
+        """Pass the packet to all matching subscribers.
+
+        :return: Number of subscribers which received the packet.
+        """
+        compiled = self.__compiled
+        matched = self.__match_compiled(compiled, packet)
+        subscribers = compiled[1]
+        for sub_id in matched:
+            try:
+                subscribers[sub_id](packet)
+            except Exception:
+                _LOGGER.exception(f"TM subscriber with subscription ID {sub_id} failed")
+        return len(matched)
+
+    @classmethod
+    def __match_compiled(cls, compiled, packet: bytes) -> List[int]:
+        tree, _, needs_dedup = compiled
+        if tree is None or len(packet) < 6:
+            return []
+        matched = cls.__match_tree(tree, packet)
+        if len(matched) > 1:
+            if needs_dedup:
+                return sorted(set(matched))
+            matched.sort()
+        return matched
+
+    @staticmethod
+    def __match_tree(tree: _NodeT, packet: bytes) -> List[int]:
+        children, default = tree
+        service_node = children.get(((packet[0] << 8) | packet[1]) & 0x7FF, default)
+        if service_node is None:
+            return []
+        is_pus = len(packet) >= 9 and packet[0] & 0x08
+        children, default = service_node
+        subservice_node = children.get(packet[7], default) if is_pus else default
+        if subservice_node is None:
+            return []
+        children, default = subservice_node
+        leaf = children.get(packet[8], default) if is_pus else default
+        if leaf is None:
+            return []
+        return leaf.match(packet)
+
+    def __compile(self):
+        # Needs to be called with the lock held.
+        candidates = [
+            (sub_id, tm_filter)
+            for sub_id, (_, filters) in self.__subscriptions.items()
+            for tm_filter in filters
+        ]
+        self.__compiled = (
+            _compile_level(candidates, ("apids", "services", "subservices")),
+            {sub_id: subscriber for sub_id, (subscriber, _) in self.__subscriptions.items()},
+            any(len(filters) > 1 for _, filters in self.__subscriptions.values()),
+        )
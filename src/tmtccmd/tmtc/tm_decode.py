@@ -0,0 +1,286 @@
+"""Optional multiprocessing stage which decodes TM in worker processes. Decoding PUS TM is CPU
+bound, so decoding in threads does not scale because of the GIL."""
+
+import logging
+import os
+from array import array
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from spacepackets.ccsds.time import CdsShortTimestamp
+from spacepackets.ecss import PusTelemetry
+
+_LOGGER = logging.getLogger(__name__)
+
+TmDecoder = Callable[[bytes], Any]
+DecodedTmList = List[Tuple[bytes, Any]]
+
+
+@dataclass
+class PusTmRecord:
+    """Compact and picklable record of a decoded PUS TM packet, which is created by
+    :py:func:`decode_pus_tm`."""
+
+    apid: int
+    seq_count: int
+    service: int
+    subservice: int
+    message_counter: int
+    timestamp: bytes
+    source_data: bytes
+
+
+@dataclass
+class TmDecodeError:
+    """Passed to the handlers instead of a record if the decoder raised an exception."""
+
+    error: str
+
+
+def decode_pus_tm(
+    packet: bytes, timestamp_len: int = CdsShortTimestamp.TIMESTAMP_SIZE
+) -> PusTmRecord:
+    """Default decoder of the :py:class:`TmDecodeStage`. Use :py:func:`functools.partial` to
+    configure a different timestamp length."""
+    pus_tm = PusTelemetry.unpack(packet, timestamp_len)
+    return PusTmRecord(
+        apid=pus_tm.apid,
+        seq_count=pus_tm.seq_count,
+        service=pus_tm.service,
+        subservice=pus_tm.subservice,
+        message_counter=pus_tm.pus_tm_sec_header.message_counter,
+        timestamp=pus_tm.timestamp,
+        source_data=pus_tm.source_data,
+    )
+
+
+@dataclass
+class TmDecodeCfg:
+    """Configuration of the :py:class:`TmDecodeStage`.
+
+    :var num_workers: Number of worker processes. None means the number of CPUs.
+    :var batch_size: Maximum number of packets shipped to a worker at once.
+    :var max_batches_in_flight: Maximum number of batches which are queued for or being decoded
+        by the workers. :py:meth:`TmDecodeStage.submit` blocks until the oldest batch is decoded
+        if this number is reached. None means twice the number of workers.
+    :var min_segment_size: Minimum size of the shared memory segments which transport the
+        batches to the workers.
+    :var mp_context: Optional start method of the worker processes, for example "spawn".
+    :var collect_timeout: Maximum time in seconds the :py:class:`tmtccmd.tmtc.CcsdsTmListener`
+        waits for the submitted packets to be decoded in each operation call. Without waiting,
+        the last packets of a burst would only be handled by the next operation call.
+    """
+
+    num_workers: Optional[int] = None
+    batch_size: int = 256
+    max_batches_in_flight: Optional[int] = None
+    min_segment_size: int = 256 * 1024
+    mp_context: Optional[str] = None
+    collect_timeout: float = 0.1
+
+
+@dataclass
+class TmDecodeStatistics:
+    """Statistics of the :py:class:`TmDecodeStage`.
+
+    :var packets_decoded: Number of packets which were decoded and polled.
+    :var batches_decoded: Number of batches which were decoded and polled.
+    :var decode_errors: Number of packets for which the decoder raised an exception.
+    :var max_batches_in_flight: Maximum number of batches which were in flight at the same time.
+    """
+
+    packets_decoded: int = 0
+    batches_decoded: int = 0
+    decode_errors: int = 0
+    max_batches_in_flight: int = 0
+
+
+# State of the worker processes
+_worker_decoder: Optional[TmDecoder] = None
+_worker_segments: Dict[str, SharedMemory] = dict()
+
+
+def _init_worker(decoder: TmDecoder):
+    global _worker_decoder
+    _worker_decoder = decoder
+
+
+def _decode_batch(
+    segment_name: str, raw_lengths: bytes, live_segments: Tuple[str, ...]
+) -> List[Any]:
+    # Drop the mappings of segments which were replaced by the parent process. Otherwise, they
+    # stay mapped until the worker exits.
+    for name in [name for name in _worker_segments if name not in live_segments]:
+        _worker_segments.pop(name).close()
+    segment = _worker_segments.get(segment_name)
+    if segment is None:
+        segment = SharedMemory(name=segment_name)
+        _worker_segments[segment_name] = segment
+    lengths = array("I")
+    lengths.frombytes(raw_lengths)
+    buf = segment.buf
+    decoder = _worker_decoder
+    records = []
+    offset = 0
+    for packet_len in lengths:
+        packet = bytes(buf[offset : offset + packet_len])
+        offset += packet_len
+        try:
+            records.append(decoder(packet))
+        except Exception as e:
+            records.append(TmDecodeError(repr(e)))
+    return records
+
+
+class _Batch:
+    def __init__(self, packets: List[bytes], segment: SharedMemory, future: Future):
+        self.packets = packets
+        self.segment = segment
+        self.future = future
+
+
+class TmDecodeStage:
+    """Decodes TM in a pool of worker processes.
+
+    The submitted packets are split into batches. Each batch is copied into a shared memory
+    segment, so only the segment name and the packet lengths need to be pickled, and decoded by
+    one of the workers with the decoder function. The decoder needs to be picklable, which
+    means it needs to be a module level function or a :py:func:`functools.partial` of one, and
+    it needs to return picklable records. The results are merged in submission order, so
+    :py:meth:`poll` always returns the packets in arrival order, even if a later batch was
+    decoded first.
+
+    The stage can be used by the :py:class:`tmtccmd.tmtc.CcsdsTmListener`, which passes the
+    records to :py:meth:`tmtccmd.tmtc.CcsdsTmHandler.handle_decoded_packet`.
+    """
+
+    def __init__(self, decoder: TmDecoder = decode_pus_tm, cfg: Optional[TmDecodeCfg] = None):
+        if cfg is None:
+            cfg = TmDecodeCfg()
+        if cfg.batch_size <= 0:
+            raise ValueError("batch size needs to be positive")
+        self.cfg = cfg
+        self.decoder = decoder
+        self.num_workers = cfg.num_workers if cfg.num_workers is not None else os.cpu_count()
+        if cfg.max_batches_in_flight is not None:
+            self.max_batches_in_flight = cfg.max_batches_in_flight
+        else:
+            self.max_batches_in_flight = 2 * self.num_workers
+        self.stats = TmDecodeStatistics()
+        self.__executor: Optional[ProcessPoolExecutor] = None
+        self.__in_flight: Deque[_Batch] = deque()
+        # Batches which were collected by submit calls to make room for new batches.
+        self.__ready: DecodedTmList = []
+        self.__free_segments: List[SharedMemory] = []
+        # Names of all segments which were not replaced yet.
+        self.__segment_names: Set[str] = set()
+
+    @property
+    def batches_in_flight(self) -> int:
+        return len(self.__in_flight)
+
+    def submit(self, packets: List[bytes]):
+        """Submit packets for decoding. Blocks if the maximum number of batches is in flight."""
+        batch_size = self.cfg.batch_size
+        for idx in range(0, len(packets), batch_size):
+            self.__submit_batch(packets[idx : idx + batch_size])
+
+    def poll(self, timeout: float = 0.0) -> DecodedTmList:
+        """Return the packets and records of all batches which are decoded, in arrival order.
+        Stops at the first batch which is still being decoded.
+
+        :param timeout: Maximum time in seconds to wait for the batches in flight.
+        """
+        if timeout > 0 and self.__in_flight:
+            wait([batch.future for batch in self.__in_flight], timeout)
+        decoded = self.__ready
+        self.__ready = []
+        while self.__in_flight and self.__in_flight[0].future.done():
+            self.__collect(self.__in_flight.popleft(), decoded)
+        return decoded
+
+    def flush(self) -> DecodedTmList:
+        """Wait until all batches are decoded and return all packets and records."""
+        decoded = self.__ready
+        self.__ready = []
+        while self.__in_flight:
+            self.__collect(self.__in_flight.popleft(), decoded)
+        return decoded
+
+    def decode(self, packets: List[bytes]) -> List[Any]:
+        """Decode packets and wait for the records. All previously submitted packets are
+        decoded as well and need to be polled before."""
+        if self.__in_flight or self.__ready:
+            raise ValueError("there are submitted batches which were not polled")
+        self.submit(packets)
+        return [record for _, record in self.flush()]
+
+    def close(self):
+        """Stop the worker processes and release the shared memory. Batches which were not
+        polled are discarded."""
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=True, cancel_futures=True)
+            self.__executor = None
+        if self.__in_flight or self.__ready:
+            _LOGGER.warning("Discarding TM which was not polled")
+        self.__ready = []
+        segments = self.__free_segments + [batch.segment for batch in self.__in_flight]
+        self.__in_flight.clear()
+        self.__free_segments = []
+        self.__segment_names.clear()
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+
+    def __submit_batch(self, packets: List[bytes]):
+        if len(self.__in_flight) >= self.max_batches_in_flight:
+            self.__collect(self.__in_flight.popleft(), self.__ready)
+        if self.__executor is None:
+            self.__executor = ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=get_context(self.cfg.mp_context),
+                initializer=_init_worker,
+                initargs=(self.decoder,),
+            )
+        lengths = array("I", map(len, packets))
+        segment = self.__get_segment(sum(lengths))
+        buf = segment.buf
+        offset = 0
+        for packet in packets:
+            buf[offset : offset + len(packet)] = packet
+            offset += len(packet)
+        future = self.__executor.submit(
+            _decode_batch, segment.name, lengths.tobytes(), tuple(self.__segment_names)
+        )
+        self.__in_flight.append(_Batch(packets, segment, future))
+        if len(self.__in_flight) > self.stats.max_batches_in_flight:
+            self.stats.max_batches_in_flight = len(self.__in_flight)
+
+    def __get_segment(self, size: int) -> SharedMemory:
+        while self.__free_segments:
+            segment = self.__free_segments.pop()
+            if segment.size >= size:
+                return segment
+            # Too small, replaced by a larger segment.
+            self.__segment_names.discard(segment.name)
+            segment.close()
+            segment.unlink()
+        segment = SharedMemory(create=True, size=max(size, self.cfg.min_segment_size))
+        self.__segment_names.add(segment.name)
+        return segment
+
+    def __collect(self, batch: _Batch, decoded: DecodedTmList):
+        try:
+            records = batch.future.result()
+        finally:
+            self.__free_segments.append(batch.segment)
+        for record in records:
+            if isinstance(record, TmDecodeError):
+                self.stats.decode_errors += 1
+        self.stats.packets_decoded += len(records)
+        self.stats.batches_decoded += 1
+        decoded.extend(zip(batch.packets, records))
@@ -0,0 +1,202 @@
+"""Pipeline which handles TM in a thread pool with one ordered queue per APID, so a slow
+APID handler does not stall the reception of the other APIDs"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from tmtccmd.com.packet_queue import BoundedPacketQueue, OverflowPolicy, PacketQueueStatistics
+from tmtccmd.tmtc.common import CcsdsTmHandler
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class TmPipelineCfg:
+    """Configuration of the :py:class:`TmPipeline`.
+
+    :var num_workers: Number of worker threads. Packets with different APIDs are handled in
+        parallel by up to this number of threads.
+    :var max_queue_packets: Maximum number of packets stored in the queue of each APID. None
+        means no bound.
+    :var max_queue_bytes: Maximum number of bytes stored in the queue of each APID. None means
+        no bound.
+    :var overflow_policy: Policy applied when the queue of an APID is full. The default
+        :py:attr:`tmtccmd.com.packet_queue.OverflowPolicy.BLOCK` policy blocks the receive
+        stage until the APID handler caught up, which also backs up the reception queue of the
+        communication interface.
+    """
+
+    num_workers: int = 4
+    max_queue_packets: Optional[int] = 1024
+    max_queue_bytes: Optional[int] = None
+    overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK
+
+
+@dataclass
+class TmPipelineStatistics:
+    """Statistics for one APID of the :py:class:`TmPipeline`.
+
+    :var packets_submitted: Number of packets passed to the pipeline by the receive stage.
+    :var packets_handled: Number of packets passed to the TM handler.
+    :var batches_handled: Number of calls of the TM handler.
+    :var handler_errors: Number of TM handler calls which raised an exception.
+    :var blocked_time: Time in seconds the receive stage waited for space in the queue.
+    :var queue: Statistics of the queue, which includes the high-water mark and the number of
+        dropped packets.
+    """
+
+    packets_submitted: int = 0
+    packets_handled: int = 0
+    batches_handled: int = 0
+    handler_errors: int = 0
+    blocked_time: float = 0.0
+    queue: PacketQueueStatistics = field(default_factory=PacketQueueStatistics)
+
+
+class _ApidState:
+    def __init__(self, cfg: TmPipelineCfg):
+        self.queue = BoundedPacketQueue(
+            cfg.max_queue_packets, cfg.max_queue_bytes, cfg.overflow_policy
+        )
+        self.stats = TmPipelineStatistics(queue=self.queue.stats)
+        # Set while a worker task for this APID is submitted or running. There is at most one
+        # task per APID, which preserves the order of the packets of an APID.
+        self.scheduled = False
+
+
+class TmPipeline:
+    """Receive stage and worker pool for the TM handling.
+
+    The receive stage, usually the :py:class:`tmtccmd.tmtc.CcsdsTmListener`, submits the
+    packets to a bounded queue per APID with :py:meth:`submit`. A thread pool serves the queues.
+    Each worker task takes all queued packets of one APID and passes them to
+    :py:meth:`tmtccmd.tmtc.CcsdsTmHandler.handle_packet_batch`. At most one task runs per APID,
+    so the packets of an APID are handled in arrival order while different APIDs are handled in
+    parallel. A task which handled packets re-submits itself instead of looping, so busy APIDs
+    can not starve the other APIDs.
+
+    The handlers are called from the worker threads. Handlers of different APIDs, and the
+    generic handler for different unknown APIDs, may run concurrently.
+
+    The worker pool is started with the first submitted packets and stopped with
+    :py:meth:`close`. The pipeline can be used again after it was closed.
+    """
+
+    def __init__(self, tm_handler: CcsdsTmHandler, cfg: Optional[TmPipelineCfg] = None):
+        if cfg is None:
+            cfg = TmPipelineCfg()
+        if cfg.num_workers <= 0:
+            raise ValueError("number of workers needs to be positive")
+        self.cfg = cfg
+        self.__tm_handler = tm_handler
+        self.__cond = threading.Condition()
+        self.__apids: Dict[int, _ApidState] = dict()
+        self.__executor: Optional[ThreadPoolExecutor] = None
+        self.__num_scheduled = 0
+
+    @property
+    def stats(self) -> Dict[int, TmPipelineStatistics]:
+        """Statistics per APID."""
+        with self.__cond:
+            return {apid: state.stats for apid, state in self.__apids.items()}
+
+    def queue_depths(self) -> Dict[int, int]:
+        """Current number of queued packets per APID."""
+        with self.__cond:
+            return {apid: len(state.queue) for apid, state in self.__apids.items()}
+
+    @property
+    def queue_depth(self) -> int:
+        """Current number of queued packets of all APIDs."""
+        return sum(self.queue_depths().values())
+
+    @property
+    def is_idle(self) -> bool:
+        """True if no packets are queued or handled."""
+        with self.__cond:
+            return self.__num_scheduled == 0
+
+    def submit(self, apid: int, packets: List[bytes]):
+        """Submit packets of an APID in arrival order. Depending on the overflow policy, this
+        blocks until there is space in the queue of the APID."""
+        with self.__cond:
+            state = self.__apids.get(apid)
+            if state is None:
+                state = _ApidState(self.cfg)
+                self.__apids[apid] = state
+        state.stats.packets_submitted += len(packets)
+        queue = state.queue
+        for packet in packets:
+            if queue.put(packet):
+                continue
+            block_start = time.monotonic()
+            with self.__cond:
+                # The queue is full, so the worker needs to be running before waiting.
+                self.__schedule(apid, state)
+                while not queue.put(packet):
+                    self.__cond.wait()
+            state.stats.blocked_time += time.monotonic() - block_start
+        with self.__cond:
+            self.__schedule(apid, state)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all queued packets were handled.
+
+        :param timeout: Timeout in seconds. None means no timeout.
+        :return: True if the pipeline is idle, False if the timeout expired.
+        """
+        with self.__cond:
+            return self.__cond.wait_for(lambda: self.__num_scheduled == 0, timeout)
+
+    def close(self, drain: bool = True):
+        """Stop the worker pool.
+
+        :param drain: Handle all queued packets before stopping. Otherwise, the queued packets
+            are dropped and only the packets which are already being handled are finished.
+        """
+        if not drain:
+            with self.__cond:
+                for state in self.__apids.values():
+                    state.queue.clear()
+                self.__cond.notify_all()
+        self.flush()
+        with self.__cond:
+            executor = self.__executor
+            self.__executor = None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def __schedule(self, apid: int, state: _ApidState):
+        # Needs to be called with the condition lock held.
+        if state.scheduled or len(state.queue) == 0:
+            return
+        state.scheduled = True
+        self.__num_scheduled += 1
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(
+                max_workers=self.cfg.num_workers, thread_name_prefix="tm_pipeline"
+            )
+        self.__executor.submit(self.__handle_queue, apid, state)
+
+    def __handle_queue(self, apid: int, state: _ApidState):
+        packets = state.queue.pop_all()
+        if packets:
+            with self.__cond:
+                self.__cond.notify_all()
+            try:
+                self.__tm_handler.handle_packet_batch(apid, packets)
+            except Exception:
+                state.stats.handler_errors += 1
+                _LOGGER.exception(f"TM handler for APID {apid} raised an exception")
+            state.stats.packets_handled += len(packets)
+            state.stats.batches_handled += 1
+        with self.__cond:
+            state.scheduled = False
+            self.__num_scheduled -= 1
+            # Packets which were submitted while the handler was running.
+            self.__schedule(apid, state)
+            self.__cond.notify_all()
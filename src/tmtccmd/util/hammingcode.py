@@ -5,7 +5,9 @@ They can be used to identify up to two bit errors and correct one bit error per
 """
 
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
+from typing import Optional, Union
 
 # Translated from ATMEL C library.
 # /* ----------------------------------------------------------------------------
@@ -304,6 +306,200 @@ def hamming_verify_256(data: bytearray, original_hamming_code: bytearray) -> Ham
         return HammingReturnCodes.ERROR_MULTI_BIT
 
 
+# Default number of bytes processed by one worker of the process pool. Needs to be a multiple
+# of 256.
+DEFAULT_POOL_CHUNK_SIZE = 4 * 1024 * 1024
+_np_tables = None
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("the numpy package is required for the vectorised hamming code functions")
+    return numpy
+
+
+def _interleave(odd_code: int, even_code: int, mask: int) -> int:
+    code = 0
+    for _ in range(4):
+        code <<= 2
+        if odd_code & mask:
+            code |= 2
+        if even_code & mask:
+            code |= 1
+        mask >>= 1
+    return code ^ 0xFF
+
+
+def _get_np_tables():
+    """Lookup tables for the vectorised functions, built on first use."""
+    global _np_tables
+    if _np_tables is None:
+        np = _import_numpy()
+        popcount = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+        # Indexed with the odd line code nibble in the upper and the even line code nibble in
+        # the lower four bits.
+        line_table = np.array(
+            [_interleave(idx >> 4, idx & 0x0F, 0x08) for idx in range(256)], dtype=np.uint8
+        )
+        column_table = np.zeros(256, dtype=np.uint8)
+        for column_sum in range(256):
+            odd_column_code = 0
+            even_column_code = 0
+            for bit in range(8):
+                if column_sum & (1 << bit):
+                    odd_column_code ^= bit
+                    even_column_code ^= 7 - bit
+            column_table[column_sum] = _interleave(odd_column_code, even_column_code, 0x04)
+        _np_tables = (
+            np,
+            popcount,
+            popcount & 1,
+            line_table,
+            column_table,
+            np.arange(256, dtype=np.uint8),
+        )
+    return _np_tables
+
+
+def _compute_codes_np(data: Union[bytes, bytearray, memoryview]):
+    """Codes of all 256 byte blocks of the data as a NumPy array with the shape (blocks, 3)."""
+    np, _, parity, line_table, column_table, indexes = _get_np_tables()
+    blocks = np.frombuffer(data, dtype=np.uint8).reshape(-1, 256)
+    byte_parity = parity[blocks]
+    # XOR of the indexes of all bytes with odd parity. The even line code is the XOR of the
+    # inverted indexes, which differs by 0xFF if the number of odd parity bytes is odd.
+    odd_line_code = np.bitwise_xor.reduce(byte_parity * indexes, axis=1)
+    even_line_code = odd_line_code ^ (
+        (np.count_nonzero(byte_parity, axis=1) & 1).astype(np.uint8) * 0xFF
+    )
+    column_sum = np.bitwise_xor.reduce(blocks, axis=1)
+    codes = np.empty((blocks.shape[0], 3), dtype=np.uint8)
+    codes[:, 0] = line_table[(odd_line_code & 0xF0) | (even_line_code >> 4)]
+    codes[:, 1] = line_table[((odd_line_code & 0x0F) << 4) | (even_line_code & 0x0F)]
+    codes[:, 2] = column_table[column_sum]
+    return codes
+
+
+def _compute_chunk_np(data: bytes) -> bytes:
+    return _compute_codes_np(data).tobytes()
+
+
+def hamming_compute_256x_np(
+    data: Union[bytes, bytearray, memoryview],
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_POOL_CHUNK_SIZE,
+) -> bytearray:
+    """Vectorised variant of :py:func:`hamming_compute_256x` which computes the codes of all
+    256 byte blocks at once with NumPy. Requires the numpy package. The result is identical to
+    the result of :py:func:`hamming_compute_256x`.
+
+    :param data: Data to compute code for. Should be a multiple of 256 bytes, pad data with 0
+        if necessary!
+    :param workers: Number of worker processes. If this is not None and the data is larger than
+        one chunk, the chunks are processed by a process pool. This is only worth the start-up
+        cost for data which is many megabytes large.
+    :param chunk_size: Number of bytes processed by one worker at once. Needs to be a multiple
+        of 256 bytes.
+    :raises ImportError: numpy is not installed.
+    :raises ValueError: Invalid chunk size.
+    :return: bytearray of hamming codes with the size (3 / 256 * size). Empty bytearray if input
+        is invalid.
+    """
+    if len(data) % 256 != 0:
+        _LOGGER.error(
+            "hamming_compute_256: Invalid input, datablock is not a multiple of " "256 bytes!"
+        )
+        return bytearray()
+    if chunk_size <= 0 or chunk_size % 256 != 0:
+        raise ValueError("chunk size needs to be a positive multiple of 256 bytes")
+    if workers is None or len(data) <= chunk_size:
+        return bytearray(_compute_chunk_np(data))
+    view = memoryview(data)
+    hamming_code = bytearray()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk_code in pool.map(
+            _compute_chunk_np,
+            (bytes(view[idx : idx + chunk_size]) for idx in range(0, len(data), chunk_size)),
+        ):
+            hamming_code.extend(chunk_code)
+    return hamming_code
+
+
+def hamming_verify_256x_np(
+    data: bytearray,
+    original_hamming_code: Union[bytes, bytearray],
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_POOL_CHUNK_SIZE,
+) -> HammingReturnCodes:
+    """Vectorised variant of :py:func:`hamming_verify_256x`. All blocks are checked at once,
+    then single bit errors are corrected in place. The return code and the corrected data are
+    identical to the results of :py:func:`hamming_verify_256x`, which means that blocks after
+    the first block with an ECC or multi bit error are not corrected.
+
+    :param data: Data to verify. Needs to be a bytearray for in-place corrections.
+    :param original_hamming_code: Original 3 byte hamming code for each 256 byte block.
+    :param workers: See :py:func:`hamming_compute_256x_np`.
+    :param chunk_size: See :py:func:`hamming_compute_256x_np`.
+    :raises ImportError: numpy is not installed.
+    :return: Error code of the first block with an ECC or multi bit error, otherwise the code
+        of the last block.
+    """
+    if len(data) % 256 != 0:
+        _LOGGER.error(
+            "hamming_compute_256: Invalid input, datablock is not a multiple of " "256 bytes!"
+        )
+        return HammingReturnCodes.OTHER_ERROR
+    if len(original_hamming_code) != len(data) / 256 * 3:
+        _LOGGER.error(
+            "hamming_compute_256: Invalid input, original hamming code does not have"
+            " thecorrect size!"
+        )
+        return HammingReturnCodes.OTHER_ERROR
+    if len(data) == 0:
+        return HammingReturnCodes.CODE_OKAY
+    np, popcount, *_ = _get_np_tables()
+    computed_code = hamming_compute_256x_np(data, workers, chunk_size)
+    correction_code = np.frombuffer(computed_code, dtype=np.uint8).reshape(-1, 3) ^ np.frombuffer(
+        original_hamming_code, dtype=np.uint8
+    ).reshape(-1, 3)
+    # Same classification as hamming_verify_256: 11 set bits are a single bit error and one
+    # set bit is an error in the hamming code itself.
+    bit_count = popcount[correction_code].sum(axis=1, dtype=np.uint32)
+    failed_blocks = np.flatnonzero((bit_count != 0) & (bit_count != 11))
+    end_block = len(bit_count) if len(failed_blocks) == 0 else failed_blocks[0]
+    single_bit_blocks = np.flatnonzero(bit_count[:end_block] == 11)
+    if len(single_bit_blocks) > 0:
+        code = correction_code[single_bit_blocks].astype(np.uint32)
+        byte_idx = (
+            (code[:, 0] & 0x80)
+            | ((code[:, 0] << 1) & 0x40)
+            | ((code[:, 0] << 2) & 0x20)
+            | ((code[:, 0] << 3) & 0x10)
+            | ((code[:, 1] >> 4) & 0x08)
+            | ((code[:, 1] >> 3) & 0x04)
+            | ((code[:, 1] >> 2) & 0x02)
+            | ((code[:, 1] >> 1) & 0x01)
+        )
+        bit_idx = (
+            ((code[:, 2] >> 5) & 0x04) | ((code[:, 2] >> 4) & 0x02) | ((code[:, 2] >> 3) & 0x01)
+        )
+        data_view = np.frombuffer(data, dtype=np.uint8)
+        data_view[single_bit_blocks * 256 + byte_idx] ^= (1 << bit_idx).astype(np.uint8)
+        for block in single_bit_blocks:
+            _LOGGER.info("Corrected single bit error at data block starting at" f" {block * 256}")
+    if end_block < len(bit_count):
+        if bit_count[end_block] == 1:
+            _LOGGER.info("Possible error in ECC code")
+            return HammingReturnCodes.ERROR_ECC
+        _LOGGER.info(f"Detected multi-bit error at data block starting at {end_block * 256}")
+        return HammingReturnCodes.ERROR_MULTI_BIT
+    if bit_count[-1] == 11:
+        return HammingReturnCodes.ERROR_SINGLE_BIT
+    return HammingReturnCodes.CODE_OKAY
+
+
 def hamming_test():
     """Algorithm was verified with this  simple test."""
     test_data = bytearray(256)
@@ -0,0 +1,108 @@
+import asyncio
+import socket
+from unittest import IsolatedAsyncioTestCase
+
+from spacepackets import PacketType
+from spacepackets.ccsds import PacketId
+from spacepackets.ecss import PusTelemetry
+
+from tmtccmd.com import SendError
+from tmtccmd.com.aio import SyncComAdapter
+from tmtccmd.com.aio.tcp import AsyncTcpSpacepacketsClient
+from tmtccmd.com.aio.udp import AsyncUdpClient
+from tmtccmd.com.tcpip_utils import EthAddr
+
+LOCALHOST = "127.0.0.1"
+
+
+class TestAsyncUdp(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.server.bind((LOCALHOST, 0))
+        self.server.settimeout(1.0)
+        self.com_if = AsyncUdpClient(
+            "udp", EthAddr.from_tuple(self.server.getsockname()), EthAddr(LOCALHOST, 0)
+        )
+
+    async def asyncTearDown(self) -> None:
+        await self.com_if.close()
+        self.server.close()
+
+    async def test_send_not_open(self):
+        with self.assertRaises(SendError):
+            self.com_if.send_nowait(bytes([1, 2, 3]))
+
+    async def test_send_recv(self):
+        await self.com_if.open()
+        self.assertTrue(self.com_if.is_open())
+        await self.com_if.send(bytes([1, 2, 3]))
+        data, client_addr = await asyncio.get_running_loop().run_in_executor(
+            None, self.server.recvfrom, 4096
+        )
+        self.assertEqual(data, bytes([1, 2, 3]))
+        self.assertEqual(await self.com_if.receive(0.01), [])
+        self.server.sendto(bytes([4, 5]), client_addr)
+        self.server.sendto(bytes([6]), client_addr)
+        self.assertGreaterEqual(await self.com_if.wait_for_data(1.0), 1)
+        await asyncio.sleep(0.05)
+        adapter = SyncComAdapter(self.com_if)
+        self.assertEqual(adapter.data_available(), 2)
+        self.assertEqual(adapter.receive(), [bytes([4, 5]), bytes([6])])
+
+
+class TestAsyncTcp(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.packet_id = PacketId(apid=0x22, sec_header_flag=True, ptype=PacketType.TM)
+        self.server_writer = None
+        self.server_reader = None
+        self.connected = asyncio.Event()
+
+        async def on_client(reader, writer):
+            self.server_reader = reader
+            self.server_writer = writer
+            self.connected.set()
+
+        self.server = await asyncio.start_server(on_client, LOCALHOST, 0)
+        self.com_if = AsyncTcpSpacepacketsClient(
+            "tcp", [self.packet_id], EthAddr.from_tuple(self.server.sockets[0].getsockname())
+        )
+
+    async def asyncTearDown(self) -> None:
+        await self.com_if.close()
+        if self.server_writer is not None:
+            self.server_writer.close()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def test_split_packets(self):
+        await self.com_if.open()
+        await asyncio.wait_for(self.connected.wait(), 1.0)
+        tm0 = PusTelemetry(service=17, subservice=2, apid=0x22, timestamp=bytes()).pack()
+        tm1 = PusTelemetry(
+            service=3, subservice=25, apid=0x22, timestamp=bytes(), source_data=bytes(8)
+        ).pack()
+        self.server_writer.write(tm0 + tm1[:5])
+        await self.server_writer.drain()
+        self.assertEqual(await self.com_if.receive(1.0), [tm0])
+        self.server_writer.write(tm1[5:])
+        await self.server_writer.drain()
+        self.assertEqual(await self.com_if.receive(1.0), [tm1])
+        await self.com_if.send(bytes([1, 2, 3]))
+        self.assertEqual(await self.server_reader.readexactly(3), bytes([1, 2, 3]))
+
+    async def test_closed_by_peer(self):
+        await self.com_if.open()
+        await asyncio.wait_for(self.connected.wait(), 1.0)
+        self.assertTrue(self.com_if.is_open())
+        self.server_writer.close()
+        await self.server_writer.wait_closed()
+        for _ in range(100):
+            if not self.com_if.is_open():
+                break
+            await asyncio.sleep(0.01)
+        self.assertFalse(self.com_if.is_open())
+        # Re-opening creates a new connection.
+        self.connected.clear()
+        await self.com_if.open()
+        await asyncio.wait_for(self.connected.wait(), 1.0)
+        self.assertTrue(self.com_if.is_open())
@@ -1,7 +1,11 @@
+import time
 from unittest import TestCase
 
-from spacepackets.ecss import PusTelecommand
-from tmtccmd.com.dummy import DummyComIF
+from spacepackets.ccsds import SpacePacketHeader
+from spacepackets.ccsds.time import CdsShortTimestamp
+from spacepackets.crc import CRC16_CCITT_FUNC
+from spacepackets.ecss import PusTelecommand, PusTm
+from tmtccmd.com.dummy import DummyComIF, TmGeneratorCfg, TmTrafficGenerator
 
 
 class TestDummy(TestCase):
@@ -19,3 +23,71 @@ class TestDummy(TestCase):
         replies = dummy_com_if.receive()
         # Full verification set (acceptance, start and completion) and ping reply
         self.assertEqual(len(replies), 4)
+
+
+class TestTmTrafficGenerator(TestCase):
+    def test_generated_packets_valid(self):
+        cfg = TmGeneratorCfg(packet_rate=None, apids=(0x02, 0x03), seed=0)
+        generator = TmTrafficGenerator(cfg)
+        packets = generator.generate(200)
+        self.assertEqual(len(packets), 200)
+        self.assertEqual(generator.packets_generated, 200)
+        services = set()
+        next_seq_counts = {0x02: 0, 0x03: 0}
+        for packet in packets:
+            self.assertIsInstance(packet, bytes)
+            tm = PusTm.unpack(packet, timestamp_len=CdsShortTimestamp.TIMESTAMP_SIZE)
+            services.add(tm.service)
+            self.assertEqual(tm.seq_count, next_seq_counts[tm.apid])
+            next_seq_counts[tm.apid] += 1
+        self.assertEqual(services, {1, 3, 5, 17, 20})
+
+    def test_seq_gaps_and_crc_errors(self):
+        cfg = TmGeneratorCfg(
+            packet_rate=None,
+            service_mix={17: 1.0},
+            seq_gap_probability=0.2,
+            crc_error_probability=0.2,
+            seed=1,
+        )
+        generator = TmTrafficGenerator(cfg)
+        packets = generator.generate(500)
+        self.assertGreater(generator.seq_gaps_generated, 0)
+        self.assertGreater(generator.crc_errors_generated, 0)
+        crc_errors = sum(1 for packet in packets if CRC16_CCITT_FUNC(packet) != 0)
+        self.assertEqual(crc_errors, generator.crc_errors_generated)
+        last_seq_count = SpacePacketHeader.unpack(packets[-1]).seq_count
+        self.assertEqual(last_seq_count, 499 + generator.seq_gaps_generated)
+
+    def test_size_distribution(self):
+        cfg = TmGeneratorCfg(
+            packet_rate=None, service_mix={3: 1.0}, source_data_sizes=(10, 100), seed=2
+        )
+        packets = TmTrafficGenerator(cfg).generate(100)
+        # Header, secondary header with CDS short timestamp and CRC
+        overhead = 6 + 7 + 7 + 2
+        self.assertEqual({len(packet) - overhead for packet in packets}, {10, 100})
+
+    def test_packet_rate_and_bursts(self):
+        cfg = TmGeneratorCfg(packet_rate=1000.0, burst_size=50, service_mix={17: 1.0})
+        generator = TmTrafficGenerator(cfg)
+        time.sleep(0.12)
+        due = generator.packets_due()
+        self.assertGreaterEqual(due, 100)
+        self.assertEqual(due % 50, 0)
+        generator.generate(due)
+        self.assertLess(generator.packets_due(), 50)
+
+    def test_invalid_service(self):
+        with self.assertRaises(ValueError):
+            TmTrafficGenerator(TmGeneratorCfg(service_mix={8: 1.0}))
+
+    def test_dummy_if_with_generator(self):
+        cfg = TmGeneratorCfg(packet_rate=None, max_packets_per_receive=64, seed=3)
+        dummy_com_if = DummyComIF(TmTrafficGenerator(cfg))
+        dummy_com_if.open()
+        self.assertTrue(dummy_com_if.data_available())
+        dummy_com_if.send(PusTelecommand(apid=0x02, service=17, subservice=1).pack())
+        self.assertEqual(len(dummy_com_if.receive()), 4 + 64)
+        dummy_com_if.close()
+        self.assertEqual(dummy_com_if.receive(), [])
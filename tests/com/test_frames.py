@@ -0,0 +1,173 @@
+from unittest import TestCase
+
+from spacepackets.crc import CRC16_CCITT_FUNC
+from spacepackets.ecss import PusTelecommand, PusTelemetry
+from tmtccmd.com.dummy import DummyComIF
+from tmtccmd.com.frames import (
+    FHP_IDLE_FRAME,
+    TcFrameBuilder,
+    TmFrameBuilder,
+    TmFrameCfg,
+    TmFrameDemultiplexer,
+    TransferFrameComIF,
+)
+
+
+def create_tms(num: int, source_data_len: int = 20):
+    return [
+        PusTelemetry(
+            service=3,
+            subservice=25,
+            apid=0x22,
+            seq_count=idx,
+            timestamp=bytes(),
+            source_data=bytes([idx]) * source_data_len,
+        ).pack()
+        for idx in range(num)
+    ]
+
+
+class TestTmFrames(TestCase):
+    def setUp(self):
+        self.cfg = TmFrameCfg(frame_len=64, has_ocf=True, scid=0x2A)
+        self.builder = TmFrameBuilder(self.cfg, scid=0x2A, vcid=1)
+        self.demux = TmFrameDemultiplexer(self.cfg)
+
+    def _build(self, packets):
+        frames = []
+        for packet in packets:
+            frames.extend(self.builder.add_packet(packet))
+        frames.extend(self.builder.flush())
+        return frames
+
+    def test_round_trip(self):
+        # Packets of 34 bytes in frames with 48 bytes of data, so most packets span frames.
+        tms = create_tms(10)
+        frames = self._build(tms)
+        for frame in frames:
+            self.assertEqual(len(frame), 64)
+            self.assertEqual(CRC16_CCITT_FUNC(frame), 0)
+        packets = []
+        for frame in frames:
+            packets.extend(self.demux.feed_frame(frame))
+        self.assertEqual(packets, tms)
+        stats = self.demux.stats
+        self.assertEqual(stats.frames, len(frames))
+        self.assertEqual(stats.packets, 10)
+        self.assertEqual(stats.idle_packets, 1)
+        self.assertEqual(stats.mc_count_gaps, 0)
+        self.assertEqual(stats.lost_packets, 0)
+
+    def test_packet_larger_than_frame(self):
+        tms = create_tms(3, source_data_len=150)
+        frames = self._build(tms)
+        packets = []
+        for frame in frames:
+            packets.extend(self.demux.feed_frame(frame))
+        self.assertEqual(packets, tms)
+
+    def test_stream_chunks(self):
+        tms = create_tms(10)
+        stream = b"".join(self._build(tms))
+        packets = []
+        for idx in range(0, len(stream), 37):
+            packets.extend(self.demux.feed(stream[idx : idx + 37]))
+        self.assertEqual(packets, tms)
+
+    def test_frame_loss_resync(self):
+        tms = create_tms(10)
+        frames = self._build(tms)
+        packets = []
+        for idx, frame in enumerate(frames):
+            if idx == 2:
+                continue
+            packets.extend(self.demux.feed_frame(frame))
+        stats = self.demux.stats
+        self.assertEqual(stats.vc_count_gaps, 1)
+        self.assertEqual(stats.mc_count_gaps, 1)
+        self.assertEqual(stats.lost_packets, 1)
+        # The packets which touched the lost frame are missing, all others are intact.
+        self.assertTrue(set(packets).issubset(set(bytes(tm) for tm in tms)))
+        self.assertEqual(packets[:2], tms[:2])
+        self.assertEqual(packets[-3:], tms[-3:])
+        self.assertGreaterEqual(len(packets), 7)
+
+    def test_fecf_error(self):
+        frames = self._build(create_tms(2))
+        frames[0][10] ^= 0xFF
+        self.assertEqual(self.demux.feed_frame(frames[0]), [])
+        self.assertEqual(self.demux.stats.fecf_errors, 1)
+
+    def test_wrong_scid_and_idle_frame(self):
+        other_builder = TmFrameBuilder(self.cfg, scid=0x10)
+        frames = other_builder.add_packet(create_tms(1)[0]) + other_builder.flush()
+        self.assertEqual(self.demux.feed_frame(frames[0]), [])
+        self.assertEqual(self.demux.stats.invalid_frames, 1)
+        idle_frame = bytearray(self._build(create_tms(1))[0])
+        idle_frame[4] = 0x18 | (FHP_IDLE_FRAME >> 8)
+        idle_frame[5] = FHP_IDLE_FRAME & 0xFF
+        crc = CRC16_CCITT_FUNC(idle_frame[:-2])
+        idle_frame[-2:] = bytes([crc >> 8, crc & 0xFF])
+        self.assertEqual(self.demux.feed_frame(idle_frame), [])
+        self.assertEqual(self.demux.stats.idle_frames, 1)
+
+    def test_virtual_channels(self):
+        other_builder = TmFrameBuilder(self.cfg, scid=0x2A, vcid=2)
+        tms_vc1 = create_tms(4)
+        tms_vc2 = create_tms(4, source_data_len=5)
+        frames_vc1 = self._build(tms_vc1)
+        frames_vc2 = []
+        for tm in tms_vc2:
+            frames_vc2.extend(other_builder.add_packet(tm))
+        frames_vc2.extend(other_builder.flush())
+        packets_vc1 = []
+        packets_vc2 = []
+        # Interleave the frames of both virtual channels.
+        for idx in range(max(len(frames_vc1), len(frames_vc2))):
+            if idx < len(frames_vc1):
+                packets_vc1.extend(self.demux.feed_frame(frames_vc1[idx]))
+            if idx < len(frames_vc2):
+                packets_vc2.extend(self.demux.feed_frame(frames_vc2[idx]))
+        self.assertEqual(packets_vc1, tms_vc1)
+        self.assertEqual(packets_vc2, tms_vc2)
+        self.assertEqual(self.demux.stats.vc_count_gaps, 0)
+
+
+class TestTcFrames(TestCase):
+    def test_build(self):
+        builder = TcFrameBuilder(scid=0x2A, vcid=3, bypass=False)
+        tc = PusTelecommand(service=17, subservice=1, apid=0x22).pack()
+        frame = builder.build(tc)
+        self.assertEqual(len(frame), 5 + len(tc) + 2)
+        self.assertEqual(CRC16_CCITT_FUNC(frame), 0)
+        self.assertEqual(frame[0] & 0x20, 0)
+        self.assertEqual(((frame[0] & 0x03) << 8) | frame[1], 0x2A)
+        self.assertEqual(frame[2] >> 2, 3)
+        self.assertEqual((((frame[2] & 0x03) << 8) | frame[3]) + 1, len(frame))
+        self.assertEqual(frame[4], 0)
+        self.assertEqual(frame[5:-2], tc)
+        self.assertEqual(builder.build(tc)[4], 1)
+
+    def test_too_large(self):
+        builder = TcFrameBuilder(scid=0x2A, max_frame_len=32)
+        with self.assertRaises(ValueError):
+            builder.build(bytes(30))
+
+    def test_com_if(self):
+        cfg = TmFrameCfg(frame_len=128)
+        inner = DummyComIF()
+        com_if = TransferFrameComIF(inner, TmFrameDemultiplexer(cfg), TcFrameBuilder(scid=1))
+        com_if.open()
+        sent = []
+        inner.send = sent.append
+        tc = PusTelecommand(service=17, subservice=1, apid=0x22).pack()
+        com_if.send(tc)
+        self.assertEqual(sent[0][5:-2], tc)
+        tm_builder = TmFrameBuilder(cfg, scid=1)
+        tms = create_tms(5)
+        frames = []
+        for tm in tms:
+            frames.extend(tm_builder.add_packet(tm))
+        frames.extend(tm_builder.flush())
+        inner.receive = lambda _parameters=0: frames
+        self.assertEqual(com_if.receive(), tms)
@@ -0,0 +1,130 @@
+from unittest import TestCase
+
+from dle_encoder import DleEncoder
+from spacepackets import PacketType
+from spacepackets.ccsds import PacketId
+from spacepackets.ecss import PusTelemetry
+from tmtccmd.com.framing import DleStreamDecoder, SpacePacketFramer
+
+
+class TestSpacePacketFramer(TestCase):
+    def setUp(self) -> None:
+        self.packet_id = PacketId(apid=0x22, sec_header_flag=True, ptype=PacketType.TM)
+        self.framer = SpacePacketFramer([self.packet_id])
+        self.tm0 = PusTelemetry(service=17, subservice=2, apid=0x22, timestamp=bytes()).pack()
+        self.tm1 = PusTelemetry(
+            service=3, subservice=25, apid=0x22, timestamp=bytes(), source_data=bytes(range(32))
+        ).pack()
+
+    def test_empty(self):
+        self.assertEqual(self.framer.parse(), [])
+        self.assertEqual(self.framer.pending, 0)
+
+    def test_multiple_packets(self):
+        self.framer.feed(self.tm0 + self.tm1)
+        packets = self.framer.parse()
+        self.assertEqual(len(packets), 2)
+        self.assertIsInstance(packets[0], memoryview)
+        self.assertEqual(packets[0], self.tm0)
+        self.assertEqual(packets[1], self.tm1)
+        self.assertEqual(self.framer.pending, 0)
+
+    def test_split_packet(self):
+        self.framer.feed(self.tm0 + self.tm1[:4])
+        packets = self.framer.parse()
+        self.assertEqual(len(packets), 1)
+        self.assertEqual(packets[0], self.tm0)
+        self.assertEqual(self.framer.pending, 4)
+        self.framer.feed(self.tm1[4:10])
+        self.assertEqual(self.framer.parse(), [])
+        self.framer.feed(self.tm1[10:])
+        packets = self.framer.parse()
+        self.assertEqual(len(packets), 1)
+        self.assertEqual(packets[0], self.tm1)
+
+    def test_garbage_is_skipped(self):
+        self.framer.feed(bytes([0xFF, 0x01, 0x02]) + self.tm0)
+        packets = self.framer.parse()
+        self.assertEqual(len(packets), 1)
+        self.assertEqual(packets[0], self.tm0)
+        self.assertEqual(self.framer.skipped_bytes, 3)
+
+    def test_compaction(self):
+        framer = SpacePacketFramer([self.packet_id], capacity=self.framer.capacity)
+        num_packets = 0
+        # Feed enough data to wrap the buffer multiple times, with split packets at the border.
+        chunk = self.tm1 * 3 + self.tm1[:7]
+        rest = self.tm1[7:]
+        for _ in range(2 * framer.capacity // len(chunk)):
+            framer.feed(chunk)
+            for packet in framer.parse():
+                self.assertEqual(packet, self.tm1)
+                num_packets += 1
+            framer.feed(rest)
+            for packet in framer.parse():
+                self.assertEqual(packet, self.tm1)
+                num_packets += 1
+        self.assertEqual(num_packets, 4 * (2 * framer.capacity // len(chunk)))
+        self.assertEqual(framer.skipped_bytes, 0)
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            SpacePacketFramer([self.packet_id], capacity=1024)
+
+
+class TestDleStreamDecoder(TestCase):
+    def setUp(self) -> None:
+        self.encoder = DleEncoder()
+        self.decoder = DleStreamDecoder()
+        self.packet0 = bytes([0x01, 0x02, 0x03, 0x10, 0x04])
+        self.packet1 = bytes(range(32))
+
+    def test_multiple_frames(self):
+        packets = self.decoder.decode(
+            self.encoder.encode(self.packet0) + self.encoder.encode(self.packet1)
+        )
+        self.assertEqual(packets, [self.packet0, self.packet1])
+        self.assertEqual(self.decoder.frames_decoded, 2)
+        self.assertEqual(self.decoder.pending, 0)
+
+    def test_split_frame(self):
+        encoded = self.encoder.encode(self.packet1)
+        for idx in range(len(encoded) - 1):
+            self.assertEqual(self.decoder.decode(encoded[idx : idx + 1]), [])
+        self.assertEqual(self.decoder.pending, len(encoded) - 1)
+        self.assertEqual(self.decoder.decode(encoded[-1:]), [self.packet1])
+        self.assertEqual(self.decoder.pending, 0)
+
+    def test_resync_on_garbage(self):
+        packets = self.decoder.decode(bytes([0x05, 0x06, 0x03]) + self.encoder.encode(self.packet0))
+        self.assertEqual(packets, [self.packet0])
+        self.assertEqual(self.decoder.skipped_bytes, 3)
+        self.assertEqual(self.decoder.decode_errors, 0)
+
+    def test_interrupted_frame(self):
+        encoded = self.encoder.encode(self.packet1)
+        packets = self.decoder.decode(encoded[:10] + self.encoder.encode(self.packet0))
+        self.assertEqual(packets, [self.packet0])
+        self.assertEqual(self.decoder.decode_errors, 1)
+
+    def test_invalid_escape(self):
+        packets = self.decoder.decode(
+            bytes([0x02, 0x01, 0x10, 0x05, 0x03]) + self.encoder.encode(self.packet0)
+        )
+        self.assertEqual(packets, [self.packet0])
+        self.assertEqual(self.decoder.decode_errors, 1)
+
+    def test_escape_cr(self):
+        self.encoder = DleEncoder(escape_cr=True)
+        self.decoder = DleStreamDecoder(escape_cr=True)
+        packet = bytes([0x0D, 0x02, 0x0D])
+        self.assertEqual(self.decoder.decode(self.encoder.encode(packet)), [packet])
+
+    def test_max_frame_size(self):
+        self.decoder = DleStreamDecoder(max_frame_size=16)
+        encoded = self.encoder.encode(self.packet1)
+        self.assertEqual(self.decoder.decode(encoded[:20]), [])
+        self.assertEqual(self.decoder.pending, 0)
+        packets = self.decoder.decode(encoded[20:] + self.encoder.encode(self.packet0))
+        self.assertEqual(packets, [self.packet0])
+        self.assertEqual(self.decoder.decode_errors, 1)
@@ -0,0 +1,140 @@
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+from spacepackets.ecss import PusTelecommand
+from tmtccmd.com.dummy import DummyComIF
+from tmtccmd.com.link_stats import LatencyHistogram, LinkStatistics, LinkStatsComIF
+
+
+class TestLatencyHistogram(TestCase):
+    def test_buckets(self):
+        histogram = LatencyHistogram()
+        self.assertEqual(histogram.mean, 0.0)
+        self.assertEqual(histogram.percentile(50), 0.0)
+        # Below one microsecond
+        histogram.record_ns(500)
+        # 2 to 4 microseconds
+        histogram.record_ns(3000)
+        histogram.record_ns(3500)
+        # 512 to 1024 microseconds
+        histogram.record_ns(1_000_000)
+        self.assertEqual(histogram.count, 4)
+        self.assertEqual(histogram.buckets[0], 1)
+        self.assertEqual(histogram.buckets[2], 2)
+        self.assertEqual(histogram.buckets[10], 1)
+        self.assertAlmostEqual(histogram.mean, 1_007_000 / 4 / 1e9)
+        self.assertAlmostEqual(histogram.max, 1e-3)
+        self.assertAlmostEqual(histogram.percentile(50), 4e-6)
+        self.assertAlmostEqual(histogram.percentile(100), 1e-3)
+
+    def test_overflow_bucket(self):
+        histogram = LatencyHistogram()
+        histogram.record_ns(10**15)
+        self.assertEqual(histogram.buckets[-1], 1)
+
+
+class TestLinkStatistics(TestCase):
+    def test_counters(self):
+        link_stats = LinkStatistics()
+        link_stats.record_in(3, 300)
+        link_stats.record_out(1, 20)
+        link_stats.record_decode_errors(2)
+        link_stats.record_queue_depth(5)
+        link_stats.record_queue_depth(1)
+        self.assertEqual(link_stats.packets_in, 3)
+        self.assertEqual(link_stats.bytes_in, 300)
+        self.assertEqual(link_stats.packets_out, 1)
+        self.assertEqual(link_stats.bytes_out, 20)
+        self.assertEqual(link_stats.decode_errors, 2)
+        self.assertEqual(link_stats.queue_depth, 1)
+        self.assertEqual(link_stats.max_queue_depth, 5)
+        self.assertIn("decode errors: 2", str(link_stats))
+        link_stats.reset()
+        self.assertEqual(link_stats.packets_in, 0)
+        self.assertEqual(link_stats.max_queue_depth, 0)
+
+    @patch("tmtccmd.com.link_stats.time.monotonic")
+    def test_rolling_rates(self, monotonic_mock):
+        monotonic_mock.return_value = 100.0
+        link_stats = LinkStatistics()
+        # 100 packets per second for 60 seconds, 1000 packets per second for the last 5 seconds
+        for second in range(1, 66):
+            monotonic_mock.return_value = 100.0 + second
+            if second <= 60:
+                link_stats.record_in(100, 1000)
+            else:
+                link_stats.record_in(1000, 10000)
+        rates_1s, rates_10s, rates_60s = link_stats.rolling_rates()
+        self.assertAlmostEqual(rates_1s.packets_in, 1000.0)
+        self.assertAlmostEqual(rates_1s.bytes_in, 10000.0)
+        self.assertAlmostEqual(rates_10s.packets_in, 550.0)
+        self.assertAlmostEqual(rates_60s.packets_in, (55 * 100 + 5 * 1000) / 60)
+        self.assertEqual(rates_60s.window, 60.0)
+        self.assertEqual(rates_1s.packets_out, 0.0)
+
+    def test_rates_while_sampling(self):
+        link_stats = LinkStatistics(sample_interval=1e-6, history=1e-3)
+        stop = threading.Event()
+        errors = []
+
+        def sample_loop():
+            now = 0.0
+            while not stop.is_set():
+                link_stats.record_in(1, 10)
+                # Explicit increasing times so each call appends a snapshot.
+                now += 1e-3
+                link_stats.sample(now)
+
+        def rates_loop():
+            try:
+                for _ in range(2000):
+                    link_stats.rolling_rates((1e-4, 5e-4, 1e-3))
+            except RuntimeError as e:
+                errors.append(e)
+
+        sample_threads = [threading.Thread(target=sample_loop) for _ in range(2)]
+        for thread in sample_threads:
+            thread.start()
+        try:
+            rates_loop()
+        finally:
+            stop.set()
+            for thread in sample_threads:
+                thread.join()
+        self.assertEqual(errors, [])
+
+    @patch("tmtccmd.com.link_stats.time.monotonic")
+    def test_rates_without_history(self, monotonic_mock):
+        monotonic_mock.return_value = 10.0
+        link_stats = LinkStatistics()
+        link_stats.record_out(10, 100)
+        self.assertEqual(link_stats.rates(1.0).packets_out, 0.0)
+        monotonic_mock.return_value = 10.5
+        # Averaged over the available history
+        self.assertAlmostEqual(link_stats.rates(10.0).packets_out, 20.0)
+
+
+class TestLinkStatsComIF(TestCase):
+    def test_wrapper(self):
+        com_if = LinkStatsComIF(DummyComIF())
+        self.assertEqual(com_if.id, "dummy")
+        com_if.initialize()
+        com_if.open()
+        self.assertTrue(com_if.is_open())
+        ping = PusTelecommand(apid=0x02, service=17, subservice=1).pack()
+        com_if.send(ping)
+        self.assertTrue(com_if.data_available())
+        replies = com_if.receive()
+        self.assertEqual(len(replies), 4)
+        link_stats = com_if.link_stats
+        self.assertEqual(link_stats.packets_out, 1)
+        self.assertEqual(link_stats.bytes_out, len(ping))
+        self.assertEqual(link_stats.send_latency.count, 1)
+        self.assertEqual(link_stats.packets_in, 4)
+        self.assertEqual(link_stats.bytes_in, sum(len(reply) for reply in replies))
+        com_if.close()
+        self.assertFalse(com_if.is_open())
+
+    def test_default_link_stats(self):
+        self.assertIsNone(DummyComIF().link_stats)
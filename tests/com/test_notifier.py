@@ -0,0 +1,50 @@
+import selectors
+import threading
+import time
+from collections import deque
+from unittest import TestCase
+
+from tmtccmd.com.notifier import ReceptionNotifier
+
+
+class TestReceptionNotifier(TestCase):
+    def setUp(self) -> None:
+        self.notifier = ReceptionNotifier()
+        self.queue = deque()
+
+    def tearDown(self) -> None:
+        self.notifier.close()
+
+    def test_wait_no_data(self):
+        self.assertEqual(self.notifier.wait_for_queue(self.queue, 0), 0)
+        self.assertEqual(self.notifier.wait_for_queue(self.queue, 0.05), 0)
+
+    def test_wait_wakes_on_notify(self):
+        def store_packet():
+            time.sleep(0.05)
+            self.queue.appendleft(bytes([0, 1, 2]))
+            self.notifier.notify()
+
+        thread = threading.Thread(target=store_packet)
+        start = time.time()
+        thread.start()
+        self.assertEqual(self.notifier.wait_for_queue(self.queue, 5.0), 1)
+        self.assertLess(time.time() - start, 2.0)
+        thread.join()
+
+    def test_selectable(self):
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.notifier, selectors.EVENT_READ)
+            self.assertEqual(selector.select(0), [])
+            self.notifier.notify()
+            self.assertEqual(len(selector.select(0)), 1)
+            # Level-triggered until cleared
+            self.assertEqual(len(selector.select(0)), 1)
+            self.notifier.clear()
+            self.assertEqual(selector.select(0), [])
+
+    def test_notify_before_fileno(self):
+        self.notifier.notify()
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.notifier, selectors.EVENT_READ)
+            self.assertEqual(len(selector.select(0)), 1)
@@ -0,0 +1,61 @@
+from unittest import TestCase
+
+from tmtccmd.com.packet_queue import BoundedPacketQueue, OverflowPolicy
+
+
+class TestBoundedPacketQueue(TestCase):
+    def test_unbounded(self):
+        packet_queue = BoundedPacketQueue()
+        for idx in range(100):
+            self.assertTrue(packet_queue.put(bytes([idx])))
+        self.assertEqual(len(packet_queue), 100)
+        self.assertEqual(packet_queue.num_bytes, 100)
+        self.assertEqual(packet_queue.pop_all(), [bytes([idx]) for idx in range(100)])
+        self.assertEqual(len(packet_queue), 0)
+        self.assertEqual(packet_queue.num_bytes, 0)
+        self.assertEqual(packet_queue.stats.high_water_packets, 100)
+
+    def test_drop_oldest(self):
+        packet_queue = BoundedPacketQueue(max_packets=3)
+        for idx in range(5):
+            self.assertTrue(packet_queue.put(bytes([idx])))
+        self.assertEqual(packet_queue.pop_all(), [bytes([2]), bytes([3]), bytes([4])])
+        self.assertEqual(packet_queue.stats.dropped_oldest, 2)
+        self.assertEqual(packet_queue.stats.dropped, 2)
+
+    def test_drop_oldest_bytes(self):
+        packet_queue = BoundedPacketQueue(max_bytes=10)
+        packet_queue.put(bytes(4))
+        packet_queue.put(bytes(4))
+        packet_queue.put(bytes(8))
+        self.assertEqual(packet_queue.pop_all(), [bytes(8)])
+        self.assertEqual(packet_queue.stats.dropped_oldest, 2)
+        self.assertEqual(packet_queue.stats.high_water_bytes, 8)
+
+    def test_drop_newest(self):
+        packet_queue = BoundedPacketQueue(
+            max_packets=10, max_bytes=8, policy=OverflowPolicy.DROP_NEWEST
+        )
+        packet_queue.put(bytes([0] * 4))
+        packet_queue.put(bytes([1] * 4))
+        self.assertTrue(packet_queue.put(bytes([2] * 4)))
+        self.assertEqual(packet_queue.pop_all(), [bytes([0] * 4), bytes([1] * 4)])
+        self.assertEqual(packet_queue.stats.dropped_newest, 1)
+
+    def test_block(self):
+        packet_queue = BoundedPacketQueue(max_packets=2, policy=OverflowPolicy.BLOCK)
+        self.assertTrue(packet_queue.put(bytes([0])))
+        self.assertTrue(packet_queue.put(bytes([1])))
+        self.assertFalse(packet_queue.has_space(1))
+        self.assertFalse(packet_queue.put(bytes([2])))
+        self.assertEqual(packet_queue.stats.blocked, 1)
+        self.assertEqual(packet_queue.stats.dropped, 0)
+        self.assertEqual(len(packet_queue.pop_all()), 2)
+        self.assertTrue(packet_queue.has_space(1))
+
+    def test_oversized_packet(self):
+        packet_queue = BoundedPacketQueue(max_bytes=4, policy=OverflowPolicy.BLOCK)
+        packet_queue.put(bytes(2))
+        self.assertTrue(packet_queue.put(bytes(5)))
+        self.assertEqual(packet_queue.stats.dropped_newest, 1)
+        self.assertEqual(packet_queue.pop_all(), [bytes(2)])
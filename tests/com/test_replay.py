@@ -0,0 +1,120 @@
+import os
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from unittest import TestCase
+
+from spacepackets.ecss import PusTelecommand
+
+from tmtccmd.com.dummy import DummyComIF
+from tmtccmd.com.link_stats import LinkStatsComIF
+from tmtccmd.com.replay import (
+    RecordDirection,
+    RecordingComIF,
+    RecordingReader,
+    ReplayComIF,
+)
+
+
+class TestRecordAndReplay(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "recording.bin"
+        self.ping = PusTelecommand(apid=0x22, service=17, subservice=1).pack()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _record(self, index_interval: timedelta = timedelta(seconds=1)) -> list:
+        com_if = RecordingComIF(DummyComIF(), self.path, index_interval)
+        com_if.initialize()
+        com_if.open()
+        self.assertEqual(com_if.id, "dummy")
+        com_if.send(self.ping)
+        replies = com_if.receive()
+        time.sleep(0.05)
+        com_if.send(self.ping)
+        replies.extend(com_if.receive())
+        com_if.close()
+        self.assertEqual(com_if.recorder.packets_recorded, 10)
+        return replies
+
+    def test_recording(self):
+        replies = self._record()
+        self.assertEqual(len(replies), 8)
+        with RecordingReader(self.path) as reader:
+            records = list(reader.records())
+        self.assertEqual(len(records), 10)
+        self.assertEqual(records[0].direction, RecordDirection.SENT)
+        self.assertEqual(records[0].data, self.ping)
+        self.assertEqual([r.data for r in records[1:5]], replies[0:4])
+        offsets = [r.time_offset_ns for r in records]
+        self.assertEqual(offsets, sorted(offsets))
+        self.assertGreaterEqual(records[5].time_offset, timedelta(milliseconds=50))
+
+    def test_replay_max_speed(self):
+        replies = self._record()
+        replay = ReplayComIF("replay", self.path, speed=None, max_packets_per_receive=5)
+        replay.open()
+        self.assertEqual(replay.data_available(), 1)
+        self.assertEqual(replay.receive(), replies[0:5])
+        self.assertEqual(replay.receive(), replies[5:])
+        self.assertTrue(replay.finished)
+        self.assertEqual(replay.receive(), [])
+        self.assertEqual(replay.data_available(), 0)
+        replay.send(self.ping)
+        self.assertEqual(replay.packets_sent, 1)
+        replay.close()
+
+    def test_replay_real_time(self):
+        replies = self._record()
+        replay = ReplayComIF("replay", self.path, speed=1.0)
+        replay.open()
+        self.assertEqual(replay.data_available(1.0), 1)
+        self.assertEqual(replay.receive(), replies[0:4])
+        # The second batch was recorded 50 ms later
+        self.assertEqual(replay.data_available(0.01), 0)
+        self.assertEqual(replay.data_available(1.0), 1)
+        self.assertEqual(replay.receive(), replies[4:])
+        replay.close()
+
+    def test_seek(self):
+        replies = self._record(index_interval=timedelta(milliseconds=10))
+        replay = ReplayComIF(
+            "replay", self.path, speed=None, start_offset=timedelta(milliseconds=40)
+        )
+        replay.open()
+        self.assertEqual(replay.receive(), replies[4:])
+        replay.seek(timedelta())
+        self.assertEqual(replay.receive(), replies)
+        replay.close()
+
+    def test_reader_seek(self):
+        self._record(index_interval=timedelta(milliseconds=10))
+        with RecordingReader(self.path) as reader:
+            records = list(reader.records())
+            for seek_offset_us in [0, 1, records[4].time_offset_ns // 1000, 10**5, 10**9]:
+                reader.seek(timedelta(microseconds=seek_offset_us))
+                expected = [r for r in records if r.time_offset_ns >= seek_offset_us * 1000]
+                self.assertEqual(list(reader.records()), expected)
+
+    def test_link_stats_forwarded(self):
+        com_if = LinkStatsComIF(DummyComIF())
+        recording_com_if = RecordingComIF(com_if, self.path)
+        self.assertIs(recording_com_if.link_stats, com_if.link_stats)
+        self.assertIsNone(RecordingComIF(DummyComIF(), self.path).link_stats)
+
+    def test_missing_index_is_rebuilt(self):
+        replies = self._record()
+        with RecordingReader(self.path) as reader:
+            records = list(reader.records())
+        # Remove index and footer and add a truncated record
+        records_len = 8 + sum(13 + len(r.data) for r in records)
+        with open(self.path, "r+b") as file:
+            file.truncate(records_len + 5)
+        self.assertEqual(os.path.getsize(self.path), records_len + 5)
+        replay = ReplayComIF("replay", self.path, speed=None)
+        replay.open()
+        self.assertEqual(replay.receive(), replies)
+        replay.close()
@@ -68,6 +68,44 @@ class TestSerialCobsInterface(TestCase):
         # Received data should be decoded now
         self.assertEqual(packet_list[0], test_data)
 
+    def test_recv_multiple_frames_in_one_read(self):
+        from cobs import cobs
+
+        packets = [bytes([0x00, 0x01, idx]) for idx in range(5)]
+        full_data_to_send = bytearray()
+        for packet in packets:
+            full_data_to_send.append(0)
+            full_data_to_send.extend(cobs.encode(packet))
+            full_data_to_send.append(0)
+        frames_received = self._COBS_IF.frames_received
+        # Write the last frame in two parts.
+        os.write(self._PTY_MASTER, full_data_to_send[:-3])
+        time.sleep(0.1)
+        self.assertEqual(self._COBS_IF.data_available(0), 4)
+        os.write(self._PTY_MASTER, full_data_to_send[-3:])
+        time.sleep(0.1)
+        self.assertEqual(self._COBS_IF.data_available(0), 5)
+        self.assertEqual(self._COBS_IF.receive(), packets)
+        self.assertEqual(self._COBS_IF.frames_received, frames_received + 5)
+
+    def test_recv_oversized_frame(self):
+        from cobs import cobs
+
+        test_data = bytes([0x05, 0x06, 0x07])
+        broken_frames = self._COBS_IF.broken_frames
+        # Frame without a delimiter which exceeds the maximum frame length.
+        os.write(self._PTY_MASTER, bytes([0x01] * (self._COBS_IF.max_frame_len + 100)))
+        time.sleep(0.1)
+        self.assertEqual(self._COBS_IF.broken_frames, broken_frames + 1)
+        full_data_to_send = bytearray([0x01] * 20)
+        full_data_to_send.append(0)
+        full_data_to_send.extend(cobs.encode(test_data))
+        full_data_to_send.append(0)
+        os.write(self._PTY_MASTER, full_data_to_send)
+        time.sleep(0.1)
+        self.assertEqual(self._COBS_IF.broken_frames, broken_frames + 1)
+        self.assertEqual(self._COBS_IF.receive(), [test_data])
+
     @classmethod
     def tearDownClass(cls) -> None:
         cls._COBS_IF.close()
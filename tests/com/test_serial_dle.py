@@ -1,4 +1,5 @@
 import os
+import selectors
 import sys
 import time
 import unittest
@@ -61,6 +62,18 @@ class TestSerialDleInterface(TestCase):
         self.assertEqual(len(packet_list), 1)
         # Received data should be decoded now
         self.assertEqual(packet_list[0], test_data)
+        self.assertGreaterEqual(self._DLE_IF.link_stats.packets_in, 1)
+        self.assertGreaterEqual(self._DLE_IF.link_stats.bytes_in, len(encoded_test_data))
+
+    def test_recv_wakes_selector(self):
+        test_data = bytes([0x05, 0x06])
+        with selectors.DefaultSelector() as selector:
+            selector.register(self._DLE_IF, selectors.EVENT_READ)
+            os.write(self._PTY_MASTER, self.encoder.encode(test_data))
+            self.assertEqual(len(selector.select(1.0)), 1)
+            self.assertEqual(self._DLE_IF.data_available(1.0), 1)
+            self.assertEqual(self._DLE_IF.receive(), [test_data])
+            self.assertEqual(selector.select(0), [])
 
     @classmethod
     def tearDownClass(cls) -> None:
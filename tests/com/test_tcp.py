@@ -1,17 +1,24 @@
+import select
 import socket
 import threading
 import time
 from collections import deque
-from typing import Optional
+from typing import List, Optional
 from unittest import TestCase
+from unittest.mock import patch
 
 from spacepackets import PacketType
 from spacepackets.ccsds import PacketId
 from spacepackets.ecss import PusTelecommand, PusTelemetry
-from tmtccmd.com.tcp import TcpSpacepacketsClient
+from tmtccmd.com.packet_queue import OverflowPolicy
+from tmtccmd.com.tcp import (
+    ConnectionState,
+    ReconnectCfg,
+    TcpSpacepacketsClient,
+    UnsentTcPolicy,
+)
 from tmtccmd.com.tcpip_utils import EthAddr
 
-
 LOCALHOST = "127.0.0.1"
 
 
@@ -48,6 +55,280 @@ class TestTcpIf(TestCase):
         self._test_recv()
         self._test_close_client()
 
+    def test_burst_send(self):
+        self._open()
+        received = bytearray()
+        tcs = [
+            PusTelecommand(service=17, subservice=1, apid=0x22, seq_count=idx).pack()
+            for idx in range(200)
+        ]
+        expected_len = sum(len(tc) for tc in tcs)
+
+        def server_task():
+            (self.conn_socket, _) = self.tcp_server.accept()
+            while len(received) < expected_len:
+                data_recv = self.conn_socket.recv(4096)
+                if len(data_recv) == 0:
+                    break
+                received.extend(data_recv)
+
+        tcp_server = threading.Thread(target=server_task, daemon=True)
+        tcp_server.start()
+        for tc in tcs:
+            self.tcp_client.send(tc)
+        tcp_server.join(2.0)
+        # Give the TCP thread some time to update the statistics.
+        time.sleep(0.1)
+        self.assertEqual(received, b"".join(tcs))
+        stats = self.tcp_client.send_stats
+        self.assertEqual(stats.packets_sent, len(tcs))
+        self.assertEqual(stats.bytes_sent, expected_len)
+        # The TCs are coalesced, so far less send calls than packets are required.
+        self.assertLess(stats.send_calls, len(tcs))
+        self.assertGreater(stats.bytes_per_send_call, len(tcs[0]))
+        self.tcp_client.close()
+        self.conn_socket.close()
+
+    def test_reconnect(self):
+        states = []
+        self.tcp_client = TcpSpacepacketsClient(
+            "tcp",
+            space_packet_ids=[self.expected_packet_id],
+            target_address=EthAddr.from_tuple(self.addr),
+            inner_thread_delay=0.05,
+            reconnect_cfg=ReconnectCfg(initial_backoff=0.02, max_backoff=0.05),
+            state_cb=states.append,
+        )
+        self._open()
+        self.assertEqual(self.tcp_client.conn_state, ConnectionState.CONNECTED)
+        self.assertEqual(states, [ConnectionState.CONNECTED])
+        conn_sock, _ = self.tcp_server.accept()
+        # Connection loss.
+        conn_sock.close()
+        time.sleep(0.1)
+        self.assertEqual(states[1], ConnectionState.DISCONNECTED)
+        # The interface stays open while reconnecting.
+        self.assertTrue(self.tcp_client.is_open())
+        # This TC is kept until the connection is re-established.
+        self.tcp_client.send(self.ping_cmd.pack())
+        self.tcp_server.settimeout(1.0)
+        conn_sock, _ = self.tcp_server.accept()
+        conn_sock.settimeout(1.0)
+        self.assertEqual(conn_sock.recv(4096), self.ping_cmd.pack())
+        self.assertEqual(states[2], ConnectionState.CONNECTED)
+        self.assertEqual(self.tcp_client.conn_state, ConnectionState.CONNECTED)
+        # Verify TM reception on the new connection.
+        conn_sock.sendall(self.ping_reply.pack())
+        time.sleep(0.1)
+        self.assertEqual(self.tcp_client.receive(), [self.ping_reply.pack()])
+        self.tcp_client.close()
+        self.assertEqual(states[-1], ConnectionState.DISCONNECTED)
+        conn_sock.close()
+
+    def test_reconnect_drop_policy(self):
+        self.tcp_client = TcpSpacepacketsClient(
+            "tcp",
+            space_packet_ids=[self.expected_packet_id],
+            target_address=EthAddr.from_tuple(self.addr),
+            inner_thread_delay=0.05,
+            reconnect_cfg=ReconnectCfg(initial_backoff=0.2, unsent_tc_policy=UnsentTcPolicy.DROP),
+        )
+        self._open()
+        conn_sock, _ = self.tcp_server.accept()
+        conn_sock.close()
+        time.sleep(0.1)
+        self.assertEqual(self.tcp_client.conn_state, ConnectionState.DISCONNECTED)
+        # Dropped, because the link is down.
+        self.tcp_client.send(self.base_data)
+        self.assertEqual(self.tcp_client.send_stats.packets_dropped, 1)
+        self.tcp_server.settimeout(1.0)
+        conn_sock, _ = self.tcp_server.accept()
+        time.sleep(0.05)
+        self.assertEqual(self.tcp_client.conn_state, ConnectionState.CONNECTED)
+        self.tcp_client.send(self.ping_cmd.pack())
+        conn_sock.settimeout(1.0)
+        self.assertEqual(conn_sock.recv(4096), self.ping_cmd.pack())
+        conn_sock.close()
+        self.tcp_client.close()
+
+    def test_close_while_reconnecting(self):
+        class SlowConnectSocket(socket.socket):
+            def connect(self, address):
+                time.sleep(0.3)
+                super().connect(address)
+
+        states = []
+        self.tcp_client = TcpSpacepacketsClient(
+            "tcp",
+            space_packet_ids=[self.expected_packet_id],
+            target_address=EthAddr.from_tuple(self.addr),
+            inner_thread_delay=0.05,
+            reconnect_cfg=ReconnectCfg(initial_backoff=0.01, max_backoff=0.01, connect_timeout=1.0),
+            state_cb=states.append,
+        )
+        self._open()
+        conn_sock, _ = self.tcp_server.accept()
+        with patch("tmtccmd.com.tcp.socket.socket", SlowConnectSocket):
+            conn_sock.close()
+            # The TCP thread is now blocked in a reconnection attempt.
+            time.sleep(0.15)
+            self.tcp_client.close()
+        self.assertFalse(self.tcp_client.is_open())
+        self.assertEqual(states, [ConnectionState.CONNECTED, ConnectionState.DISCONNECTED])
+        time.sleep(0.3)
+        # The reconnection attempt must not re-establish the closed connection.
+        self.assertEqual(states, [ConnectionState.CONNECTED, ConnectionState.DISCONNECTED])
+        self.assertEqual(self.tcp_client.conn_state, ConnectionState.DISCONNECTED)
+        # Re-opening uses a new connection.
+        self.tcp_server.settimeout(1.0)
+        pending_sock, _ = self.tcp_server.accept()
+        pending_sock.close()
+        self._open()
+        conn_sock, _ = self.tcp_server.accept()
+        conn_sock.sendall(self.ping_reply.pack())
+        time.sleep(0.1)
+        self.assertEqual(self.tcp_client.receive(), [self.ping_reply.pack()])
+        self.tcp_client.close()
+        conn_sock.close()
+
+    def test_open_refused_with_reconnect(self):
+        # Nothing listens on the port at first.
+        self.tcp_server.close()
+        self.tcp_client = TcpSpacepacketsClient(
+            "tcp",
+            space_packet_ids=[self.expected_packet_id],
+            target_address=EthAddr.from_tuple(self.addr),
+            inner_thread_delay=0.05,
+            reconnect_cfg=ReconnectCfg(initial_backoff=0.02, max_backoff=0.05),
+        )
+        self._open()
+        self.assertEqual(self.tcp_client.conn_state, ConnectionState.DISCONNECTED)
+        self.tcp_server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.tcp_server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.tcp_server.bind(self.addr)
+        self.tcp_server.listen()
+        self.tcp_server.settimeout(1.0)
+        conn_sock, _ = self.tcp_server.accept()
+        time.sleep(0.05)
+        self.assertEqual(self.tcp_client.conn_state, ConnectionState.CONNECTED)
+        conn_sock.close()
+        self.tcp_client.close()
+
+    def test_open_refused_without_reconnect(self):
+        self.tcp_server.close()
+        with self.assertRaises(ConnectionRefusedError):
+            self.tcp_client.open()
+        self.assertFalse(self.tcp_client.is_open())
+
+    def test_open_timeout_closes_socket(self):
+        sockets = []
+
+        class TimeoutSocket(socket.socket):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                sockets.append(self)
+
+            def connect(self, address):
+                raise socket.timeout("timed out")
+
+        with patch("tmtccmd.com.tcp.socket.socket", TimeoutSocket):
+            self.tcp_client.open()
+        self.assertEqual(len(sockets), 1)
+        self.assertEqual(sockets[0].fileno(), -1)
+        time.sleep(0.1)
+        self.assertFalse(self.tcp_client.is_open())
+
+    def test_no_reconnect(self):
+        self._open()
+        conn_sock, _ = self.tcp_server.accept()
+        conn_sock.close()
+        time.sleep(0.2)
+        self.assertEqual(self.tcp_client.conn_state, ConnectionState.DISCONNECTED)
+        self.assertFalse(self.tcp_client.is_open())
+
+    def test_tm_queue_drop_oldest(self):
+        tms = self._create_client_with_tm_queue(OverflowPolicy.DROP_OLDEST)
+        conn_sock, _ = self.tcp_server.accept()
+        conn_sock.sendall(b"".join(tms))
+        time.sleep(0.2)
+        self.assertEqual(self.tcp_client.data_available(), 5)
+        self.assertEqual(self.tcp_client.receive(), tms[-5:])
+        stats = self.tcp_client.tm_queue_stats
+        self.assertEqual(stats.dropped_oldest, 15)
+        self.assertEqual(stats.high_water_packets, 5)
+        conn_sock.close()
+        self.tcp_client.close()
+
+    def test_tm_queue_drop_newest(self):
+        tms = self._create_client_with_tm_queue(OverflowPolicy.DROP_NEWEST)
+        conn_sock, _ = self.tcp_server.accept()
+        conn_sock.sendall(b"".join(tms))
+        time.sleep(0.2)
+        self.assertEqual(self.tcp_client.receive(), tms[:5])
+        self.assertEqual(self.tcp_client.tm_queue_stats.dropped_newest, 15)
+        # Reception continues with intact framing after the overflow.
+        conn_sock.sendall(tms[0])
+        time.sleep(0.2)
+        self.assertEqual(self.tcp_client.receive(), [tms[0]])
+        conn_sock.close()
+        self.tcp_client.close()
+
+    def test_tm_queue_block(self):
+        tms = self._create_client_with_tm_queue(OverflowPolicy.BLOCK)
+        conn_sock, _ = self.tcp_server.accept()
+        conn_sock.sendall(b"".join(tms))
+        received = []
+        for _ in range(40):
+            time.sleep(0.05)
+            self.assertLessEqual(self.tcp_client.data_available(), 5)
+            received.extend(self.tcp_client.receive())
+            if len(received) == len(tms):
+                break
+        self.assertEqual(received, tms)
+        stats = self.tcp_client.tm_queue_stats
+        self.assertEqual(stats.dropped, 0)
+        self.assertGreater(stats.blocked, 0)
+        self.assertLessEqual(stats.high_water_bytes, 5 * len(tms[0]))
+        conn_sock.close()
+        self.tcp_client.close()
+
+    def test_tm_queue_block_notifies(self):
+        tms = self._create_client_with_tm_queue(OverflowPolicy.BLOCK)
+        conn_sock, _ = self.tcp_server.accept()
+        conn_sock.sendall(b"".join(tms))
+        fd = self.tcp_client.fileno()
+        readable, _, _ = select.select([fd], [], [], 1.0)
+        self.assertEqual(readable, [fd])
+        time.sleep(0.1)
+        # The queue is full, the remaining packets wait for space.
+        self.assertEqual(self.tcp_client.receive(), tms[:5])
+        # The TCP thread moves the waiting packets into the queue, which needs to wake up
+        # the waiters on the file descriptor even though no new TM arrived.
+        readable, _, _ = select.select([fd], [], [], 1.0)
+        self.assertEqual(readable, [fd])
+        self.assertEqual(self.tcp_client.receive(), tms[5:10])
+        conn_sock.close()
+        self.tcp_client.close()
+
+    def _create_client_with_tm_queue(self, policy: OverflowPolicy) -> List[bytes]:
+        tms = [
+            PusTelemetry(
+                service=17, subservice=2, apid=0x22, seq_count=idx, timestamp=bytes()
+            ).pack()
+            for idx in range(20)
+        ]
+        self.tcp_client = TcpSpacepacketsClient(
+            "tcp",
+            space_packet_ids=[self.expected_packet_id],
+            target_address=EthAddr.from_tuple(self.addr),
+            inner_thread_delay=0.02,
+            max_packets_stored=10,
+            max_bytes_stored=5 * len(tms[0]),
+            overflow_policy=policy,
+        )
+        self._open()
+        return tms
+
     def tcp_server_thread(self):
         (conn_sock, addr_info) = self.tcp_server.accept()
         while True:
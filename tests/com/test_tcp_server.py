@@ -0,0 +1,139 @@
+import socket
+import time
+from typing import List
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from spacepackets import PacketType
+from spacepackets.ccsds import PacketId
+from spacepackets.ecss import PusTelecommand, PusTelemetry
+from tmtccmd.com.tcp_server import SlowConsumerPolicy, TcpSpacepacketsServer
+from tmtccmd.com.tcpip_utils import EthAddr
+
+LOCALHOST = "127.0.0.1"
+
+
+class TestTcpServer(TestCase):
+    def setUp(self) -> None:
+        self.tc_packet_id = PacketId(apid=0x22, sec_header_flag=True, ptype=PacketType.TC)
+        self.server = TcpSpacepacketsServer(
+            "tcp_server",
+            space_packet_ids=[self.tc_packet_id],
+            bind_address=EthAddr(LOCALHOST, 0),
+        )
+        self.server.initialize()
+        self.clients: List[socket.socket] = []
+        self.tm = PusTelemetry(service=17, subservice=2, apid=0x22, timestamp=bytes()).pack()
+
+    def _connect_clients(self, num_clients: int):
+        self.server.open()
+        self.assertTrue(self.server.is_open())
+        for _ in range(num_clients):
+            client = socket.create_connection(self.server.bound_address.to_tuple)
+            client.settimeout(1.0)
+            self.clients.append(client)
+        time.sleep(0.05)
+        self.assertEqual(self.server.num_clients, num_clients)
+
+    def test_broadcast(self):
+        self._connect_clients(3)
+        self.server.send(self.tm)
+        self.server.send(self.tm)
+        for client in self.clients:
+            received = bytearray()
+            while len(received) < 2 * len(self.tm):
+                received.extend(client.recv(4096))
+            self.assertEqual(received, self.tm * 2)
+
+    def test_tc_merge(self):
+        self._connect_clients(2)
+        tcs = [
+            PusTelecommand(service=17, subservice=1, apid=0x22, seq_count=idx).pack()
+            for idx in range(4)
+        ]
+        self.clients[0].sendall(tcs[0])
+        time.sleep(0.05)
+        # Split packet.
+        self.clients[1].sendall(tcs[1][:5])
+        time.sleep(0.05)
+        self.clients[0].sendall(tcs[2])
+        self.clients[1].sendall(tcs[1][5:])
+        time.sleep(0.05)
+        self.clients[1].sendall(tcs[3])
+        time.sleep(0.05)
+        self.assertEqual(self.server.data_available(), 4)
+        self.assertEqual(self.server.receive(), [tcs[0], tcs[2], tcs[1], tcs[3]])
+        self.assertEqual(self.server.receive(), [])
+
+    def test_client_disconnect(self):
+        self._connect_clients(2)
+        self.clients[0].close()
+        time.sleep(0.05)
+        self.assertEqual(self.server.num_clients, 1)
+        self.server.send(self.tm)
+        self.assertEqual(self.clients[1].recv(4096), self.tm)
+
+    def test_max_clients(self):
+        self.server.max_clients = 1
+        self._connect_clients(1)
+        client = socket.create_connection(self.server.bound_address.to_tuple)
+        client.settimeout(1.0)
+        # The connection is closed by the server immediately.
+        self.assertEqual(client.recv(4096), b"")
+        self.assertEqual(self.server.num_clients, 1)
+        client.close()
+
+    def test_slow_consumer(self):
+        self.server.max_client_backlog = 2**16
+        self.server.slow_consumer_policy = SlowConsumerPolicy.DISCONNECT
+        self._connect_clients(1)
+        large_tm = PusTelemetry(
+            service=3, subservice=25, apid=0x22, timestamp=bytes(), source_data=bytes(60000)
+        ).pack()
+        # The client does not read, so the socket buffers and the backlog fill up eventually.
+        for _ in range(1000):
+            self.server.send(large_tm)
+            if self.server.num_clients == 0:
+                break
+            time.sleep(0.001)
+        self.assertEqual(self.server.num_clients, 0)
+        self.assertGreater(self.server.dropped_packets, 0)
+
+    def test_client_error(self):
+        self._connect_clients(2)
+        faulty_addr = EthAddr.from_tuple(self.clients[0].getsockname())
+        for client in self.server.clients:
+            if client.addr == faulty_addr:
+                client.framer.parse = MagicMock(side_effect=ValueError("parser failed"))
+        tc = PusTelecommand(service=17, subservice=1, apid=0x22).pack()
+        with self.assertLogs("tmtccmd.com.tcp_server", level="ERROR"):
+            self.clients[0].sendall(tc)
+            time.sleep(0.05)
+        # Only the faulty client was disconnected.
+        self.assertEqual(self.clients[0].recv(4096), b"")
+        self.assertTrue(self.server.is_open())
+        self.assertEqual(self.server.num_clients, 1)
+        self.clients[1].sendall(tc)
+        time.sleep(0.05)
+        self.assertEqual(self.server.receive(), [tc])
+
+    def test_server_task_error(self):
+        self._connect_clients(1)
+        self.server._TcpSpacepacketsServer__distribute_tm = MagicMock(
+            side_effect=RuntimeError("event loop failed")
+        )
+        with self.assertLogs("tmtccmd.com.tcp_server", level="ERROR"):
+            self.server.send(self.tm)
+            time.sleep(0.05)
+        self.assertFalse(self.server.is_open())
+        # The interface can be opened again after the error.
+        del self.server._TcpSpacepacketsServer__distribute_tm
+        self.server.open()
+        self.assertTrue(self.server.is_open())
+        self.assertEqual(self.server.num_clients, 0)
+
+    def tearDown(self) -> None:
+        self.server.close()
+        self.assertFalse(self.server.is_open())
+        for client in self.clients:
+            client.close()
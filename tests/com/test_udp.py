@@ -1,11 +1,15 @@
+import dataclasses
 import time
 import select
 import socket
 from typing import Any
 from unittest import TestCase
 
+from spacepackets.ecss import PusTelecommand, PusTelemetry
+
+from tmtccmd.com.dummy import DummyComIF
 from tmtccmd.com.tcpip_utils import EthAddr
-from tmtccmd.com.udp import UdpClient
+from tmtccmd.com.udp import MulticastCfg, UdpClient, UdpMulticastRelay
 
 LOCALHOST = "127.0.0.1"
 
@@ -37,6 +41,138 @@ class TestUdpIf(TestCase):
         self.assertEqual(len(data_recv), 1)
         self.assertEqual(data_recv[0], data)
 
+    def test_recv_multiple(self):
+        self._open()
+        sender_addr = self._simple_send(bytes([0]))
+        packets = [bytes([idx, 1, 2, 3]) for idx in range(5)]
+        for packet in packets:
+            self.udp_server.sendto(packet, sender_addr)
+        time.sleep(0.05)
+        data_recv = self.udp_client.receive()
+        self.assertEqual(data_recv, packets)
+        self.assertEqual(self.udp_client.receive(), [])
+
+    def test_recv_unbound(self):
+        # Nothing was sent yet and no receive address was set, so the socket is not bound.
+        self._open()
+        self.assertEqual(self.udp_client.receive(), [])
+        self.assertEqual(self.udp_client.receive_views(), [])
+        self.assertEqual(self.udp_client.stats.datagrams_received, 0)
+
+    def test_recv_default_max_size(self):
+        self._open()
+        sender_addr = self._simple_send(bytes([0]))
+        datagram = bytes(range(256)) * 16
+        self.udp_server.sendto(datagram, sender_addr)
+        time.sleep(0.05)
+        self.assertEqual(self.udp_client.receive(), [datagram])
+
+    def test_recv_views(self):
+        self._open()
+        sender_addr = self._simple_send(bytes([0]))
+        packets = [bytes([idx]) * (idx + 1) for idx in range(5)]
+        for packet in packets:
+            self.udp_server.sendto(packet, sender_addr)
+        time.sleep(0.05)
+        views = self.udp_client.receive_views()
+        self.assertEqual(len(views), 5)
+        for view, packet in zip(views, packets):
+            self.assertIsInstance(view, memoryview)
+            self.assertEqual(view, packet)
+        self.assertEqual(self.udp_client.receive_views(), [])
+
+    def test_recv_views_pool_exhausted(self):
+        self.udp_client = UdpClient(
+            "udp", send_address=EthAddr.from_tuple(self.addr), recv_max_size=64, recv_pool_size=2
+        )
+        self._open()
+        sender_addr = self._simple_send(bytes([0]))
+        for idx in range(3):
+            self.udp_server.sendto(bytes([idx]), sender_addr)
+        time.sleep(0.05)
+        views = self.udp_client.receive_views()
+        self.assertEqual([bytes(view) for view in views], [bytes([0]), bytes([1])])
+        views = self.udp_client.receive_views()
+        self.assertEqual([bytes(view) for view in views], [bytes([2])])
+
+    def test_recv_pool_allocated_on_demand(self):
+        self._open()
+        sender_addr = self._simple_send(bytes([0]))
+        self.assertEqual(self.udp_client.receive(), [])
+        self.assertIsNone(self.udp_client._recv_pool_view)
+        self.udp_server.sendto(bytes([0]), sender_addr)
+        time.sleep(0.05)
+        self.assertEqual(self.udp_client.receive_views(), [bytes([0])])
+        self.assertEqual(len(self.udp_client._recv_pool_view), 64 * 4096)
+        # Changed settings re-allocate the pool.
+        self.udp_client.recv_max_size = 16
+        self.udp_client.recv_pool_size = 2
+        for idx in range(3):
+            self.udp_server.sendto(bytes([idx]) * 20, sender_addr)
+        time.sleep(0.05)
+        views = self.udp_client.receive_views()
+        self.assertEqual(len(self.udp_client._recv_pool_view), 2 * 16)
+        self.assertEqual([bytes(view) for view in views], [bytes([0]) * 16, bytes([1]) * 16])
+
+    def test_recv_space_packet_framing(self):
+        self.udp_client.space_packet_framing = True
+        self._open()
+        sender_addr = self._simple_send(bytes([0]))
+        tm0 = PusTelemetry(service=17, subservice=2, apid=0x22, timestamp=bytes()).pack()
+        tm1 = PusTelemetry(
+            service=3, subservice=25, apid=0x22, timestamp=bytes(), source_data=bytes(8)
+        ).pack()
+        self.udp_server.sendto(tm0 + tm1, sender_addr)
+        # Last packet is incomplete and is dropped
+        self.udp_server.sendto(tm1 + tm0[:-1], sender_addr)
+        time.sleep(0.05)
+        self.assertEqual(self.udp_client.receive(), [tm0, tm1, tm1])
+        stats = self.udp_client.stats
+        self.assertEqual(stats.datagrams_received, 2)
+        self.assertEqual(stats.packets_received, 3)
+        self.assertEqual(stats.broken_datagrams, 1)
+        link_stats = self.udp_client.link_stats
+        self.assertEqual(link_stats.packets_in, 3)
+        self.assertEqual(link_stats.bytes_in, 2 * len(tm0 + tm1) - 1)
+        self.assertEqual(link_stats.decode_errors, 1)
+        self.udp_server.sendto(tm1 + tm0, sender_addr)
+        time.sleep(0.05)
+        views = self.udp_client.receive_views()
+        self.assertEqual([bytes(view) for view in views], [tm1, tm0])
+
+    def test_send_aggregation(self):
+        tc = PusTelecommand(apid=0x22, service=17, subservice=1).pack()
+        self.udp_client = UdpClient(
+            "udp", send_address=EthAddr.from_tuple(self.addr), send_mtu=2 * len(tc) + 1
+        )
+        self._open()
+        for _ in range(3):
+            self.udp_client.send(tc)
+        # The third TC does not fit into the MTU anymore
+        self.assertEqual(self._recv_datagram(), tc + tc)
+        self.udp_client.flush()
+        self.assertEqual(self._recv_datagram(), tc)
+        oversized_tc = PusTelecommand(
+            apid=0x22, service=17, subservice=1, app_data=bytes(len(tc) * 2)
+        ).pack()
+        self.udp_client.send(tc)
+        self.udp_client.send(oversized_tc)
+        self.assertEqual(self._recv_datagram(), tc)
+        self.assertEqual(self._recv_datagram(), oversized_tc)
+        stats = self.udp_client.stats
+        self.assertEqual(stats.datagrams_sent, 4)
+        self.assertEqual(stats.packets_sent, 5)
+        self.assertEqual(stats.oversize_packets, 1)
+        link_stats = self.udp_client.link_stats
+        self.assertEqual(link_stats.packets_out, 5)
+        self.assertEqual(link_stats.bytes_out, 4 * len(tc) + len(oversized_tc))
+        self.assertEqual(link_stats.send_latency.count, 4)
+
+    def _recv_datagram(self) -> bytes:
+        ready = select.select([self.udp_server], [], [], 0.1)
+        self.assertTrue(ready[0])
+        return self.udp_server.recvfrom(4096)[0]
+
     def _simple_send(self, data: bytes) -> Any:
         self.udp_client.send(data)
         ready = select.select([self.udp_server], [], [], 0.1)
@@ -52,3 +188,85 @@ class TestUdpIf(TestCase):
     def tearDown(self) -> None:
         self.udp_client.close()
         self.udp_server.close()
+
+
+class TestUdpMulticast(TestCase):
+    def setUp(self) -> None:
+        self.group = "239.255.42.99"
+        self.cfg = MulticastCfg(group=self.group, interface=LOCALHOST, loopback=True)
+        self.listeners = []
+
+    def tearDown(self) -> None:
+        for listener in self.listeners:
+            listener.close()
+
+    def test_publish_to_many_listeners(self):
+        publisher = UdpClient(
+            "pub",
+            send_address=EthAddr(self.group, 0),
+            multicast_cfg=dataclasses.replace(self.cfg, join=False),
+        )
+        publisher.open()
+        self.listeners.append(publisher)
+        group_addr = self._open_listeners(2, publisher)
+        publisher.send_address = group_addr
+        tm = PusTelemetry(service=17, subservice=2, apid=0x22, timestamp=bytes()).pack()
+        publisher.send(tm)
+        for listener in self.listeners[1:]:
+            self.assertTrue(listener.data_available(1.0))
+            self.assertEqual(listener.receive(), [tm])
+            self.assertEqual(listener.joined_groups, {self.group})
+
+    def test_leave_group(self):
+        publisher = UdpClient(
+            "pub",
+            send_address=EthAddr(self.group, 0),
+            multicast_cfg=dataclasses.replace(self.cfg, join=False),
+        )
+        publisher.open()
+        self.listeners.append(publisher)
+        publisher.send_address = self._open_listeners(1, publisher)
+        listener = self.listeners[-1]
+        listener.leave_group(self.group, LOCALHOST)
+        self.assertEqual(listener.joined_groups, set())
+        publisher.send(bytes([1, 2, 3]))
+        self.assertFalse(listener.data_available(0.2))
+        listener.join_group(self.group, LOCALHOST)
+        publisher.send(bytes([1, 2, 3]))
+        self.assertTrue(listener.data_available(1.0))
+        self.assertEqual(listener.receive(), [bytes([1, 2, 3])])
+
+    def test_relay(self):
+        uplink = DummyComIF()
+        relay = UdpMulticastRelay.with_group(
+            uplink, EthAddr(self.group, 0), self.cfg, send_mtu=1400
+        )
+        relay.initialize()
+        relay.open()
+        self.listeners.append(relay)
+        relay.publisher.send_address = self._open_listeners(1, relay.publisher)
+        listener = self.listeners[-1]
+        listener.space_packet_framing = True
+        self.assertEqual(relay.publisher.joined_groups, set())
+        relay.send(PusTelecommand(apid=0x02, service=17, subservice=1).pack())
+        replies = relay.receive()
+        self.assertEqual(len(replies), 4)
+        self.assertTrue(listener.data_available(1.0))
+        self.assertEqual(listener.receive(), replies)
+        # All replies were coalesced into one datagram.
+        self.assertEqual(listener.stats.datagrams_received, 1)
+
+    def _open_listeners(self, num: int, publisher: UdpClient) -> EthAddr:
+        # The first listener lets the OS assign a port which the other ones share.
+        port = 0
+        for idx in range(num):
+            listener = UdpClient(
+                f"listener{idx}",
+                send_address=EthAddr(LOCALHOST, 0),
+                recv_addr=EthAddr("", port),
+                multicast_cfg=self.cfg,
+            )
+            listener.open()
+            port = listener.udp_socket.getsockname()[1]
+            self.listeners.append(listener)
+        return EthAddr(self.group, port)
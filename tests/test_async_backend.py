@@ -0,0 +1,84 @@
+import asyncio
+from datetime import timedelta
+from typing import List
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import MagicMock
+
+from tmtccmd import CcsdsTmListener
+from tmtccmd.com.aio import AsyncComInterface
+from tmtccmd.core import TcMode, TmMode, BackendRequest
+from tmtccmd.core.async_backend import AsyncCcsdsTmtcBackend
+from tmtccmd.tmtc.procedure import TreeCommandingProcedure
+
+from tests.test_backend import TcHandlerMock
+
+
+class LoopbackComIF(AsyncComInterface):
+    def __init__(self):
+        super().__init__()
+        self.opened = False
+        self.sent: List[bytes] = []
+
+    @property
+    def id(self) -> str:
+        return "loopback"
+
+    async def open(self):
+        self.opened = True
+
+    def is_open(self) -> bool:
+        return self.opened
+
+    async def close(self):
+        self.opened = False
+
+    def send_nowait(self, data: bytes):
+        self.sent.append(data)
+        self._store_packets([data])
+
+
+class TestAsyncBackend(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.com_if = LoopbackComIF()
+        self.tm_listener = MagicMock(specs=CcsdsTmListener)
+        self.tm_listener.operation.side_effect = lambda com_if: len(com_if.receive())
+        self.tc_handler = TcHandlerMock(0x06)
+        self.backend = AsyncCcsdsTmtcBackend(
+            tc_mode=TcMode.IDLE,
+            tm_mode=TmMode.IDLE,
+            com_if=self.com_if,
+            tm_listener=self.tm_listener,
+            tc_handler=self.tc_handler,
+            idle_timeout=timedelta(seconds=5),
+        )
+
+    async def test_open_close(self):
+        await self.backend.open_async()
+        self.assertTrue(self.com_if.is_open())
+        self.assertTrue(self.backend.com_if_active())
+        self.assertTrue(self.backend.com_if.is_open())
+        await self.backend.close_async()
+        self.assertFalse(self.com_if.is_open())
+
+    async def test_one_queue(self):
+        await self.backend.open_async()
+        self.backend.tc_mode = TcMode.ONE_QUEUE
+        self.backend.inter_cmd_delay = timedelta(milliseconds=50)
+        self.backend.current_procedure = TreeCommandingProcedure(cmd_path="/event")
+        state = await asyncio.wait_for(self.backend.run(), 2.0)
+        self.assertEqual(state.request, BackendRequest.TERMINATION_NO_ERROR)
+        self.assertEqual(self.tc_handler.send_cb_call_count, 2)
+        self.assertEqual(self.tc_handler.send_cb_call_args.com_if.id, "loopback")
+
+    async def test_listener(self):
+        await self.backend.open_async()
+        self.backend.tm_mode = TmMode.LISTENER
+        run_task = asyncio.create_task(self.backend.run())
+        await asyncio.sleep(0.01)
+        self.com_if.send_nowait(bytes([0, 1, 2, 3, 4, 5, 6]))
+        await asyncio.sleep(0.05)
+        self.tm_listener.operation.assert_called()
+        self.assertEqual(self.com_if.data_available(), 0)
+        self.backend.stop()
+        state = await asyncio.wait_for(run_task, 1.0)
+        self.assertEqual(state.request, BackendRequest.DELAY_LISTENER)
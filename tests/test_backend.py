@@ -1,3 +1,4 @@
+import socket
 from datetime import timedelta
 from typing import Optional
 from unittest import TestCase
@@ -6,6 +7,8 @@ from unittest.mock import MagicMock
 from spacepackets.ecss import PusTelecommand
 from tmtccmd import CcsdsTmtcBackend, CcsdsTmListener, TcHandlerBase
 from tmtccmd.com.dummy import DummyComIF
+from tmtccmd.com.tcpip_utils import EthAddr
+from tmtccmd.com.udp import UdpClient
 from tmtccmd.core import TcMode, TmMode, BackendRequest
 from tmtccmd.core.ccsds_backend import NoValidProcedureSet
 from tmtccmd.tmtc import (
@@ -16,6 +19,7 @@ from tmtccmd.tmtc import (
 from tmtccmd.tmtc.handler import FeedWrapper, SendCbParams
 from tmtccmd.tmtc.procedure import TreeCommandingProcedure
 from tmtccmd.tmtc.queue import DefaultPusQueueHelper, QueueWrapper
+from tmtccmd.tmtc.shaper import ShaperLimit, TcShaper
 
 
 class TcHandlerMock(TcHandlerBase):
@@ -26,6 +30,7 @@ class TcHandlerMock(TcHandlerBase):
         self.feed_cb_call_count = 0
         self.feed_cb_def_proc_count = 0
         self.send_cb_call_count = 0
+        self.send_tcs = False
         self.queue_helper = DefaultPusQueueHelper(
             queue_wrapper=QueueWrapper.empty(),
             tc_sched_timestamp_len=4,
@@ -39,6 +44,8 @@ class TcHandlerMock(TcHandlerBase):
     def send_cb(self, send_params: SendCbParams):
         self.send_cb_call_count += 1
         self.send_cb_call_args = send_params
+        if self.send_tcs:
+            send_params.com_if.send(send_params.entry.to_pus_tc_entry().pus_tc.pack())
 
     def queue_finished_cb(self, info: TcProcedureBase):
         pass
@@ -135,6 +142,37 @@ class TestBackend(TestCase):
         self.assertEqual(pus_entry.pus_tc, PusTelecommand(apid=self.apid, service=17, subservice=1))
         self.backend.close_com_if()
         self.assertFalse(self.com_if.is_open())
+        self.tm_listener.close.assert_called_once()
+
+    def test_paused_tc_sending(self):
+        self.backend.start()
+        self.backend.tc_mode = TcMode.ONE_QUEUE
+        self.backend.current_procedure = TreeCommandingProcedure(cmd_path="/ping")
+        self.backend.pause_tc_sending()
+        self.assertTrue(self.backend.tc_sending_paused)
+        res = self.backend.periodic_op()
+        self.assertEqual(res.request, BackendRequest.DELAY_CUSTOM)
+        self.assertEqual(self.tc_handler.send_cb_call_count, 0)
+        self.backend.resume_tc_sending()
+        self.assertFalse(self.backend.tc_sending_paused)
+        res = self.backend.periodic_op()
+        self.assertEqual(res.request, BackendRequest.TERMINATION_NO_ERROR)
+        self.assertEqual(self.tc_handler.send_cb_call_count, 1)
+        self.backend.close_com_if()
+
+    def test_shaper_delays_first_tc(self):
+        tc_len = len(PusTelecommand(apid=self.apid, service=17, subservice=1).pack())
+        shaper = TcShaper(ShaperLimit(rate=100.0, burst=tc_len))
+        # Drain the bucket so the first TC of the new queue is held back.
+        shaper.consume(tc_len)
+        self.backend.tc_shaper = shaper
+        self.backend.tc_mode = TcMode.ONE_QUEUE
+        self.backend.current_procedure = TreeCommandingProcedure(cmd_path="/ping")
+        res = self.backend.periodic_op()
+        self.assertEqual(self.tc_handler.send_cb_call_count, 0)
+        self.assertEqual(res.request, BackendRequest.DELAY_CUSTOM)
+        self.assertGreater(res.next_delay, timedelta())
+        self.assertLessEqual(res.next_delay, timedelta(seconds=tc_len / 100.0))
 
     def test_one_queue_multi_entry_ops(self):
         self.backend.tm_mode = TmMode.IDLE
@@ -153,6 +191,50 @@ class TestBackend(TestCase):
         self._check_tc_req_recvd(5, 1)
         self.assertEqual(res.request, BackendRequest.TERMINATION_NO_ERROR)
 
+    def test_due_tcs_coalesced(self):
+        udp_server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        udp_server.bind(("127.0.0.1", 0))
+        udp_server.settimeout(1.0)
+        udp_client = UdpClient(
+            "udp", send_address=EthAddr.from_tuple(udp_server.getsockname()), send_mtu=1024
+        )
+        self.tc_handler.send_tcs = True
+        backend = CcsdsTmtcBackend(
+            tc_mode=TcMode.ONE_QUEUE,
+            tm_mode=TmMode.IDLE,
+            com_if=udp_client,
+            tm_listener=self.tm_listener,
+            tc_handler=self.tc_handler,
+        )
+        backend.current_procedure = TreeCommandingProcedure(cmd_path="/event")
+        backend.start()
+        try:
+            res = backend.periodic_op()
+            self.assertEqual(res.request, BackendRequest.CALL_NEXT)
+            # The second TC is due immediately, so the first one is still buffered.
+            self.assertEqual(udp_client.stats.datagrams_sent, 0)
+            res = backend.periodic_op()
+            self.assertEqual(res.request, BackendRequest.TERMINATION_NO_ERROR)
+            self.assertEqual(
+                udp_server.recv(1024),
+                PusTelecommand(apid=self.apid, service=17, subservice=1).pack()
+                + PusTelecommand(apid=self.apid, service=5, subservice=1).pack(),
+            )
+            self.assertEqual(udp_client.stats.datagrams_sent, 1)
+            self.assertEqual(udp_client.stats.packets_sent, 2)
+        finally:
+            backend.close_com_if()
+            udp_server.close()
+
+    def test_inter_cmd_delay_longer_than_one_second(self):
+        self.backend.tc_mode = TcMode.ONE_QUEUE
+        self.backend.inter_cmd_delay = timedelta(seconds=2)
+        self.backend.current_procedure = TreeCommandingProcedure(cmd_path="/event")
+        res = self.backend.periodic_op()
+        self.assertEqual(self.tc_handler.send_cb_call_count, 1)
+        self.assertEqual(res.request, BackendRequest.DELAY_CUSTOM)
+        self.assertTrue(timedelta(seconds=1) < res.next_delay <= timedelta(seconds=2))
+
     def test_multi_queue_ops(self):
         self.backend.tm_mode = TmMode.IDLE
         self.backend.tc_mode = TcMode.MULTI_QUEUE
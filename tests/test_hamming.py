@@ -0,0 +1,124 @@
+import random
+import unittest
+from unittest import TestCase
+
+from tmtccmd.util.hammingcode import (
+    HammingReturnCodes,
+    hamming_compute_256x,
+    hamming_compute_256x_np,
+    hamming_verify_256x,
+    hamming_verify_256x_np,
+)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TestHamming(TestCase):
+    def setUp(self):
+        self.rng = random.Random(0)
+        self.data = bytearray(self.rng.randbytes(256 * 16))
+        self.code = hamming_compute_256x(self.data)
+
+    def test_verify_okay(self):
+        self.assertEqual(hamming_verify_256x(self.data, self.code), HammingReturnCodes.CODE_OKAY)
+
+    def test_single_bit_correction(self):
+        corrupted = bytearray(self.data)
+        corrupted[15 * 256 + 44] ^= 0x10
+        self.assertEqual(
+            hamming_verify_256x(corrupted, self.code), HammingReturnCodes.ERROR_SINGLE_BIT
+        )
+        self.assertEqual(corrupted, self.data)
+
+    def test_invalid_input(self):
+        self.assertEqual(hamming_compute_256x(bytearray(100)), bytearray())
+        self.assertEqual(
+            hamming_verify_256x(self.data, self.code[:-3]), HammingReturnCodes.OTHER_ERROR
+        )
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestHammingNumpy(TestCase):
+    def setUp(self):
+        self.rng = random.Random(0)
+        self.data = bytearray(self.rng.randbytes(256 * 64))
+        self.code = hamming_compute_256x(self.data)
+
+    def _flip_bit(self, data: bytearray, byte_idx: int, bit_idx: int):
+        data[byte_idx] ^= 1 << bit_idx
+
+    def test_compute_identical(self):
+        self.assertEqual(hamming_compute_256x_np(self.data), self.code)
+        self.assertEqual(hamming_compute_256x_np(bytes(self.data)), self.code)
+        self.assertEqual(
+            hamming_compute_256x_np(bytearray(256 * 4)), hamming_compute_256x(bytearray(256 * 4))
+        )
+
+    def test_compute_invalid_input(self):
+        self.assertEqual(hamming_compute_256x_np(bytearray(100)), bytearray())
+        with self.assertRaises(ValueError):
+            hamming_compute_256x_np(self.data, chunk_size=100)
+
+    def test_compute_process_pool(self):
+        self.assertEqual(
+            hamming_compute_256x_np(self.data, workers=2, chunk_size=256 * 10), self.code
+        )
+
+    def test_verify_okay(self):
+        data = bytearray(self.data)
+        self.assertEqual(hamming_verify_256x_np(data, self.code), HammingReturnCodes.CODE_OKAY)
+        self.assertEqual(data, self.data)
+
+    def test_correct_single_bit_errors(self):
+        data = bytearray(self.data)
+        for block in range(0, 63, 3):
+            self._flip_bit(data, block * 256 + self.rng.randrange(256), self.rng.randrange(8))
+        # Last block has a single bit error as well
+        self._flip_bit(data, 63 * 256 + 17, 5)
+        self.assertEqual(
+            hamming_verify_256x_np(data, self.code), HammingReturnCodes.ERROR_SINGLE_BIT
+        )
+        self.assertEqual(data, self.data)
+
+    def test_errors_identical(self):
+        for _ in range(50):
+            data = bytearray(self.data)
+            code = bytearray(self.code)
+            for _ in range(self.rng.randrange(6)):
+                self._flip_bit(data, self.rng.randrange(len(data)), self.rng.randrange(8))
+            if self.rng.random() < 0.3:
+                self._flip_bit(code, self.rng.randrange(len(code)), self.rng.randrange(8))
+            expected_data = bytearray(data)
+            expected_result = hamming_verify_256x(expected_data, code)
+            self.assertEqual(hamming_verify_256x_np(data, code), expected_result)
+            self.assertEqual(data, expected_data)
+
+    def test_multi_bit_error(self):
+        data = bytearray(self.data)
+        self._flip_bit(data, 10, 0)
+        self._flip_bit(data, 2 * 256 + 1, 0)
+        self._flip_bit(data, 2 * 256 + 2, 0)
+        self._flip_bit(data, 5 * 256 + 3, 0)
+        self.assertEqual(
+            hamming_verify_256x_np(data, self.code), HammingReturnCodes.ERROR_MULTI_BIT
+        )
+        # Blocks before the failed block are corrected, blocks after it are not.
+        self.assertEqual(data[10], self.data[10])
+        self.assertNotEqual(data[5 * 256 + 3], self.data[5 * 256 + 3])
+
+    def test_ecc_error(self):
+        data = bytearray(self.data)
+        code = bytearray(self.code)
+        code[4] ^= 0x01
+        self.assertEqual(hamming_verify_256x_np(data, code), HammingReturnCodes.ERROR_ECC)
+
+    def test_verify_invalid_input(self):
+        self.assertEqual(
+            hamming_verify_256x_np(self.data, self.code[:-3]), HammingReturnCodes.OTHER_ERROR
+        )
+        self.assertEqual(
+            hamming_verify_256x_np(bytearray(100), bytearray(3)), HammingReturnCodes.OTHER_ERROR
+        )
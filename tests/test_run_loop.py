@@ -0,0 +1,93 @@
+import socket
+import threading
+import time
+from datetime import timedelta
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from tmtccmd import CcsdsTmtcBackend, CcsdsTmListener
+from tmtccmd.com.dummy import DummyComIF
+from tmtccmd.com.tcpip_utils import EthAddr
+from tmtccmd.com.udp import UdpClient
+from tmtccmd.core import TcMode, TmMode, BackendRequest
+from tmtccmd.core.run_loop import BackendRunLoop, com_if_fileno, wait_for_tm
+from tmtccmd.tmtc.procedure import TreeCommandingProcedure
+
+from tests.test_backend import TcHandlerMock
+
+LOCALHOST = "127.0.0.1"
+
+
+class TestRunLoop(TestCase):
+    def setUp(self) -> None:
+        self.udp_server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udp_server.bind((LOCALHOST, 0))
+        self.com_if = UdpClient(
+            "udp", EthAddr.from_tuple(self.udp_server.getsockname()), EthAddr(LOCALHOST, 0)
+        )
+        self.tm_listener = MagicMock(specs=CcsdsTmListener)
+        self.tc_handler = TcHandlerMock(0x06)
+        self.backend = CcsdsTmtcBackend(
+            tc_mode=TcMode.IDLE,
+            tm_mode=TmMode.IDLE,
+            com_if=self.com_if,
+            tm_listener=self.tm_listener,
+            tc_handler=self.tc_handler,
+        )
+        self.run_loop = BackendRunLoop(
+            self.backend,
+            idle_timeout=timedelta(seconds=5),
+            listener_timeout=timedelta(seconds=5),
+        )
+
+    def tearDown(self) -> None:
+        self.run_loop.close()
+        self.backend.close_com_if()
+        self.udp_server.close()
+
+    def test_fileno(self):
+        self.assertIsNone(com_if_fileno(DummyComIF()))
+        self.assertIsNone(com_if_fileno(self.com_if))
+        self.backend.start()
+        self.assertEqual(com_if_fileno(self.com_if), self.com_if.udp_socket.fileno())
+
+    def test_wakes_on_tm(self):
+        self.backend.start()
+        self.backend.tm_mode = TmMode.LISTENER
+        client_addr = self.com_if.udp_socket.getsockname()
+
+        def send_tm():
+            time.sleep(0.1)
+            self.udp_server.sendto(bytes([0, 1, 2, 3, 4, 5, 6]), client_addr)
+
+        thread = threading.Thread(target=send_tm)
+        start = time.time()
+        thread.start()
+        state = self.run_loop.run_once()
+        self.assertLess(time.time() - start, 2.0)
+        thread.join()
+        self.assertEqual(state.request, BackendRequest.DELAY_LISTENER)
+        self.assertTrue(wait_for_tm(self.com_if, 0))
+        self.assertEqual(self.com_if.receive(), [bytes([0, 1, 2, 3, 4, 5, 6])])
+        self.assertFalse(wait_for_tm(self.com_if, 0))
+
+    def test_stop_wakes_idle_loop(self):
+        self.backend.start()
+        thread = threading.Thread(target=lambda: (time.sleep(0.1), self.run_loop.stop()))
+        start = time.time()
+        thread.start()
+        state = self.run_loop.run()
+        self.assertLess(time.time() - start, 2.0)
+        thread.join()
+        self.assertEqual(state.request, BackendRequest.DELAY_IDLE)
+
+    def test_waits_for_next_tc(self):
+        self.backend.start()
+        self.backend.tc_mode = TcMode.ONE_QUEUE
+        self.backend.inter_cmd_delay = timedelta(milliseconds=100)
+        self.backend.current_procedure = TreeCommandingProcedure(cmd_path="/event")
+        start = time.time()
+        state = self.run_loop.run()
+        self.assertLess(time.time() - start, 2.0)
+        self.assertEqual(state.request, BackendRequest.TERMINATION_NO_ERROR)
+        self.assertEqual(self.tc_handler.send_cb_call_count, 2)
@@ -61,6 +61,23 @@ class TestSendReceive(TestCase):
         send_cb_params = cast(SendCbParams, call_args.args[0])
         self.assertEqual(send_cb_params.entry.to_raw_tc_entry().tc, bytes([3, 2, 1]))
 
+    def test_pause(self):
+        self.queue_helper.add_raw_tc(bytes([3, 2, 1]))
+        self.seq_sender.resume()
+        self.seq_sender.pause()
+        self.assertTrue(self.seq_sender.paused)
+        res = self.seq_sender.operation(self.com_if)
+        self.assertTrue(res.paused)
+        self.assertFalse(res.tc_sent)
+        self.assertEqual(res.mode, SenderMode.BUSY)
+        self.tc_handler_mock.send_cb.assert_not_called()
+        self.assertEqual(len(self.queue_wrapper.queue), 1)
+        self.seq_sender.unpause()
+        res = self.seq_sender.operation(self.com_if)
+        self.assertFalse(res.paused)
+        self.assertTrue(res.tc_sent)
+        self.tc_handler_mock.send_cb.assert_called_once()
+
     def test_with_wait_entry(self):
         wait_delay = 0.01
         self.queue_helper.add_raw_tc(bytes([3, 2, 1]))
@@ -0,0 +1,118 @@
+from datetime import timedelta
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from spacepackets.ccsds import PacketType, SpacePacket, SpacePacketHeader
+from spacepackets.ecss import PusTelecommand
+from tmtccmd.com import ComInterface
+from tmtccmd.tmtc.ccsds_seq_sender import SenderMode, SequentialCcsdsSender
+from tmtccmd.tmtc.handler import TcHandlerBase
+from tmtccmd.tmtc.queue import (
+    DefaultPusQueueHelper,
+    PusTcEntry,
+    QueueWrapper,
+    RawTcEntry,
+    SpacePacketEntry,
+    WaitEntry,
+)
+from tmtccmd.tmtc.shaper import ShaperLimit, TcShaper, TokenBucket, tc_entry_len_and_apid
+
+
+@patch("tmtccmd.tmtc.shaper.time.monotonic")
+class TestTcShaper(TestCase):
+    def test_token_bucket(self, monotonic_mock):
+        monotonic_mock.return_value = 0.0
+        bucket = TokenBucket(ShaperLimit(rate=100.0, burst=50))
+        self.assertEqual(bucket.delay(50), 0.0)
+        bucket.consume(50)
+        self.assertAlmostEqual(bucket.delay(20), 0.2)
+        bucket.refill(0.1)
+        self.assertAlmostEqual(bucket.tokens, 10.0)
+        # Never more tokens than the burst size
+        bucket.refill(10.0)
+        self.assertAlmostEqual(bucket.tokens, 50.0)
+        # Packets larger than the bucket only need a full bucket.
+        self.assertEqual(bucket.delay(200), 0.0)
+        bucket.consume(200)
+        self.assertAlmostEqual(bucket.delay(10), 1.6)
+
+    def test_invalid_limit(self, monotonic_mock):
+        monotonic_mock.return_value = 0.0
+        with self.assertRaises(ValueError):
+            TokenBucket(ShaperLimit(rate=0.0, burst=10))
+
+    def test_baud_rate(self, monotonic_mock):
+        limit = ShaperLimit.from_baud_rate(9600, burst=64)
+        self.assertEqual(limit.rate, 960.0)
+
+    def test_apid_buckets_and_stats(self, monotonic_mock):
+        monotonic_mock.return_value = 0.0
+        shaper = TcShaper(
+            ShaperLimit(rate=1000.0, burst=100),
+            apid_limits={0x22: ShaperLimit(rate=100.0, burst=20)},
+            per_packet_overhead=2,
+        )
+        self.assertEqual(shaper.delay(18, 0x22), timedelta())
+        shaper.consume(18, 0x22)
+        # The APID bucket is empty, the global one is not.
+        self.assertEqual(shaper.delay(18, 0x23), timedelta())
+        self.assertAlmostEqual(shaper.delay(18, 0x22).total_seconds(), 0.2)
+        monotonic_mock.return_value = 0.2
+        self.assertEqual(shaper.delay(18, 0x22), timedelta())
+        shaper.consume(18, 0x22)
+        stats = shaper.stats
+        self.assertEqual(stats.packets_sent, 2)
+        self.assertEqual(stats.bytes_sent, 40)
+        self.assertEqual(stats.packets_delayed, 1)
+        self.assertAlmostEqual(stats.max_queue_delay.total_seconds(), 0.2)
+        self.assertAlmostEqual(stats.mean_queue_delay.total_seconds(), 0.1)
+        self.assertAlmostEqual(stats.throughput, 200.0)
+
+    def test_entry_len_and_apid(self, monotonic_mock):
+        tc = PusTelecommand(service=17, subservice=1, apid=0x22)
+        self.assertEqual(tc_entry_len_and_apid(PusTcEntry(tc)), (len(tc.pack()), 0x22))
+        self.assertEqual(tc_entry_len_and_apid(RawTcEntry(tc.pack())), (len(tc.pack()), 0x22))
+        self.assertEqual(tc_entry_len_and_apid(RawTcEntry(bytes(3))), (3, None))
+        space_packet = SpacePacket(
+            SpacePacketHeader(PacketType.TC, apid=0x05, seq_count=0, data_len=0),
+            sec_header=None,
+            user_data=bytes(1),
+        )
+        self.assertEqual(tc_entry_len_and_apid(SpacePacketEntry(space_packet)), (7, 0x05))
+        with self.assertRaises(ValueError):
+            tc_entry_len_and_apid(WaitEntry.from_millis(10))
+
+    def test_seq_sender_with_shaper(self, monotonic_mock):
+        monotonic_mock.return_value = 0.0
+        queue_wrapper = QueueWrapper.empty()
+        queue_helper = DefaultPusQueueHelper(
+            queue_wrapper,
+            tc_sched_timestamp_len=4,
+            pus_verificator=None,
+            default_pus_apid=None,
+            seq_cnt_provider=None,
+        )
+        tc_handler = MagicMock(spec=TcHandlerBase)
+        com_if = MagicMock(spec=ComInterface)
+        tc = PusTelecommand(service=17, subservice=1, apid=0x22)
+        tc_len = len(tc.pack())
+        shaper = TcShaper(ShaperLimit(rate=1000.0, burst=tc_len))
+        seq_sender = SequentialCcsdsSender(queue_wrapper, tc_handler, shaper)
+        for _ in range(2):
+            queue_helper.add_pus_tc(tc)
+        seq_sender.queue_wrapper = queue_wrapper
+        res = seq_sender.operation(com_if)
+        self.assertTrue(res.tc_sent)
+        res = seq_sender.operation(com_if)
+        # The bucket needs to be refilled first.
+        self.assertFalse(res.tc_sent)
+        self.assertEqual(tc_handler.send_cb.call_count, 1)
+        self.assertGreater(res.longest_rem_delay, timedelta())
+        self.assertLessEqual(res.longest_rem_delay, timedelta(seconds=tc_len / 1000.0))
+        monotonic_mock.return_value = tc_len / 1000.0
+        res = seq_sender.operation(com_if)
+        self.assertTrue(res.tc_sent)
+        self.assertEqual(tc_handler.send_cb.call_count, 2)
+        self.assertEqual(seq_sender.mode, SenderMode.DONE)
+        self.assertEqual(shaper.stats.packets_sent, 2)
+        self.assertEqual(shaper.stats.packets_delayed, 1)
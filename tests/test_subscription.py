@@ -0,0 +1,146 @@
+import struct
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from spacepackets.ccsds import SpacePacketHeader, PacketType
+from spacepackets.ccsds.time import CdsShortTimestamp
+from spacepackets.ecss import PusTelemetry
+from tmtccmd.tmtc import CcsdsTmHandler
+from tmtccmd.tmtc.subscription import FieldMatch, TmFilter, TmSubscriptions
+
+
+def pus_tm(
+    apid: int, service: int, subservice: int, source_data: bytes = bytes(), seq_count: int = 0
+) -> bytes:
+    return PusTelemetry(
+        service=service,
+        subservice=subservice,
+        apid=apid,
+        seq_count=seq_count,
+        source_data=source_data,
+        timestamp=CdsShortTimestamp.empty().pack(),
+    ).pack()
+
+
+class TestTmSubscriptions(TestCase):
+    def setUp(self):
+        self.subscriptions = TmSubscriptions()
+        self.hk_packet = pus_tm(0xEF, 3, 25, struct.pack("!I", 0x44120006) + bytes(4))
+        self.other_hk_packet = pus_tm(0xEF, 3, 25, struct.pack("!I", 0x44120007) + bytes(4))
+        self.event_packet = pus_tm(0xEF, 5, 1)
+        self.other_apid_packet = pus_tm(0x02, 3, 25)
+
+    def test_empty(self):
+        self.assertFalse(self.subscriptions.active)
+        self.assertEqual(len(self.subscriptions), 0)
+        self.assertEqual(self.subscriptions.match(self.hk_packet), [])
+        self.assertEqual(self.subscriptions.dispatch(self.hk_packet), 0)
+        with self.assertRaises(ValueError):
+            self.subscriptions.subscribe(MagicMock(), [])
+
+    def test_apid_service_subservice(self):
+        all_tm = self.subscriptions.subscribe(MagicMock(), TmFilter())
+        apid = self.subscriptions.subscribe(MagicMock(), TmFilter(apids=[0xEF]))
+        service = self.subscriptions.subscribe(MagicMock(), TmFilter(services=[3]))
+        hk = self.subscriptions.subscribe(
+            MagicMock(), TmFilter(apids=[0xEF], services=[3], subservices=[25])
+        )
+        events = self.subscriptions.subscribe(MagicMock(), TmFilter(services=[5]))
+        self.assertTrue(self.subscriptions.active)
+        self.assertEqual(len(self.subscriptions), 5)
+        self.assertEqual(self.subscriptions.match(self.hk_packet), [all_tm, apid, service, hk])
+        self.assertEqual(self.subscriptions.match(self.event_packet), [all_tm, apid, events])
+        self.assertEqual(self.subscriptions.match(self.other_apid_packet), [all_tm, service])
+
+    def test_object_id_field(self):
+        subscriber = MagicMock()
+        sub_id = self.subscriptions.subscribe(
+            subscriber,
+            TmFilter(
+                apids=[0xEF],
+                services=[3],
+                fields=[FieldMatch.source_data_field(0, 0x44120006, 4)],
+            ),
+        )
+        self.assertEqual(self.subscriptions.match(self.hk_packet), [sub_id])
+        self.assertEqual(self.subscriptions.match(self.other_hk_packet), [])
+        self.assertEqual(self.subscriptions.match(self.event_packet), [])
+        self.assertEqual(self.subscriptions.dispatch(self.hk_packet), 1)
+        subscriber.assert_called_once_with(self.hk_packet)
+
+    def test_multiple_fields(self):
+        sub_id = self.subscriptions.subscribe(
+            MagicMock(),
+            TmFilter(
+                fields=[
+                    FieldMatch.source_data_field(0, 0x44120006, 4),
+                    FieldMatch.source_data_field(4, 0, 4),
+                ]
+            ),
+        )
+        other_id = self.subscriptions.subscribe(
+            MagicMock(), TmFilter(fields=[FieldMatch.source_data_field(0, 0x44120007, 4)])
+        )
+        self.assertEqual(self.subscriptions.match(self.hk_packet), [sub_id])
+        self.assertEqual(self.subscriptions.match(self.other_hk_packet), [other_id])
+        # Packet too short for the fields
+        self.assertEqual(self.subscriptions.match(self.event_packet), [])
+
+    def test_seq_count_range(self):
+        in_range = self.subscriptions.subscribe(MagicMock(), TmFilter(seq_count_range=(10, 20)))
+        wrapped = self.subscriptions.subscribe(MagicMock(), TmFilter(seq_count_range=(0x3FF0, 5)))
+        self.assertEqual(self.subscriptions.match(pus_tm(0xEF, 3, 25, seq_count=15)), [in_range])
+        self.assertEqual(self.subscriptions.match(pus_tm(0xEF, 3, 25, seq_count=21)), [])
+        self.assertEqual(self.subscriptions.match(pus_tm(0xEF, 3, 25, seq_count=3)), [wrapped])
+        self.assertEqual(self.subscriptions.match(pus_tm(0xEF, 3, 25, seq_count=0x3FFF)), [wrapped])
+
+    def test_multiple_filters_deduplicated(self):
+        subscriber = MagicMock()
+        sub_id = self.subscriptions.subscribe(
+            subscriber, [TmFilter(apids=[0xEF]), TmFilter(services=[3])]
+        )
+        self.assertEqual(self.subscriptions.match(self.hk_packet), [sub_id])
+        self.assertEqual(self.subscriptions.match(self.other_apid_packet), [sub_id])
+        self.assertEqual(self.subscriptions.dispatch(self.hk_packet), 1)
+        subscriber.assert_called_once_with(self.hk_packet)
+
+    def test_unsubscribe(self):
+        first = self.subscriptions.subscribe(MagicMock(), TmFilter(apids=[0xEF]))
+        second = self.subscriptions.subscribe(MagicMock(), TmFilter(apids=[0xEF]))
+        self.assertTrue(self.subscriptions.unsubscribe(first))
+        self.assertFalse(self.subscriptions.unsubscribe(first))
+        self.assertEqual(self.subscriptions.match(self.hk_packet), [second])
+        self.assertTrue(self.subscriptions.unsubscribe(second))
+        self.assertFalse(self.subscriptions.active)
+
+    def test_non_pus_packet(self):
+        all_tm = self.subscriptions.subscribe(MagicMock(), TmFilter(apids=[0xEF]))
+        self.subscriptions.subscribe(MagicMock(), TmFilter(services=[3]))
+        raw_packet = SpacePacketHeader(
+            packet_type=PacketType.TM, apid=0xEF, seq_count=0, data_len=3, sec_header_flag=False
+        ).pack() + bytes([0, 3, 25, 0])
+        self.assertEqual(self.subscriptions.match(raw_packet), [all_tm])
+        self.assertEqual(self.subscriptions.match(bytes(4)), [])
+
+    def test_subscriber_exception(self):
+        failing = MagicMock(side_effect=ValueError("subscriber failed"))
+        subscriber = MagicMock()
+        self.subscriptions.subscribe(failing, TmFilter())
+        self.subscriptions.subscribe(subscriber, TmFilter())
+        with self.assertLogs("tmtccmd.tmtc.subscription", level="ERROR"):
+            self.assertEqual(self.subscriptions.dispatch(self.hk_packet), 2)
+        subscriber.assert_called_once_with(self.hk_packet)
+
+    def test_tm_handler(self):
+        generic_handler = MagicMock()
+        tm_handler = CcsdsTmHandler(generic_handler)
+        subscriber = MagicMock()
+        tm_handler.subscriptions.subscribe(subscriber, TmFilter(services=[3]))
+        tm_handler.handle_packet(0xEF, self.hk_packet)
+        tm_handler.handle_packet(0xEF, self.event_packet)
+        tm_handler.handle_packet_batch(0x02, [self.other_apid_packet])
+        subscriber.assert_any_call(self.hk_packet)
+        subscriber.assert_any_call(self.other_apid_packet)
+        self.assertEqual(subscriber.call_count, 2)
+        # Subscriptions do not replace the dispatch to the APID handlers.
+        self.assertEqual(generic_handler.handle_tm.call_count, 2)
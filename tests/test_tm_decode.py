@@ -0,0 +1,169 @@
+from array import array
+from functools import partial
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from spacepackets.ccsds.time import CdsShortTimestamp
+from spacepackets.ecss import PusTelemetry
+from tmtccmd.com import ComInterface
+from tmtccmd.tmtc import CcsdsTmHandler, CcsdsTmListener, SpecificApidHandlerBase, tm_decode
+from tmtccmd.tmtc.ccsds_tm_listener import PacketsTooSmallForCcsds
+from tmtccmd.tmtc.tm_decode import (
+    PusTmRecord,
+    TmDecodeCfg,
+    TmDecodeError,
+    TmDecodeStage,
+    decode_pus_tm,
+)
+from tmtccmd.tmtc.tm_pipeline import TmPipelineCfg
+
+
+def make_tm(apid: int, seq_count: int, source_data: bytes = bytes()) -> bytes:
+    return PusTelemetry(
+        service=3,
+        subservice=25,
+        apid=apid,
+        seq_count=seq_count,
+        source_data=source_data,
+        timestamp=CdsShortTimestamp.empty().pack(),
+    ).pack()
+
+
+def decode_seq_count(packet: bytes) -> int:
+    return ((packet[2] << 8) | packet[3]) & 0x3FFF
+
+
+class DecodedHandler(SpecificApidHandlerBase):
+    def __init__(self, apid: int):
+        super().__init__(apid, None)
+        self.records = []
+
+    def handle_tm(self, packet: bytes, user_args: Any):
+        raise AssertionError("decoded handler should not be called with raw packets")
+
+    def handle_decoded_tm(self, packet: bytes, record: Any, user_args: Any):
+        self.records.append(record)
+
+
+class TestTmDecodeStage(TestCase):
+    def setUp(self):
+        self.stage = None
+
+    def tearDown(self):
+        if self.stage is not None:
+            self.stage.close()
+
+    def test_decode_pus_tm(self):
+        record = decode_pus_tm(make_tm(0x05, 3, bytes([1, 2, 3])))
+        self.assertEqual(
+            record,
+            PusTmRecord(
+                apid=0x05,
+                seq_count=3,
+                service=3,
+                subservice=25,
+                message_counter=0,
+                timestamp=CdsShortTimestamp.empty().pack(),
+                source_data=bytes([1, 2, 3]),
+            ),
+        )
+
+    def test_ordered_merge(self):
+        self.stage = TmDecodeStage(
+            decode_seq_count, TmDecodeCfg(num_workers=2, batch_size=16, max_batches_in_flight=3)
+        )
+        packets = [make_tm(0x05, idx, bytes(idx % 20)) for idx in range(500)]
+        for idx in range(0, 500, 50):
+            self.stage.submit(packets[idx : idx + 50])
+        self.assertLessEqual(self.stage.batches_in_flight, 3)
+        decoded = self.stage.flush()
+        self.assertEqual([packet for packet, _ in decoded], packets)
+        self.assertEqual([record for _, record in decoded], list(range(500)))
+        self.assertEqual(self.stage.stats.packets_decoded, 500)
+        self.assertEqual(self.stage.stats.max_batches_in_flight, 3)
+        self.assertEqual(self.stage.poll(), [])
+
+    def test_decode_error(self):
+        self.stage = TmDecodeStage(cfg=TmDecodeCfg(num_workers=1))
+        records = self.stage.decode([make_tm(0x05, 0), bytes(8), make_tm(0x05, 1)])
+        self.assertIsInstance(records[0], PusTmRecord)
+        self.assertIsInstance(records[1], TmDecodeError)
+        self.assertEqual(records[2].seq_count, 1)
+        self.assertEqual(self.stage.stats.decode_errors, 1)
+
+    def test_partial_decoder(self):
+        self.stage = TmDecodeStage(partial(decode_pus_tm, timestamp_len=0), TmDecodeCfg(1))
+        records = self.stage.decode([make_tm(0x05, 0, bytes([1]))])
+        self.assertEqual(records[0].timestamp, bytes())
+        self.assertEqual(records[0].source_data, CdsShortTimestamp.empty().pack() + bytes([1]))
+
+    def test_listener_decode_stage(self):
+        handler = DecodedHandler(0x05)
+        tm_handler = CcsdsTmHandler(None)
+        tm_handler.add_apid_handler(handler)
+        self.stage = TmDecodeStage(cfg=TmDecodeCfg(num_workers=2, batch_size=4))
+        tm_listener = CcsdsTmListener(tm_handler, decode_stage=self.stage)
+        com_if = MagicMock(specs=ComInterface)
+        packets = [make_tm(0x05, idx) for idx in range(20)]
+        com_if.receive.return_value = packets
+        self.assertEqual(tm_listener.operation(com_if), 20)
+        com_if.receive.return_value = [bytes([1, 2])]
+        with self.assertRaises(PacketsTooSmallForCcsds):
+            tm_listener.operation(com_if)
+        tm_listener.close()
+        self.stage = None
+        self.assertEqual([record.seq_count for record in handler.records], list(range(20)))
+
+    def test_listener_handles_burst_in_same_operation(self):
+        handler = DecodedHandler(0x05)
+        tm_handler = CcsdsTmHandler(None)
+        tm_handler.add_apid_handler(handler)
+        # Generous timeout, the worker process is started by the first submission.
+        self.stage = TmDecodeStage(cfg=TmDecodeCfg(num_workers=1, collect_timeout=5.0))
+        tm_listener = CcsdsTmListener(tm_handler, decode_stage=self.stage)
+        com_if = MagicMock(specs=ComInterface)
+        com_if.receive.return_value = [make_tm(0x05, 0)]
+        tm_listener.operation(com_if)
+        self.assertEqual([record.seq_count for record in handler.records], [0])
+        com_if.receive.return_value = [make_tm(0x05, 1)]
+        tm_listener.operation(com_if)
+        self.assertEqual([record.seq_count for record in handler.records], [0, 1])
+
+    def test_poll_timeout(self):
+        self.stage = TmDecodeStage(decode_seq_count, TmDecodeCfg(num_workers=1))
+        self.stage.submit([make_tm(0x05, 7)])
+        decoded = self.stage.poll(5.0)
+        self.assertEqual([record for _, record in decoded], [7])
+
+    def test_worker_drops_replaced_segments(self):
+        tm_decode._init_worker(decode_seq_count)
+        packet = make_tm(0x05, 3)
+        segments = [SharedMemory(create=True, size=1024) for _ in range(2)]
+        try:
+            for segment in segments:
+                segment.buf[: len(packet)] = packet
+            lengths = array("I", [len(packet)]).tobytes()
+            live_segments = (segments[0].name,)
+            self.assertEqual(tm_decode._decode_batch(segments[0].name, lengths, live_segments), [3])
+            self.assertIn(segments[0].name, tm_decode._worker_segments)
+            # The first segment was replaced by the second one.
+            live_segments = (segments[1].name,)
+            self.assertEqual(tm_decode._decode_batch(segments[1].name, lengths, live_segments), [3])
+            self.assertEqual(list(tm_decode._worker_segments), [segments[1].name])
+        finally:
+            for segment in tm_decode._worker_segments.values():
+                segment.close()
+            tm_decode._worker_segments.clear()
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+
+    def test_listener_decode_stage_with_pipeline(self):
+        with self.assertRaises(ValueError):
+            CcsdsTmListener(
+                CcsdsTmHandler(None),
+                pipeline_cfg=TmPipelineCfg(),
+                decode_stage=TmDecodeStage(cfg=TmDecodeCfg(1)),
+            )
@@ -1,6 +1,7 @@
 from collections import deque
+from typing import List
 from unittest import TestCase
-from unittest.mock import MagicMock
+from unittest.mock import ANY, MagicMock
 
 from spacepackets.ecss import PusTelemetry
 from spacepackets.ccsds.time import CdsShortTimestamp
@@ -10,7 +11,7 @@ from tmtccmd.tmtc import (
     GenericApidHandlerBase,
 )
 from tmtccmd.com import ComInterface
-from tmtccmd.tmtc.ccsds_tm_listener import CcsdsTmListener
+from tmtccmd.tmtc.ccsds_tm_listener import CcsdsTmListener, PacketsTooSmallForCcsds
 
 
 class ApidHandler(SpecificApidHandlerBase):
@@ -27,6 +28,18 @@ class ApidHandler(SpecificApidHandlerBase):
         self.packet_queue.appendleft(packet)
 
 
+class BatchApidHandler(SpecificApidHandlerBase):
+    def __init__(self, apid: int):
+        super().__init__(apid, None)
+        self.batches = []
+
+    def handle_tm(self, packet: bytes, user_args: any):
+        raise AssertionError("batch handler should not be called per packet")
+
+    def handle_tm_batch(self, packets: List[bytes], user_args: any):
+        self.batches.append(packets)
+
+
 class TestTmHandler(TestCase):
     def setUp(self) -> None:
         self.apid = 0x33
@@ -76,3 +89,102 @@ class TestTmHandler(TestCase):
         handled_packets = tm_listener.operation(com_if)
         self.assertEqual(handled_packets, 1)
         unknown_handler.handle_tm.assert_called_once()
+
+    def test_batch_mode(self):
+        batch_handler = BatchApidHandler(0x01)
+        per_packet_handler = ApidHandler(0x03)
+        unknown_handler = MagicMock(specs=GenericApidHandlerBase)
+        ccsds_handler = CcsdsTmHandler(unknown_handler)
+        ccsds_handler.add_apid_handler(batch_handler)
+        ccsds_handler.add_apid_handler(per_packet_handler)
+        com_if = MagicMock(specs=ComInterface)
+        tm_listener = CcsdsTmListener(tm_handler=ccsds_handler, batch_mode=True)
+        packets = [
+            PusTelemetry(
+                service=17,
+                subservice=2,
+                apid=apid,
+                seq_count=seq_count,
+                timestamp=CdsShortTimestamp.empty().pack(),
+            ).pack()
+            for seq_count, apid in enumerate([0x01, 0x03, 0x01, 0x02, 0x03, 0x01])
+        ]
+        com_if.receive.return_value = packets
+        self.assertEqual(tm_listener.operation(com_if), 6)
+        self.assertEqual(batch_handler.batches, [[packets[0], packets[2], packets[5]]])
+        # Default batch implementation falls back to per-packet calls.
+        self.assertEqual(per_packet_handler.called_times, 2)
+        self.assertEqual(per_packet_handler.packet_queue.pop(), packets[1])
+        self.assertEqual(per_packet_handler.packet_queue.pop(), packets[4])
+        unknown_handler.handle_tm_batch.assert_called_once_with(0x02, [packets[3]], ANY)
+
+    def test_batch_mode_too_small_packets(self):
+        batch_handler = BatchApidHandler(0x01)
+        ccsds_handler = CcsdsTmHandler(None)
+        ccsds_handler.add_apid_handler(batch_handler)
+        com_if = MagicMock(specs=ComInterface)
+        tm_listener = CcsdsTmListener(tm_handler=ccsds_handler, batch_mode=True)
+        tm_raw = PusTelemetry(
+            service=17, subservice=2, apid=0x01, timestamp=CdsShortTimestamp.empty().pack()
+        ).pack()
+        com_if.receive.return_value = [tm_raw, bytes([1, 2]), tm_raw]
+        with self.assertRaises(PacketsTooSmallForCcsds) as cm:
+            tm_listener.operation(com_if)
+        self.assertEqual(cm.exception.packets, [bytes([1, 2])])
+        # The valid packets are still handled.
+        self.assertEqual(batch_handler.batches, [[tm_raw, tm_raw]])
+
+    def test_pus_tm_callbacks(self):
+        tm_handler = ApidHandler(0x01)
+        unknown_handler = MagicMock(specs=GenericApidHandlerBase)
+        ccsds_handler = CcsdsTmHandler(unknown_handler)
+        ccsds_handler.add_apid_handler(tm_handler)
+        ping_cb = MagicMock()
+        verif_cb = MagicMock()
+        verif_step_cb = MagicMock()
+        other_apid_cb = MagicMock()
+        ccsds_handler.add_pus_tm_callback(0x01, 17, 2, ping_cb)
+        ccsds_handler.add_pus_tm_callback(0x01, 1, None, verif_cb)
+        ccsds_handler.add_pus_tm_callback(0x01, 1, 5, verif_step_cb)
+        ccsds_handler.add_pus_tm_callback(0x02, 17, 2, other_apid_cb)
+
+        def tm(service: int, subservice: int, apid: int = 0x01) -> bytes:
+            return PusTelemetry(
+                service=service,
+                subservice=subservice,
+                apid=apid,
+                timestamp=CdsShortTimestamp.empty().pack(),
+            ).pack()
+
+        ping_reply = tm(17, 2)
+        self.assertTrue(ccsds_handler.handle_packet(0x01, ping_reply))
+        ping_cb.assert_called_once_with(ping_reply)
+        verif_tms = [tm(1, 1), tm(1, 7), tm(1, 5)]
+        for verif_tm in verif_tms:
+            self.assertTrue(ccsds_handler.handle_packet(0x01, verif_tm))
+        self.assertEqual(verif_cb.call_count, 2)
+        verif_step_cb.assert_called_once_with(verif_tms[2])
+        # Not routed, passed to the APID handler
+        event_tm = tm(5, 1)
+        self.assertTrue(ccsds_handler.handle_packet(0x01, event_tm))
+        self.assertEqual(tm_handler.packet_queue.pop(), event_tm)
+        # Too short to be routed
+        self.assertTrue(ccsds_handler.handle_packet(0x01, ping_reply[:8]))
+        self.assertEqual(tm_handler.called_times, 2)
+        other_tm = tm(17, 2, 0x02)
+        self.assertTrue(ccsds_handler.handle_packet(0x02, other_tm))
+        other_apid_cb.assert_called_once_with(other_tm)
+        unknown_handler.handle_tm.assert_not_called()
+
+        self.assertTrue(ccsds_handler.remove_pus_tm_callback(0x01, 1, 5))
+        self.assertFalse(ccsds_handler.remove_pus_tm_callback(0x01, 1, 5))
+        ccsds_handler.handle_packet(0x01, verif_tms[2])
+        self.assertEqual(verif_cb.call_count, 3)
+
+        # Batch dispatch routes the PUS TM and passes the remaining packets to the handler
+        ccsds_handler.handle_packet_batch(0x01, [ping_reply, event_tm, verif_tms[0]])
+        self.assertEqual(ping_cb.call_count, 2)
+        self.assertEqual(verif_cb.call_count, 4)
+        self.assertEqual(tm_handler.called_times, 3)
+        with self.assertRaises(ValueError):
+            ccsds_handler.add_pus_tm_callback(0x800, 1, 1, ping_cb)
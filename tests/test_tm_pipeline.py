@@ -0,0 +1,166 @@
+import threading
+import time
+from typing import Any, List
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from spacepackets.ccsds.time import CdsShortTimestamp
+from spacepackets.ecss import PusTelemetry
+from tmtccmd.com import ComInterface
+from tmtccmd.com.packet_queue import OverflowPolicy
+from tmtccmd.tmtc import CcsdsTmHandler, CcsdsTmListener, SpecificApidHandlerBase
+from tmtccmd.tmtc.tm_pipeline import TmPipeline, TmPipelineCfg
+
+
+class RecordingHandler(SpecificApidHandlerBase):
+    def __init__(self, apid: int, gate: threading.Event = None):
+        super().__init__(apid, None)
+        self.gate = gate
+        self.packets = []
+        self.threads = set()
+
+    def handle_tm(self, packet: bytes, user_args: Any):
+        if self.gate is not None:
+            self.gate.wait(5.0)
+        self.threads.add(threading.get_ident())
+        self.packets.append(packet)
+
+
+class FailingHandler(SpecificApidHandlerBase):
+    def handle_tm_batch(self, packets: List[bytes], user_args: Any):
+        raise ValueError("handler error")
+
+    def handle_tm(self, packet: bytes, user_args: Any):
+        pass
+
+
+def make_tm(apid: int, seq_count: int) -> bytes:
+    return PusTelemetry(
+        service=17,
+        subservice=2,
+        apid=apid,
+        seq_count=seq_count,
+        timestamp=CdsShortTimestamp.empty().pack(),
+    ).pack()
+
+
+class TestTmPipeline(TestCase):
+    def setUp(self):
+        self.tm_handler = CcsdsTmHandler(None)
+        self.pipeline = None
+
+    def tearDown(self):
+        if self.pipeline is not None:
+            self.pipeline.close(drain=False)
+
+    def test_order_per_apid(self):
+        handler = RecordingHandler(0x01)
+        self.tm_handler.add_apid_handler(handler)
+        self.pipeline = TmPipeline(self.tm_handler, TmPipelineCfg(num_workers=4))
+        packets = [make_tm(0x01, idx) for idx in range(200)]
+        for idx in range(0, 200, 10):
+            self.pipeline.submit(0x01, packets[idx : idx + 10])
+        self.assertTrue(self.pipeline.flush(5.0))
+        self.assertEqual(handler.packets, packets)
+        stats = self.pipeline.stats[0x01]
+        self.assertEqual(stats.packets_submitted, 200)
+        self.assertEqual(stats.packets_handled, 200)
+        self.assertEqual(self.pipeline.queue_depth, 0)
+
+    def test_slow_apid_does_not_stall_others(self):
+        gate = threading.Event()
+        slow_handler = RecordingHandler(0x01, gate)
+        fast_handler = RecordingHandler(0x02)
+        self.tm_handler.add_apid_handler(slow_handler)
+        self.tm_handler.add_apid_handler(fast_handler)
+        self.pipeline = TmPipeline(self.tm_handler, TmPipelineCfg(num_workers=2))
+        self.pipeline.submit(0x01, [make_tm(0x01, 0)])
+        fast_packets = [make_tm(0x02, idx) for idx in range(5)]
+        self.pipeline.submit(0x02, fast_packets)
+        timeout = time.monotonic() + 5.0
+        while len(fast_handler.packets) < 5 and time.monotonic() < timeout:
+            time.sleep(0.005)
+        self.assertEqual(fast_handler.packets, fast_packets)
+        self.assertEqual(slow_handler.packets, [])
+        self.assertFalse(self.pipeline.is_idle)
+        gate.set()
+        self.assertTrue(self.pipeline.flush(5.0))
+        self.assertEqual(len(slow_handler.packets), 1)
+
+    def test_backpressure(self):
+        gate = threading.Event()
+        handler = RecordingHandler(0x01, gate)
+        self.tm_handler.add_apid_handler(handler)
+        self.pipeline = TmPipeline(
+            self.tm_handler, TmPipelineCfg(num_workers=1, max_queue_packets=4)
+        )
+        packets = [make_tm(0x01, idx) for idx in range(20)]
+        submitter = threading.Thread(target=self.pipeline.submit, args=(0x01, packets))
+        submitter.start()
+        time.sleep(0.05)
+        # Blocked on the full queue
+        self.assertTrue(submitter.is_alive())
+        self.assertLessEqual(self.pipeline.queue_depths()[0x01], 4)
+        gate.set()
+        submitter.join(5.0)
+        self.assertFalse(submitter.is_alive())
+        self.assertTrue(self.pipeline.flush(5.0))
+        self.assertEqual(handler.packets, packets)
+        stats = self.pipeline.stats[0x01]
+        self.assertGreater(stats.blocked_time, 0.0)
+        self.assertGreater(stats.queue.blocked, 0)
+        self.assertLessEqual(stats.queue.high_water_packets, 4)
+
+    def test_drop_oldest(self):
+        gate = threading.Event()
+        handler = RecordingHandler(0x01, gate)
+        self.tm_handler.add_apid_handler(handler)
+        self.pipeline = TmPipeline(
+            self.tm_handler,
+            TmPipelineCfg(
+                num_workers=1, max_queue_packets=4, overflow_policy=OverflowPolicy.DROP_OLDEST
+            ),
+        )
+        packets = [make_tm(0x01, idx) for idx in range(20)]
+        self.pipeline.submit(0x01, packets)
+        gate.set()
+        self.assertTrue(self.pipeline.flush(5.0))
+        stats = self.pipeline.stats[0x01]
+        self.assertGreater(stats.queue.dropped_oldest, 0)
+        self.assertEqual(len(handler.packets) + stats.queue.dropped_oldest, 20)
+        self.assertEqual(handler.packets[-1], packets[-1])
+
+    def test_handler_error(self):
+        self.tm_handler.add_apid_handler(FailingHandler(0x01, None))
+        self.pipeline = TmPipeline(self.tm_handler)
+        with self.assertLogs("tmtccmd.tmtc.tm_pipeline", level="ERROR"):
+            self.pipeline.submit(0x01, [make_tm(0x01, 0)])
+            self.assertTrue(self.pipeline.flush(5.0))
+        self.assertEqual(self.pipeline.stats[0x01].handler_errors, 1)
+
+    def test_close_and_reuse(self):
+        handler = RecordingHandler(0x01)
+        self.tm_handler.add_apid_handler(handler)
+        self.pipeline = TmPipeline(self.tm_handler)
+        self.pipeline.submit(0x01, [make_tm(0x01, 0)])
+        self.pipeline.close()
+        self.assertEqual(len(handler.packets), 1)
+        self.pipeline.submit(0x01, [make_tm(0x01, 1)])
+        self.pipeline.close()
+        self.assertEqual(len(handler.packets), 2)
+
+    def test_listener_pipeline_mode(self):
+        handler = RecordingHandler(0x01)
+        self.tm_handler.add_apid_handler(handler)
+        generic_handler = MagicMock()
+        self.tm_handler.generic_handler = generic_handler
+        tm_listener = CcsdsTmListener(self.tm_handler, pipeline_cfg=TmPipelineCfg())
+        self.pipeline = tm_listener.pipeline
+        com_if = MagicMock(specs=ComInterface)
+        packets = [make_tm(0x01, 0), make_tm(0x02, 1), make_tm(0x01, 2)]
+        com_if.receive.return_value = packets
+        self.assertEqual(tm_listener.operation(com_if), 3)
+        self.assertTrue(tm_listener.flush(5.0))
+        self.assertEqual(handler.packets, [packets[0], packets[2]])
+        generic_handler.handle_tm_batch.assert_called_once()
+        tm_listener.close()
@@ -0,0 +1,94 @@
+from typing import Any
+from unittest import TestCase
+from unittest.mock import ANY, MagicMock
+
+from spacepackets.ccsds.time import CdsShortTimestamp
+from spacepackets.ecss import PusTelemetry
+from spacepackets.ecss.tm import InvalidTmCrc16Error
+from spacepackets.exceptions import BytesTooShortError
+from tmtccmd.pus.tm.view import PusTmView
+from tmtccmd.tmtc import CcsdsTmHandler, SpecificApidHandlerBase
+
+
+class ViewHandler(SpecificApidHandlerBase):
+    def __init__(self, apid: int):
+        super().__init__(apid, None)
+        self.services = []
+
+    def handle_tm(self, packet: bytes, user_args: Any):
+        raise AssertionError("view handler should not be called with raw packets")
+
+    def handle_tm_view(self, view: PusTmView, user_args: Any):
+        self.services.append((view.service, view.subservice))
+
+
+class TestPusTmView(TestCase):
+    def setUp(self):
+        self.timestamp = bytes(range(1, 8))
+        self.tm = PusTelemetry(
+            service=3,
+            subservice=25,
+            apid=0x123,
+            seq_count=77,
+            message_counter=0x1234,
+            destination_id=0x5678,
+            source_data=bytes([1, 2, 3]),
+            timestamp=self.timestamp,
+        )
+        self.raw = self.tm.pack()
+
+    def test_fields(self):
+        view = PusTmView(self.raw)
+        self.assertEqual(view.apid, 0x123)
+        self.assertEqual(view.seq_count, 77)
+        self.assertEqual(view.seq_flags, 0b11)
+        self.assertEqual(view.pus_version, 2)
+        self.assertEqual(view.service, 3)
+        self.assertEqual(view.subservice, 25)
+        self.assertEqual(view.message_counter, 0x1234)
+        self.assertEqual(view.dest_id, 0x5678)
+        self.assertEqual(view.timestamp, self.timestamp)
+        self.assertEqual(view.source_data, bytes([1, 2, 3]))
+        self.assertEqual(view.packet_len, len(self.raw))
+        self.assertEqual(view.crc16, int.from_bytes(self.raw[-2:], "big"))
+        self.assertTrue(view.crc_valid())
+        self.assertEqual(view.tobytes(), self.raw)
+        self.assertEqual(view.to_pus_tm(), self.tm)
+
+    def test_view_into_larger_buffer(self):
+        buf = bytearray(self.raw + bytes(10) + self.raw)
+        view = PusTmView(memoryview(buf)[len(self.raw) + 10 :])
+        self.assertEqual(view.tobytes(), self.raw)
+        view = PusTmView(buf)
+        self.assertEqual(view.packet_len, len(self.raw))
+        self.assertEqual(view.source_data, bytes([1, 2, 3]))
+
+    def test_invalid_crc(self):
+        raw = bytearray(self.raw)
+        raw[-1] ^= 0xFF
+        view = PusTmView(raw)
+        self.assertFalse(view.crc_valid())
+        with self.assertRaises(InvalidTmCrc16Error):
+            view.to_pus_tm()
+
+    def test_too_short(self):
+        with self.assertRaises(BytesTooShortError):
+            PusTmView(self.raw[:4])
+        with self.assertRaises(BytesTooShortError):
+            PusTmView(self.raw[:-1])
+        with self.assertRaises(BytesTooShortError):
+            PusTmView(self.raw, timestamp_len=12)
+
+    def test_dispatch(self):
+        handler = ViewHandler(0x123)
+        generic_handler = MagicMock()
+        tm_handler = CcsdsTmHandler(generic_handler)
+        tm_handler.add_apid_handler(handler)
+        self.assertTrue(tm_handler.handle_packet_view(PusTmView(self.raw)))
+        self.assertEqual(handler.services, [(3, 25)])
+        other_raw = PusTelemetry(
+            service=17, subservice=2, apid=0x02, timestamp=CdsShortTimestamp.empty().pack()
+        ).pack()
+        view = PusTmView(other_raw)
+        self.assertFalse(tm_handler.handle_packet_view(view))
+        generic_handler.handle_tm_view.assert_called_once_with(0x02, view, ANY)